@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+bench.py
+
+Benchmarks for the CM SAF checker.
+
+  importtime  cold-start import time of the checker, measured with
+              'python -X importtime' in fresh interpreters. Fails if the
+              import exceeds a time budget or eagerly imports one of the
+              heavy dependencies (numpy, netCDF4, astropy, ...).
+  checks      time of every check stage and of end-to-end batches on
+              synthetic files (see synthetic.py), for a matrix of product
+              kinds, grids, record counts, group nesting, variable counts
+              and compression levels.
+  compare     compare two 'checks' results, e.g. of two revisions.
+  equivalence check a corpus of synthetic, pathological and given files
+              with the reference and alternative check engines and report
+              any difference in results or output (see differential.py).
+  generate    write synthetic files.
+"""
+
+import datetime
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+# modules that must only be imported on the code paths that need them
+HEAVY_MODULES = ("numpy", "netCDF4", "cftime", "astropy", "dateutil", "pytz")
+
+CLI_MODULE = "cmsaf_checker.scripts.cli"
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _env():
+    """Environment for child interpreters, using the import path of this one."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    return env
+
+
+def importtime(module=CLI_MODULE):
+    """
+    Import *module* in a fresh interpreter with -X importtime.
+
+    Returns {module name: (self us, cumulative us)} for every executed import.
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_env(), check=True)
+    res = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3:
+            continue
+        res[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return res
+
+
+def help_time():
+    """Return the wall time in seconds of 'cmsaf-checker --help'."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-m", CLI_MODULE, "--help"],
+        stdout=subprocess.DEVNULL, env=_env(), check=True)
+    return time.perf_counter() - start
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+def bench_importtime(runs=5, budget=100.0, module=CLI_MODULE):
+    """
+    Measure the cold-start import time of *module* and check it against *budget* (ms).
+
+    Returns (rc, result dict).
+    """
+    cumulative = []
+    heavy = set()
+    slowest = {}
+    for _ in range(runs):
+        times = importtime(module)
+        cumulative.append(times[module][1] * 1e-3)
+        for name, (self_us, cum_us) in times.items():
+            if name.split(".")[0] in HEAVY_MODULES:
+                heavy.add(name.split(".")[0])
+            slowest[name] = min(slowest.get(name, self_us), self_us)
+    helpTimes = [help_time() * 1e3 for _ in range(runs)]
+
+    result = {
+        "benchmark":     "importtime",
+        "module":        module,
+        "runs":          runs,
+        "import_ms":     min(cumulative),
+        "import_ms_max": max(cumulative),
+        "help_ms":       min(helpTimes),
+        "budget_ms":     budget,
+        "heavy_imports": sorted(heavy),
+        "slowest":       sorted(slowest.items(), key=lambda x: -x[1])[:10],
+    }
+
+    print(f"import {module}: {result['import_ms']:.1f} ms (max {result['import_ms_max']:.1f} ms, budget {budget:.1f} ms)")
+    print(f"cmsaf-checker --help: {result['help_ms']:.1f} ms")
+    print("slowest imports (self time):")
+    for name, us in result["slowest"]:
+        print(f"  {us*1e-3:8.2f} ms  {name}")
+
+    rc = 0
+    if result["import_ms"] > budget:
+        print(f"FAILED: import time exceeds budget of {budget:.1f} ms")
+        rc = 1
+    if heavy:
+        print(f"FAILED: heavy modules imported at start-up: {', '.join(sorted(heavy))}")
+        rc = 1
+    return rc, result
+
+
+def _revision():
+    """Return the git revision of the checker sources, or None."""
+    try:
+        proc = subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip() or None
+
+
+def _case_id(params):
+    grid = "" if params["kind"] == "swath" else f"-g{params['grid']}"
+    records = "" if params["records"] is None else f"-r{params['records']}"
+    return (f"{params['kind']}{grid}{records}-grp{params['groups']}"
+        f"-var{params['variables']}-z{params['complevel']}")
+
+
+def bench_checks(kinds, grids=("20",), records=(None,), groups=(0,), variables=(1,), complevels=(4,),
+        files=10, repeat=3, directory=None):
+    """
+    Time the checks of synthetic files for every combination of the parameters.
+
+    Each case writes *files* consecutive files and checks them *repeat*
+    times with a new checker, with coordinates and profiling enabled. The
+    batch time is the fastest repetition; stage times are taken over all
+    files and repetitions. Returns (rc, result dict).
+    """
+    from .cli import __version__, check_many, np, netCDF4
+    from .profiling import percentile
+    from .synthetic import generate
+
+    cases = {}
+    for kind, grid, nRecords, nGroups, nVariables, complevel in itertools.product(
+            kinds, grids, records, groups, variables, complevels):
+        params = {"kind": kind, "grid": grid, "records": nRecords, "groups": nGroups,
+            "variables": nVariables, "complevel": complevel}
+        if kind == "swath":
+            params["grid"] = None
+        if kind not in ("instantaneous", "swath"):
+            params["records"] = None
+        cases.setdefault(_case_id(params), params)
+
+    tmp = None
+    if directory is None:
+        tmp = tempfile.TemporaryDirectory(prefix="cmsaf-checker-bench-")
+        directory = tmp.name
+
+    rc = 0
+    results = []
+    try:
+        for case, params in cases.items():
+            options = {k: v for k, v in params.items() if k != "kind" and v is not None}
+            paths = generate(os.path.join(directory, case), params["kind"], files=files, **options)
+            size = sum(os.path.getsize(p) for p in paths)
+
+            batches = []
+            stages = {}
+            failed = 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                checked = list(check_many(paths, coordinates=True, profile=True))
+                batches.append(time.perf_counter() - start)
+                failed = sum(1 for r in checked if r.rc != 0)
+                for result in checked:
+                    for name, values in [*result.profile["stages"].items(), ("total", result.profile["total"])]:
+                        stages.setdefault(name, []).append(values["wall"])
+
+            entry = {
+                "case":        case,
+                "params":      params,
+                "files":       len(paths),
+                "bytes":       size,
+                "failed":      failed,
+                "batch_s":     min(batches),
+                "batch_s_all": batches,
+                "files_per_s": len(paths) / min(batches),
+                "stages":      {name: {
+                    "median_ms": percentile(walls, 50) * 1e3,
+                    "p95_ms":    percentile(walls, 95) * 1e3,
+                    "mean_ms":   sum(walls) / len(walls) * 1e3,
+                } for name, walls in sorted(stages.items())},
+            }
+            results.append(entry)
+            print(f"{case:<40} {entry['batch_s']:8.3f} s {entry['files_per_s']:8.2f} files/s"
+                f"  total p50 {entry['stages']['total']['median_ms']:8.1f} ms"
+                + (f"  ({failed} FAILED)" if failed else ""))
+            if failed:
+                rc = 1
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    result = {
+        "benchmark": "checks",
+        "version":   __version__,
+        "revision":  _revision(),
+        "date":      datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "host":      platform.node(),
+        "python":    platform.python_version(),
+        "numpy":     np.__version__,
+        "netCDF4":   netCDF4.__version__,
+        "repeat":    repeat,
+        "cases":     results,
+    }
+    return rc, result
+
+
+def bench_compare(base, new, threshold=10.0):
+    """
+    Compare the 'checks' results *base* and *new* (dicts) case by case.
+
+    Returns (rc, result dict); rc is 1 if a batch got slower by more than
+    *threshold* percent.
+    """
+    baseCases = {c["case"]: c for c in base["cases"]}
+    rc = 0
+    rows = []
+    print(f"base: {base.get('revision') or base.get('version')}  new: {new.get('revision') or new.get('version')}")
+    print(f"{'case':<40} {'stage':<28} {'base ms':>9} {'new ms':>9} {'change':>8}")
+    for case in new["cases"]:
+        old = baseCases.get(case["case"])
+        if old is None:
+            print(f"{case['case']:<40} not in base results")
+            continue
+        entries = [("batch", old["batch_s"] * 1e3, case["batch_s"] * 1e3)]
+        for stage, values in case["stages"].items():
+            if stage in old["stages"]:
+                entries.append((stage, old["stages"][stage]["median_ms"], values["median_ms"]))
+        for stage, oldMs, newMs in entries:
+            change = (newMs / oldMs - 1) * 100 if oldMs > 0 else 0.0
+            rows.append({"case": case["case"], "stage": stage, "base_ms": oldMs, "new_ms": newMs, "change": change})
+            flag = ""
+            if stage == "batch" and change > threshold:
+                flag = " SLOWER"
+                rc = 1
+            if stage == "batch" or abs(change) > threshold:
+                print(f"{case['case']:<40} {stage:<28} {oldMs:9.1f} {newMs:9.1f} {change:+7.1f}%{flag}")
+    return rc, {"benchmark": "compare", "threshold": threshold, "rows": rows}
+
+
+def bench_equivalence(engines, files=(), generated=True, directory=None, coordinates=True, data=True, verbose=False):
+    """
+    Compare the check engines *engines* with the reference engine.
+
+    The corpus is written to *directory*, or a temporary directory, unless
+    *generated* is false; *files* are added to it. Returns (rc, result dict),
+    rc is 1 if any file differs.
+    """
+    from .differential import compare, corpus
+
+    tmp = None
+    if generated and directory is None:
+        tmp = tempfile.TemporaryDirectory(prefix="cmsaf-checker-equivalence-")
+        directory = tmp.name
+    try:
+        paths = (corpus(directory) if generated else []) + list(files)
+        differences = compare(paths, engines, coordinates=coordinates, data=data)
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+    for difference in differences:
+        print(f"\n{difference['engine']}: {difference['path']} differs in {', '.join(difference['keys'])}")
+        if verbose and difference["diff"]:
+            print(difference["diff"], end="")
+
+    print(f"\n{len(paths)} files, {len({d['path'] for d in differences})} with differences")
+    result = {
+        "benchmark":   "equivalence",
+        "revision":    _revision(),
+        "engines":     engines,
+        "files":       len(paths),
+        "differences": differences,
+    }
+    return (1 if differences else 0), result
+
+
+def _list(convert=str):
+    """Return an argparse type for comma separated lists of *convert* values."""
+    def parse(text):
+        return [None if item == "auto" else convert(item) for item in text.split(",")]
+    return parse
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='cmsaf-checker-bench',
+        description='Benchmarks for the CM SAF checker.')
+    parser.add_argument('-o', '--output', metavar='FILE',
+        help='Write benchmark results as JSON to this file.')
+    sub = parser.add_subparsers(dest='benchmark', required=True)
+
+    p = sub.add_parser('importtime', help='cold-start import time')
+    p.add_argument('-n', '--runs', type=int, default=5,
+        help='Number of fresh interpreters (default: 5)')
+    p.add_argument('-b', '--budget', type=float, default=100.0, metavar='MS',
+        help='Maximum import time in milliseconds (default: 100)')
+
+    from .synthetic import KINDS
+
+    p = sub.add_parser('checks', help='check stage and batch times on synthetic files')
+    p.add_argument('--kinds', type=_list(), default=list(KINDS), metavar='LIST',
+        help=f"Product kinds (default: {','.join(KINDS)})")
+    p.add_argument('--grids', type=_list(), default=["20"], metavar='LIST',
+        help='Grid codes of the file names, e.g. 20,26,17 (default: 20)')
+    p.add_argument('--records', type=_list(int), default=[None], metavar='LIST',
+        help='Records of instantaneous and swath files (default: auto)')
+    p.add_argument('--groups', type=_list(int), default=[0], metavar='LIST',
+        help='Group nesting depth of the data variables (default: 0)')
+    p.add_argument('--variables', type=_list(int), default=[1], metavar='LIST',
+        help='Number of data variables (default: 1)')
+    p.add_argument('--complevel', type=_list(int), default=[4], metavar='LIST',
+        help='zlib compression levels (default: 4)')
+    p.add_argument('--files', type=int, default=10,
+        help='Files per batch (default: 10)')
+    p.add_argument('-n', '--repeat', type=int, default=3,
+        help='Repetitions of each batch (default: 3)')
+    p.add_argument('--directory', metavar='DIR',
+        help='Keep the synthetic files in DIR instead of a temporary directory')
+
+    p = sub.add_parser('compare', help='compare two checks results')
+    p.add_argument('base', help='JSON result of the base revision')
+    p.add_argument('new', help='JSON result of the new revision')
+    p.add_argument('-t', '--threshold', type=float, default=10.0, metavar='PCT',
+        help='Report changes above PCT percent, fail if a batch got slower (default: 10)')
+
+    from .differential import ENGINES
+
+    p = sub.add_parser('equivalence', help='compare check engines with the reference engine')
+    p.add_argument('files', nargs='*',
+        help='Additional files to compare')
+    p.add_argument('-e', '--engines', type=_list(), default=[e for e in ENGINES if e != 'reference'], metavar='LIST',
+        help=f"Engines to compare (default: all of {','.join(e for e in ENGINES if e != 'reference')})")
+    p.add_argument('--no-generated', dest='generated', action='store_false',
+        help='Only compare the given files')
+    p.add_argument('--directory', metavar='DIR',
+        help='Keep the generated corpus in DIR instead of a temporary directory')
+    p.add_argument('--no-coordinates', dest='coordinates', action='store_false',
+        help='Skip the coordinate checks')
+    p.add_argument('--no-data', dest='data', action='store_false',
+        help='Skip the data checks')
+    p.add_argument('-v', '--verbose', action='store_true',
+        help='Print the output differences')
+
+    p = sub.add_parser('generate', help='write synthetic files')
+    p.add_argument('directory', help='Output directory')
+    p.add_argument('--kind', choices=list(KINDS), default='daily')
+    p.add_argument('--files', type=int, default=1)
+    p.add_argument('--records', type=int)
+    p.add_argument('--grid', default='20')
+    p.add_argument('--groups', type=int, default=0)
+    p.add_argument('--variables', type=int, default=1)
+    p.add_argument('--complevel', type=int, default=4)
+    p.add_argument('--swath-bounds', action='store_true',
+        help='Write 4-vertex cell bounds of swath coordinates')
+
+    args = parser.parse_args(argv)
+
+    if args.benchmark == 'importtime':
+        rc, result = bench_importtime(runs=args.runs, budget=args.budget)
+    elif args.benchmark == 'checks':
+        rc, result = bench_checks(args.kinds, grids=args.grids, records=args.records, groups=args.groups,
+            variables=args.variables, complevels=args.complevel, files=args.files, repeat=args.repeat,
+            directory=args.directory)
+    elif args.benchmark == 'compare':
+        with open(args.base) as fh:
+            base = json.load(fh)
+        with open(args.new) as fh:
+            new = json.load(fh)
+        rc, result = bench_compare(base, new, threshold=args.threshold)
+    elif args.benchmark == 'equivalence':
+        unknown = [e for e in args.engines if e not in ENGINES]
+        if unknown:
+            parser.error(f"unknown engines: {', '.join(unknown)}")
+        rc, result = bench_equivalence(args.engines, files=args.files, generated=args.generated,
+            directory=args.directory, coordinates=args.coordinates, data=args.data, verbose=args.verbose)
+    elif args.benchmark == 'generate':
+        from .synthetic import generate
+        paths = generate(args.directory, args.kind, files=args.files, records=args.records, grid=args.grid,
+            groups=args.groups, variables=args.variables, complevel=args.complevel, swath_bounds=args.swath_bounds)
+        for path in paths:
+            print(path)
+        rc, result = 0, {"benchmark": "generate", "files": paths}
+
+    if args.output is not None:
+        with open(args.output, "w") as fh:
+            json.dump(result, fh, indent=2)
+
+    sys.exit(rc)
+
+
+if __name__ == "__main__":
+    main()
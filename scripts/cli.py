@@ -1,18 +1,43 @@
 #!/usr/bin/env python3
-from netCDF4 import Dataset, num2date
-from astropy.time import Time
-from dateutil.relativedelta import relativedelta
 import calendar as cal
+import collections
+import contextlib
 import csv
 import datetime
+import functools
+import importlib.util
+import itertools
+import math
 import os
 import re
+import sys
 from types import SimpleNamespace
 from typing import NamedTuple
 import xml.etree.ElementTree as ET
 
-import numpy as np
-import pytz
+
+def _lazy_import(name):
+    """
+    Return module *name*, executed only on first attribute access.
+
+    numpy and netCDF4 dominate the start-up time but are not needed for
+    --help, the daemon client or filename-only operations. astropy and
+    dateutil are imported locally where they are used.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+np      = _lazy_import("numpy")
+netCDF4 = _lazy_import("netCDF4")
 
 __version__ = "3.2.5"
 __prefix__  = ""
@@ -26,6 +51,20 @@ RC_OK   = "## OK ##"
 RC_FAIL = "## FAILED ##"
 RC_INFO = "## INFORMATION ##"
 
+# finding level → report tag
+RC_LEVEL = {"error": RC_ERR, "warning": RC_WARN, "info": RC_INFO}
+
+
+class CheckerError(Exception):
+    """Base class for errors raised by the CM SAF checker."""
+
+
+class StandardNotFoundError(CheckerError):
+    """A metadata standard file could not be found in any search path."""
+
+
+class InvalidFilenameError(CheckerError):
+    """A file to check does not carry a valid file name."""
 
 
 def normalize_whitespace(text):
@@ -54,33 +93,129 @@ def float_spacing (x, y):
 # Grid code → resolution in degrees, as defined in the CM SAF naming convention (PDF table, page 8).
 # Lat/lon grids only; projection-based codes (e.g. 05, 10, 25) are intentionally absent
 # because they have no single scalar resolution and are handled as non-regular grids (return None).
-_GRID_RESOLUTION: dict[str, np.float64] = {
-    "17": np.float64("0.03"),
-    "23": np.float64("0.05"),
-    "26": np.float64("0.1"),
-    "19": np.float64("0.25"),
-    "13": np.float64("0.5"),
-    "22": np.float64("0.625"),
-    "20": np.float64("1.0"),
+# Values are kept as strings so that numpy is not needed at import time.
+_GRID_RESOLUTION: dict[str, str] = {
+    "17": "0.03",
+    "23": "0.05",
+    "26": "0.1",
+    "19": "0.25",
+    "13": "0.5",
+    "22": "0.625",
+    "20": "1.0",
 }
 
 
-def cmsaf_decode_grid(filename):
+_NAMING_MATCH = re.compile(CMSAF_NAMING_STANDARD).match
+
+
+class CMSAFFilename(NamedTuple):
+    """CM SAF standard file name, see decode_filename()."""
+    name:      str
+    product:   str
+    timeCode:  str
+    statistic: str
+    time:      datetime.datetime | None   # UTC, None for an invalid date
+    version:   str
+    grid:      str
+    source:    str
+    level:     str
+    area:      str
+    suffix:    str
+
+    @property
+    def key(self):
+        """File name with '*' in place of the time stamp, shared by all files of a series."""
+        return f"{self.product}{self.timeCode}{self.statistic}*{self.version}{self.grid}{self.source}{self.level}{self.area}{self.suffix}"
+
+
+@functools.lru_cache(maxsize=4096)
+def decode_filename(name):
+    """
+    Decode a CM SAF standard file name (without directory).
+
+    Returns a CMSAFFilename, or None if *name* does not match the naming
+    convention. Results are cached, every stage of a check shares them.
+    """
+    decode = _NAMING_MATCH(name)
+    if decode is None:
+        return None
+    try:
+        fileTime = datetime.datetime(*map(int, decode.group(4, 5, 6, 7, 8)), tzinfo=datetime.timezone.utc)
+    except ValueError:
+        fileTime = None
+    return CMSAFFilename(name, *decode.group(1, 2, 3), fileTime, *decode.group(9, 10, 11, 12, 13, 14))
+
+
+def _print_warning(message):
+    print(f"{RC_WARN} {message}")
+
+
+def cmsaf_decode_grid(filename, warn=_print_warning):
     """
     Decode the grid resolution (degrees) from a CM SAF standard filename.
 
-    Returns the resolution as np.float64 for known lat/lon grid codes,
-    or None if the filename does not match the naming convention or the
-    grid code has no scalar resolution (e.g. satellite projection grids).
+    *filename* is a file name or a CMSAFFilename. Returns the resolution as
+    np.float64 for known lat/lon grid codes, or None if the filename does not
+    match the naming convention or the grid code has no scalar resolution
+    (e.g. satellite projection grids). Warning messages are passed to *warn*.
     """
-    decode = re.match(CMSAF_NAMING_STANDARD, filename)
+    decode = decode_filename(filename) if isinstance(filename, str) else filename
     if decode is None:
         return None
-    code = decode.group(10)
-    resolution = _GRID_RESOLUTION.get(code)
+    resolution = _GRID_RESOLUTION.get(decode.grid)
     if resolution is None:
-        print(f"{RC_WARN} Unknown grid code '{code}' in filename '{filename}'")
-    return resolution
+        warn(f"Unknown grid code '{decode.grid}' in filename '{decode.name}'")
+        return None
+    return np.float64(resolution)
+
+
+# month and day of the pentad starts, the same in every year
+PENTAD_STARTS = frozenset((d.month, d.day) for d in
+    (datetime.date(2001, 1, 1) + datetime.timedelta(days=5 * i) for i in range(73)))
+
+
+def lint_filename(path):
+    """
+    Check the name of *path* against the CM SAF naming convention without opening the file.
+
+    Returns a Result with findings of stage 'filename'.
+    """
+    findings = []
+    name = os.path.basename(path)
+    decode = decode_filename(name)
+    if decode is None:
+        findings.append(Finding("filename", "error", f"filename '{name}' does not match CM SAF naming convention"))
+    elif decode.time is None:
+        findings.append(Finding("filename", "error", f"invalid date '{name[5:17]}' in filename '{name}'"))
+    else:
+        if decode.grid not in _GRID_RESOLUTION:
+            findings.append(Finding("filename", "warning", f"Unknown grid code '{decode.grid}' in filename '{name}'"))
+        t = decode.time
+        offGrid = {
+            'h': t.minute != 0,
+            'd': (t.hour, t.minute) != (0, 0),
+            'p': (t.month, t.day) not in PENTAD_STARTS or (t.hour, t.minute) != (0, 0),
+            'w': (t.hour, t.minute) != (0, 0),
+            'm': (t.day, t.hour, t.minute) != (1, 0, 0),
+            's': (t.day, t.hour, t.minute) != (1, 0, 0),
+            'a': (t.month, t.day, t.hour, t.minute) != (1, 1, 0, 0),
+        }
+        if offGrid.get(decode.timeCode, False):
+            findings.append(Finding("filename", "warning", f"time stamp '{name[5:17]}' is not a start of period for time code '{decode.timeCode}'"))
+    rc = int(any(f.level == "error" for f in findings))
+    return Result(path, rc, stages={"filename": rc}, findings=findings)
+
+
+def julian_day_to_datetime(jd):
+    """
+    Convert a Julian day to a UTC datetime.
+
+    astropy is imported on first use, it is only needed for Julian day time axes.
+    """
+    from astropy.time import Time
+    t = Time(jd, format='jd', scale='utc', precision=4)
+    t = datetime.datetime.strptime(t.isot, "%Y-%m-%dT%H:%M:%S.%f")
+    return t.replace(tzinfo=datetime.timezone.utc)
 
 
 class TimeDuration(NamedTuple):
@@ -127,6 +262,56 @@ def decode_timeDuration(duration):
     )
 
 
+# seconds per unit of CF time units
+_TIME_UNIT_SECONDS = {
+    "second": 1, "seconds": 1, "sec": 1, "secs": 1, "s": 1,
+    "minute": 60, "minutes": 60, "min": 60, "mins": 60,
+    "hour": 3600, "hours": 3600, "hr": 3600, "hrs": 3600, "h": 3600,
+    "day": 86400, "days": 86400, "d": 86400,
+}
+
+
+def time_unit_seconds(units):
+    """Return the seconds per unit of CF time *units* ('<unit> since ...'), None if unknown."""
+    match = re.match(r"\s*(\w+)\s+since\s", units)
+    return None if match is None else _TIME_UNIT_SECONDS.get(match.group(1).lower())
+
+
+def duration_seconds(duration):
+    """Return the seconds of a TimeDuration of fixed length, None with years or months."""
+    if duration is None or duration.year or duration.month:
+        return None
+    return ((duration.week * 7 + duration.day) * 24 + duration.hour) * 3600 + duration.minute * 60 + duration.second
+
+
+class _IndexRanges:
+    """Consecutive index ranges of offending records, collected block by block."""
+
+    def __init__(self):
+        self.ranges = []    # [first, last]
+        self.count  = 0
+
+    def add(self, indices):
+        """Add the sorted *indices*, all beyond the ones added before."""
+        if len(indices) == 0:
+            return
+        self.count += len(indices)
+        breaks = np.flatnonzero(np.diff(indices) != 1)
+        firsts = np.concatenate([[indices[0]], indices[breaks + 1]])
+        lasts  = np.concatenate([indices[breaks], [indices[-1]]])
+        for first, last in zip(firsts.tolist(), lasts.tolist()):
+            if self.ranges and self.ranges[-1][1] + 1 == first:
+                self.ranges[-1][1] = last
+            else:
+                self.ranges.append([first, last])
+
+    def __str__(self, limit=10):
+        text = ", ".join(f"[{a}]" if a == b else f"[{a}-{b}]" for a, b in self.ranges[:limit])
+        if len(self.ranges) > limit:
+            text += f", ... ({len(self.ranges) - limit} more)"
+        return text
+
+
 def _parse_standard(filename: str) -> SimpleNamespace:
     """
     Parse a CM SAF metadata standard XML file.
@@ -203,6 +388,7 @@ class Keywords:
         self.filename = None
         self.groups = None
         self.keywordList = {}
+        self.error = None
 
         # resolve keyword file; fall back to literal path so readFile() can
         # report a meaningful IOError if it is genuinely missing
@@ -212,7 +398,7 @@ class Keywords:
         try:
             fh = open(self.filename, "r")
         except IOError as detail:
-            print(detail)
+            self.error = detail
             return 2
 
         with fh:
@@ -280,6 +466,378 @@ class Keywords:
         return kwList
 
 
+def _file_digest(filename):
+    """Return the SHA-256 hex digest of the content of *filename*."""
+    import hashlib
+    with open(filename, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+# records of a swath time axis giving the expected step without time_coverage_resolution
+SCANLINE_PROBE = 1024
+
+# memory budget of the evaluation of fields of two and more dimensions
+# (e.g. swath latitude/longitude) without --memory-budget
+FIELD_BUDGET = 64 * 1024**2
+
+# bytes per element of the evaluation of a block of a data variable besides
+# twice the stored values (netCDF4 copies on read): the masks of NaN, fill
+# and valid values
+DATA_FOOTPRINT = 3
+
+# global attributes read by the structure-only checks
+STRUCTURE_ATTRIBUTES = ("cdm_data_type", "variable_id")
+
+
+def _attr_token(value):
+    """Return a complete representation of an attribute value for fingerprints."""
+    if isinstance(value, np.ndarray):
+        return (value.dtype.str, value.shape, value.tobytes())
+    return (type(value).__name__, repr(value))
+
+
+def _wrap(diff, period):
+    """Map differences of a cyclic coordinate with *period* (None: not cyclic) to [-period/2, period/2]."""
+    if period is None:
+        return diff
+    return diff - period * np.rint(diff / period)
+
+
+def _axis_steps(data, mask, period=None):
+    """
+    Return the signs of the steps of 2-D *data* along axis 0: 0 for steps
+    within the float spacing or touching values flagged in *mask*.
+    """
+    diff = _wrap(np.diff(data, axis=0), period)
+    tol  = 4 * float_spacing(data[1:], data[:-1])
+    sign = np.sign(diff).astype(np.int8)
+    sign[(np.abs(diff) <= tol) | mask[1:] | mask[:-1]] = 0
+    return sign
+
+
+def _turns(signs, last):
+    """
+    Count the reversals of the step *signs* (2-D, along axis 0) per column,
+    continuing from the *last* nonzero sign per column.
+
+    Returns (reversals, last nonzero sign).
+    """
+    signs = np.concatenate([last[None, :], signs])
+    index = np.where(signs != 0, np.arange(len(signs))[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = np.take_along_axis(signs, index, axis=0)
+    turns  = np.count_nonzero((filled[1:] != filled[:-1]) & (filled[:-1] != 0), axis=0)
+    return turns, filled[-1]
+
+
+# vertex pairs (this cell, neighbour) shared by neighbouring cells along the
+# x and y axis, for counterclockwise and clockwise CF vertex order
+_CELL_EDGES = {
+    "counterclockwise": {"x": ((1, 0), (2, 3)), "y": ((3, 0), (2, 1))},
+    "clockwise":        {"x": ((3, 0), (2, 1)), "y": ((1, 0), (2, 3))},
+}
+
+
+def _edge_mismatches(bounds, edges, period=None):
+    """
+    Count vertices of 4-vertex *bounds* (y, x, 4) not shared with the next
+    cell along x and along y, for the vertex pairs *edges*; missing vertices
+    are not counted.
+    """
+    data = np.ma.getdata(bounds)
+    mask = np.ma.getmaskarray(bounds)
+    counts = {}
+    for axis, name in ((1, "x"), (0, "y")):
+        count = 0
+        for this, other in edges[name]:
+            pick = (np.s_[:, :-1], np.s_[:, 1:]) if axis == 1 else (np.s_[:-1], np.s_[1:])
+            a, b = data[..., this][pick[0]], data[..., other][pick[1]]
+            skip = mask[..., this][pick[0]] | mask[..., other][pick[1]]
+            count += np.count_nonzero((_wrap(a - b, period) != 0) & ~skip)
+        counts[name] = count
+    return counts
+
+
+def _geo2d_band(block, bounds, prevRow, prevBounds, period, validRange, box, edges, pole):
+    """
+    Evaluate one band of rows of a 2-D coordinate field and its bounds for
+    CMSAFChecker._checkCoordinatesGeo2D(); *prevRow* and *prevBounds* are
+    the last row of the previous band (None for the first band).
+
+    Returns a dict of partial results merged by _merge_geo2d().
+    """
+    data  = np.ma.getdata(block)
+    mask  = np.ma.getmaskarray(block)
+    valid = data[~mask] if mask.any() else data
+    result = {"masked": np.count_nonzero(mask), "min": None, "max": None}
+    if valid.size > 0:
+        result["min"] = valid.min()
+        result["max"] = valid.max()
+    result["invalid"] = np.count_nonzero((valid < validRange[0]) | (valid > validRange[1]))
+    if box is not None:
+        # bounding box crossing the date line: values between max and min are outside
+        result["outsideBox"] = np.count_nonzero((valid > box[1]) & (valid < box[0]))
+
+    # at most one extreme per grid line; the columns continue across bands
+    turns, _ = _turns(_axis_steps(data.T, mask.T, period), np.zeros(data.shape[0], dtype=np.int8))
+    result["rowTurns"] = np.count_nonzero(turns > 1)
+    if prevRow is not None:
+        signs = _axis_steps(np.concatenate([np.ma.getdata(prevRow), data]),
+                            np.concatenate([np.ma.getmaskarray(prevRow), mask]), period)
+    else:
+        signs = _axis_steps(data, mask, period)
+    result["colTurns"], result["colLast"] = _turns(signs, np.zeros(data.shape[1], dtype=np.int8))
+    result["colFirst"] = np.zeros(data.shape[1], dtype=np.int8)
+    if len(signs) > 0:
+        result["colFirst"] = signs[np.argmax(signs != 0, axis=0), np.arange(signs.shape[1])]
+
+    if bounds is None:
+        return result
+
+    # cell centers within the cell vertices, except for cells centered at a
+    # pole; cells with missing values are not counted
+    offset = [_wrap(np.ma.getdata(bounds)[..., i] - data, period) for i in range(4)]
+    within = ((np.minimum(np.minimum(offset[0], offset[1]), np.minimum(offset[2], offset[3])) <= 0)
+            & (np.maximum(np.maximum(offset[0], offset[1]), np.maximum(offset[2], offset[3])) >= 0))
+    if pole:
+        within |= np.abs(data) == 90
+    boundsMask = np.ma.getmaskarray(bounds)
+    skip = mask | boundsMask[..., 0] | boundsMask[..., 1] | boundsMask[..., 2] | boundsMask[..., 3]
+    result["outside"] = np.count_nonzero(~within & ~skip)
+
+    if prevBounds is None:
+        result["mismatches"] = _edge_mismatches(bounds, edges, period)
+    else:
+        result["mismatches"] = _edge_mismatches(np.ma.concatenate([prevBounds, bounds]), edges, period)
+        result["mismatches"]["x"] -= _edge_mismatches(prevBounds, edges, period)["x"]
+    return result
+
+
+def _merge_geo2d(total, band):
+    """Merge the band result *band* of _geo2d_band() into *total* (None for the first band), return it."""
+    if total is None:
+        total = dict(band, colLast=band["colLast"].copy(), colTurns=band["colTurns"].copy())
+        total["mismatches"] = dict(band.get("mismatches", {}))
+        return total
+    for key in ("masked", "invalid", "outsideBox", "rowTurns", "outside"):
+        if key in band:
+            total[key] += band[key]
+    if band["min"] is not None:
+        total["min"] = band["min"] if total["min"] is None else min(total["min"], band["min"])
+        total["max"] = band["max"] if total["max"] is None else max(total["max"], band["max"])
+    # a reversal between the last step of the previous bands and the first of this band
+    last, first = total["colLast"], band["colFirst"]
+    total["colTurns"] += band["colTurns"] + ((last != 0) & (first != 0) & (last != first))
+    total["colLast"] = np.where(band["colLast"] != 0, band["colLast"], last)
+    for key, count in band.get("mismatches", {}).items():
+        total["mismatches"][key] += count
+    return total
+
+
+def _pipeline(func, items, pool=None, depth=1):
+    """
+    Yield func(*item) for *items* in order; with a thread *pool* up to
+    *depth* calls run at once while the next items are produced.
+    """
+    if pool is None:
+        for item in items:
+            yield func(*item)
+        return
+    pending = collections.deque()
+    for item in items:
+        pending.append(pool.submit(func, *item))
+        if len(pending) >= depth:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _hyperslabs(shape, chunking, budget):
+    """
+    Yield the index tuples of the blocks of an array of *shape* holding at
+    most *budget* elements, but at least one line of the last dimension.
+
+    The outer dimensions are stepped through one index at a time until the
+    remaining ones fit the budget; the dimension then split is cut at
+    multiples of its *chunking* (None if contiguous) where possible.
+    """
+    ndim = len(shape)
+    if ndim == 0:
+        yield ()
+        return
+    k = 0
+    while k < ndim - 2 and math.prod(shape[k + 1:]) > budget:
+        k += 1
+    rows = max(1, budget // max(1, math.prod(shape[k + 1:])))
+    if chunking is not None and rows >= chunking[k]:
+        rows -= rows % chunking[k]
+    for outer in itertools.product(*(range(n) for n in shape[:k])):
+        for start in range(0, shape[k], rows):
+            yield outer + (slice(start, min(start + rows, shape[k])),)
+
+
+def _record_statistics(rows, missing, outside=None):
+    """
+    Return the missing value count and the valid value count, sum, min and
+    max of every row of the 2-D array *rows*; *missing* marks the fill and
+    NaN values, *outside* the values outside the valid range (None if there
+    are none).
+    """
+    n, m = rows.shape
+    fill = np.zeros(n, np.int64) if missing is None else np.count_nonzero(missing, axis=1)
+    if m == 0:
+        return {"fill": fill, "count": np.zeros(n, np.int64), "sum": np.zeros(n),
+                "min": np.full(n, np.inf), "max": np.full(n, -np.inf)}
+    skip = missing if outside is None else outside if missing is None else missing | outside
+    if skip is None or not skip.any():
+        return {"fill": fill, "count": np.full(n, m, np.int64), "sum": rows.sum(1, dtype=np.float64),
+                "min": rows.min(1).astype(np.float64), "max": rows.max(1).astype(np.float64)}
+    if rows.dtype.kind == "f":
+        low, high = -np.inf, np.inf
+    else:
+        low, high = np.iinfo(rows.dtype).min, np.iinfo(rows.dtype).max
+    return {"fill": fill, "count": m - np.count_nonzero(skip, axis=1), "sum": np.where(skip, 0, rows).sum(1, dtype=np.float64),
+            "min": np.where(skip, high, rows).min(1).astype(np.float64),
+            "max": np.where(skip, low, rows).max(1).astype(np.float64)}
+
+
+def _not_in(values, declared):
+    """
+    Return the mask of *values* not in *declared*: range comparisons for a
+    contiguous integer set, a lookup table for 8- and 16-bit integers,
+    np.isin otherwise.
+    """
+    declared = np.unique(declared)
+    if values.dtype.kind not in "iu" or declared.dtype.kind not in "iu" or len(declared) == 0:
+        return ~np.isin(values, declared)
+    info = np.iinfo(values.dtype)
+    declared = [int(d) for d in declared if info.min <= d <= info.max]
+    if len(declared) == 0:
+        return np.ones(values.shape, bool)
+    if declared[-1] - declared[0] == len(declared) - 1:
+        low, high = declared[0], declared[-1]
+        if low == info.min:
+            return values > high
+        if high == info.max:
+            return values < low
+        return (values < low) | (values > high)
+    if values.dtype.itemsize <= 2:
+        # indexed by the unsigned view, i.e. the values modulo 2**bits
+        size = 1 << (8 * values.dtype.itemsize)
+        table = np.ones(size, bool)
+        table[np.array(declared) % size] = False
+        return table[values.view(f"u{values.dtype.itemsize}")]
+    return ~np.isin(values, declared)
+
+
+def _undeclared_flags(values, flagValues, flagMasks):
+    """
+    Return the mask of the *values* of a flag variable not declared by
+    *flagValues* or *flagMasks* (None if not given).
+
+    With flag_masks alone no other bits may be set; with both, the bits of
+    each mask must be zero or one of the flag_values paired with it.
+    """
+    if flagMasks is None or values.dtype.kind not in "iu":
+        return _not_in(values, flagValues)
+    flagMasks = flagMasks.astype(values.dtype)
+    bad = (values & ~np.bitwise_or.reduce(flagMasks)) != 0
+    if flagValues is not None and len(flagValues) == len(flagMasks):
+        for mask in np.unique(flagMasks):
+            bad |= _not_in(values & mask, np.append(flagValues[flagMasks == mask], 0))
+    return bad
+
+
+def _data_block(values, fills, validMin, validMax, records=False, timeAxis=None, flags=None):
+    """
+    Count the values, NaN, fill values and valid values outside
+    [*validMin*, *validMax*] (None: unbounded) of one block of stored values
+    of a data variable for CMSAFChecker._checkData(); *fills* are the fill
+    value and missing values (empty if there are none). With *records* the statistics of the
+    valid values of every time record along *timeAxis* are added (the block
+    is a single record if None). *flags* are the (flag_values, flag_masks)
+    of a flag variable; the undeclared codes are added with their counts and
+    first positions in the block.
+
+    Returns a dict of partial results merged by _merge_data().
+    """
+    values = np.asarray(values)
+    result = {"size": values.size, "nan": 0, "fill": 0, "outside": 0, "min": None, "max": None}
+    missing = None
+    if values.dtype.kind == "f":
+        missing = np.isnan(values)
+        result["nan"] = np.count_nonzero(missing)
+    fills = [fill for fill in fills if not (isinstance(fill, float) and math.isnan(fill))]
+    if fills:
+        isFill = values == fills[0]
+        for fill in fills[1:]:
+            isFill |= values == fill
+        result["fill"] = np.count_nonzero(isFill)
+        if missing is None:
+            missing = isFill
+        else:
+            missing |= isFill
+    if flags is not None:
+        bad = _undeclared_flags(values, *flags)
+        if missing is not None:
+            bad &= ~missing
+        if bad.any():
+            positions = np.flatnonzero(bad)
+            codes, first, counts = np.unique(values.reshape(-1)[positions], return_index=True, return_counts=True)
+            result["undeclared"] = (codes, counts, positions[first])
+    if records:
+        # values outside the valid range are left out of the record statistics
+        outside = None
+        if validMin is not None:
+            outside = values < validMin
+        if validMax is not None:
+            outside = values > validMax if outside is None else outside | (values > validMax)
+
+        def rows(array):
+            if array is None:
+                return None
+            if timeAxis is None:
+                return array.reshape(1, -1)
+            return np.moveaxis(array, timeAxis, 0).reshape(values.shape[timeAxis], -1)
+
+        result["records"] = _record_statistics(rows(values), rows(missing), rows(outside))
+    valid = values[~missing] if missing is not None and missing.any() else values.reshape(-1)
+    if valid.size == 0:
+        return result
+    result["min"] = valid.min()
+    result["max"] = valid.max()
+    if validMin is not None and result["min"] < validMin:
+        result["outside"] += np.count_nonzero(valid < validMin)
+    if validMax is not None and result["max"] > validMax:
+        result["outside"] += np.count_nonzero(valid > validMax)
+    return result
+
+
+def _merge_data(total, block):
+    """Merge the block result *block* of _data_block() into *total* (None for the first block), return it."""
+    if total is None:
+        total = dict(block)
+        total.pop("records", None)
+        total.pop("undeclared", None)
+        return total
+    for key in ("size", "nan", "fill", "outside"):
+        total[key] += block[key]
+    if block["min"] is not None:
+        total["min"] = block["min"] if total["min"] is None else min(total["min"], block["min"])
+        total["max"] = block["max"] if total["max"] is None else max(total["max"], block["max"])
+    return total
+
+
+def _merge_records(statistics, start, records):
+    """Merge the record statistics *records* of _data_block() for the records from *start* on into *statistics*."""
+    part = slice(start, start + len(records["count"]))
+    statistics["fill"][part] += records["fill"]
+    statistics["count"][part] += records["count"]
+    statistics["sum"][part] += records["sum"]
+    np.minimum(statistics["min"][part], records["min"], out=statistics["min"][part])
+    np.maximum(statistics["max"][part], records["max"], out=statistics["max"][part])
+
+
 def _is_coordinate_variable(var) -> bool:
     """Return True if *var* is a CF coordinate variable.
 
@@ -294,28 +852,100 @@ class DatasetX():
     Expand standard python Dataset netcdf4 class
     """
 
-    def __init__(self, *args, **kwargs):
-        self._ds = Dataset(*args, **kwargs);
+    def __init__(self, *args, warn=_print_warning, cache_size=0, **kwargs):
+        self._ds = netCDF4.Dataset(*args, **kwargs);
+        self._warn = warn
+        self.reads = 0
+        self._arrays = collections.OrderedDict()    # (path, raw) -> (read-only array, bytes)
+        self.cacheSize = cache_size
+        self.cacheBytes = 0
 
 
     def __getattribute__(self, item):
-        if item in ["_ds", "getCoordinates", "getVariableByStandardName", "getVariableList", "isSwathData",
+        if item in ["_ds", "_warn", "reads", "_arrays", "cacheSize", "cacheBytes", "readVar", "fingerprint", "getCoordinates", "getAuxiliaryCoordinates", "getVariableByStandardName", "getVariableList", "getDataVariables", "isSwathData",
                 "matchCoordinate", "matchCoordinateTime", "getVariableByName", "getvar", "getgrp"]:
             return object.__getattribute__(self, item)
         elif item == "ds":
             return object.__getattribute__(self, "_ds")
         else:
-            return Dataset.__getattribute__(self._ds, item)
+            return netCDF4.Dataset.__getattribute__(self._ds, item)
 
 
     def getvar(self, name):
         return self._ds[name]
 
 
+    def readVar(self, var, key=slice(None), raw=False):
+        """
+        Read data of variable *var*, counted for --profile; *raw* reads
+        the stored values without masking and scaling.
+
+        Whole variables of up to cacheSize bytes are kept read-only, least
+        recently used first out, and serve all later reads of the file. Parts
+        of variables not in the cache are read as requested.
+        """
+        cacheKey = (os.path.join(var.group().path, var.name), raw)
+        if cacheKey in self._arrays:
+            self._arrays.move_to_end(cacheKey)
+            values = self._arrays[cacheKey][0][key]
+            return values if raw else np.ma.asanyarray(values)
+
+        size = var.size * np.dtype(var.dtype).itemsize
+        self.reads += 1
+        if raw:
+            mask, scale = var.mask, var.scale
+            var.set_auto_maskandscale(False)
+        try:
+            values = var[key]
+        finally:
+            if raw:
+                var.set_auto_mask(mask)
+                var.set_auto_scale(scale)
+        if not (isinstance(key, slice) and key == slice(None)) or size > self.cacheSize:
+            return values
+
+        values = np.asanyarray(values)
+        values.setflags(write=False)
+        self._arrays[cacheKey] = (values, size)
+        self.cacheBytes += size
+        while self.cacheBytes > self.cacheSize:
+            self.cacheBytes -= self._arrays.popitem(last=False)[1][1]
+        return values
+
+
     def getgrp(self, name):
         return self._ds[name]
 
 
+    def fingerprint(self):
+        """
+        Return a digest of the file structure read from the header: data
+        model, groups, dimension names, variables with dtype, dimensions,
+        filters and attributes, and the global attributes STRUCTURE_ATTRIBUTES.
+        """
+        import hashlib
+        digest = hashlib.sha256(self._ds.data_model.encode())
+
+        def update(*items):
+            digest.update(repr(items).encode())
+
+        for name in STRUCTURE_ATTRIBUTES:
+            if name in self._ds.ncattrs():
+                update("attribute", name, _attr_token(self._ds.getncattr(name)))
+        groups = [self._ds]
+        while groups:
+            grp = groups.pop(0)
+            update("group", grp.path)
+            for dim in grp.dimensions.values():
+                update("dimension", dim.name, dim.isunlimited())
+            for var in grp.variables.values():
+                update("variable", var.name, str(var.dtype), var.dimensions, var.filters())
+                for name in var.ncattrs():
+                    update("attribute", name, _attr_token(var.getncattr(name)))
+            groups.extend(grp.groups.values())
+        return digest.hexdigest()
+
+
     def close(self):
         if self._ds.isopen():
             self._ds.close()
@@ -348,6 +978,19 @@ class DatasetX():
         return vList
 
 
+    def getDataVariables(self):
+        """
+        List the data variables: all 3-D variables, or all variables with a
+        time dimension for swath data
+        """
+        vList = self.getVariableList()
+        if self.isSwathData():
+            axisTime = self.getCoordinates("time", shortName=["time"])
+            return [vName for vName in vList
+                    if any(self.matchCoordinate(dim, axisTime) is not None for dim in self.getvar(vName).get_dims())]
+        return [vName for vName in vList if len(self.getvar(vName).shape) >= 3]
+
+
     def getVariableByName(self, name):
         """
         Find variables by name in root and all data groups
@@ -397,7 +1040,7 @@ class DatasetX():
                     if not _is_coordinate_variable(self._ds[item]):
                         axis.pop(item)
                         continue
-                    print(f"## WARNING ##: missing standard name attribute for '{item}'")
+                    self._warn(f"missing standard name attribute for '{item}'")
         else:
             for item in list(axis.keys()):
                 if not _is_coordinate_variable(self._ds[item]):
@@ -412,6 +1055,23 @@ class DatasetX():
         return(axis)
 
 
+    def getAuxiliaryCoordinates(self, standardName, shortName=[]):
+        """
+        Find 2-D coordinate fields, e.g. latitude and longitude of satellite
+        projections, by standard name or else by name.
+        """
+        axis = self.getVariableByStandardName(standardName)
+        if len(axis) == 0:
+            for vName in shortName:
+                axis.update(self.getVariableByName(vName))
+        for item in list(axis.keys()):
+            var = self._ds[item]
+            if var.ndim != 2 or re.match(r'^.*sub.satellite.*$', getattr(var, "long_name", "")):
+                axis.pop(item)
+
+        return(axis)
+
+
     def matchCoordinate(self, dim, axis):
         """
         Find first matching coordinate
@@ -445,14 +1105,173 @@ class DatasetX():
         return(keyTime)
 
 
+class Finding(NamedTuple):
+    """Single error, warning or information message reported by a check stage."""
+    stage:   str
+    level:   str
+    message: str
+
+
+class _AttrSet(dict):
+    """Insertion ordered set of attribute names."""
+    __slots__ = ()
+
+    def add(self, key):
+        self[key] = None
+
+
+class Result:
+    """
+    Outcome of checking a single file.
+
+    .rc        — 0 if all checks passed
+    .stages    — {stage: rc} for every stage that ran
+    .findings  — tuple of Finding entries in reporting order
+    .errAttr, .warnAttr, .infoAttr — global attribute names with findings
+    .profile   — timing and I/O per stage with --profile, else None
+    .statistics — per-record min, max, mean and fill fraction of the
+                  variable_id variables with --data, else None
+    """
+    __slots__ = ("path", "rc", "stages", "findings", "errAttr", "warnAttr", "infoAttr", "profile", "statistics")
+
+    def __init__(self, path, rc, stages=None, findings=(), errAttr=(), warnAttr=(), infoAttr=(), profile=None,
+            statistics=None):
+        self.path     = path
+        self.rc       = rc
+        self.stages   = dict(stages or {})
+        self.findings = tuple(findings)
+        self.errAttr  = tuple(errAttr)
+        self.warnAttr = tuple(warnAttr)
+        self.infoAttr = tuple(infoAttr)
+        self.profile  = profile
+        self.statistics = statistics
+
+    def __repr__(self):
+        return f"Result({self.path!r}, {self.status}, {len(self.errors)} errors, {len(self.warnings)} warnings)"
+
+    @property
+    def ok(self):
+        return self.rc == 0
+
+    @property
+    def status(self):
+        return "OK" if self.rc == 0 else "FAILED"
+
+    @property
+    def errors(self):
+        return tuple(f for f in self.findings if f.level == "error")
+
+    @property
+    def warnings(self):
+        return tuple(f for f in self.findings if f.level == "warning")
+
+    @property
+    def infos(self):
+        return tuple(f for f in self.findings if f.level == "info")
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a Result from its to_dict() representation."""
+        attributes = data.get("attributes", {})
+        return cls(data["path"], data["rc"], stages=data.get("stages"),
+            findings=[Finding(**f) for f in data.get("findings", [])],
+            errAttr=attributes.get("error", ()), warnAttr=attributes.get("warning", ()),
+            infoAttr=attributes.get("info", ()), profile=data.get("profile"), statistics=data.get("statistics"))
+
+    def to_dict(self):
+        """Return a JSON serialisable representation."""
+        data = {
+            "path":       self.path,
+            "status":     self.status,
+            "rc":         int(self.rc),
+            "stages":     {k: int(v) for k, v in self.stages.items()},
+            "findings":   [f._asdict() for f in self.findings],
+            "attributes": {"error": list(self.errAttr), "warning": list(self.warnAttr), "info": list(self.infoAttr)},
+        }
+        if self.profile is not None:
+            data["profile"] = self.profile
+        if self.statistics is not None:
+            data["statistics"] = self.statistics
+        return data
+
+
+class _Recording(NamedTuple):
+    """Output lines, finding counts and result of a check, see CMSAFChecker._record()."""
+    lines: list     # (text, end, finding level or None, finding message)
+    err:   int
+    warn:  int
+    info:  int
+    value: object
+
+
+class _LRU(collections.OrderedDict):
+    """Mapping keeping the *maxsize* most recently used entries."""
+
+    def __init__(self, maxsize):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def lookup(self, key):
+        value = self.get(key)
+        if value is not None:
+            self.move_to_end(key)
+        return value
+
+    def store(self, key, value):
+        self[key] = value
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+def traced(func):
+    """
+    Record calls of a CMSAFChecker method as trace spans when --trace is given.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        if self.tracer is None:
+            return func(self, *args, **kwargs)
+        with self.tracer.span(func.__name__):
+            return func(self, *args, **kwargs)
+    return wrapper
+
+
 class CMSAFChecker:
     """
     CM SAF Checking class
+
+    Output is passed to *log* (None for a silent checker). The loaded
+    standard and vocabularies are kept for the lifetime of the instance, so
+    a single checker can be used to check any number of files.
     """
 
     def __init__(self, search_paths=None, version=None, referenceFile=None,
-        coordinates=False, ignore=None, lazy=False, standard_file=None):
-
+        coordinates=False, ignore=None, lazy=False, standard_file=None, log=print,
+        profile=False, trace=None, memory=False, memory_budget=None, attribute_cache=4096,
+        structure_cache=256, coordinate_cache=64, coordinate_cache_file=None, array_cache=256*1024**2,
+        scan_threads=0, data=False, data_all=False):
+
+        self.log           = log
+        self._recording    = None
+        self.profiling     = profile or memory
+        self.heapPeaks     = None
+        if memory:
+            from .profiling import HeapPeaks
+            self.heapPeaks = HeapPeaks()
+        self.memoryBudget  = memory_budget
+        self.arrayCache    = array_cache
+        self.scanThreads   = scan_threads
+        self.scanPoolExecutor = None
+        self.attributeMemo = _LRU(attribute_cache)
+        self.structureMemo = _LRU(structure_cache)
+        self.coordinateMemo = _LRU(coordinate_cache)
+        self.coordinateCacheFile = coordinate_cache_file
+        self.coordinateCacheChanged = False
+        self.standardKey   = None
+        self.tracer        = None
+        if trace is not None:
+            from .tracing import Tracer
+            self.tracer = Tracer(trace)
         self.search_paths  = search_paths or []
         self.standard_file = standard_file
         self.Dataset       = None
@@ -460,16 +1279,15 @@ class CMSAFChecker:
         self.refFile       = referenceFile
         self.refDataset    = None
         self.coordinates   = coordinates
+        self.data          = data or data_all
+        self.dataAll       = data_all
         self.lazy          = lazy
         self.std_name_dh   = None
+        self.keywords      = {}
         self.gIgnoreAtt    = []
         self.vIgnoreAtt    = []
-        self.err = 0
-        self.errAttr = []
-        self.warn = 0
-        self.warnAttr = []
-        self.info = 0
-        self.infoAttr = []
+        self.stageName     = None
+        self._reset()
         if version:
             self.version = "_v"+version.replace(".","-")
         else:
@@ -478,10 +1296,10 @@ class CMSAFChecker:
         # open reference NetCDF file
         if self.refFile is not None:
             try:
-                print(f"Reference File: '{self.refFile}'\n")
-                self.refDataset = DatasetX(self.refFile, mode='r')
+                self._print(f"Reference File: '{self.refFile}'\n")
+                self.refDataset = DatasetX(self.refFile, mode='r', warn=self._warning)
             except Exception:
-                print("\nCould not open reference file, please check that NetCDF is formatted correctly.\n")
+                self._print("\nCould not open reference file, please check that NetCDF is formatted correctly.\n")
                 raise
 
         # attributes to ignore
@@ -495,6 +1313,10 @@ class CMSAFChecker:
                 else:
                     self.gIgnoreAtt.append(att)
 
+        if self.coordinateCacheFile is not None:
+            self._loadCoordinateCache()
+
+    @traced
     def _loadStandard(self):
         """
         Load the XML metadata standard, searching each path.
@@ -506,35 +1328,35 @@ class CMSAFChecker:
         if self.standard_file is not None:
             fn = _find_file(self.standard_file, self.search_paths)
             if fn is None:
-                print(f"Could not find '{self.standard_file}' in any search path: {self.search_paths}")
-                exit(1)
+                raise StandardNotFoundError(f"Could not find '{self.standard_file}' in any search path: {self.search_paths}")
         else:
             default_name = "cmsaf_metadata_standard" + self.version + ".xml"
             fn = _find_file(default_name, self.search_paths)
             if fn is None:
-                print(f"Could not find '{default_name}' in any search path: {self.search_paths}")
-                exit(1)
+                raise StandardNotFoundError(f"Could not find '{default_name}' in any search path: {self.search_paths}")
 
-        print(f"Using standard file: '{fn}'")
+        self._print(f"Using standard file: '{fn}'")
+        self.standardKey = _file_digest(fn)
         try:
             self.std_name_dh = _parse_standard(fn)
         except IOError as detail:
-            print(detail)
+            self._print(detail)
             raise
 
         # locate and load any included XML, searched independently
         if self.std_name_dh.include:
             inc_fn = _find_file(self.std_name_dh.include, self.search_paths)
             if inc_fn is None:
-                print(f"No such file '{self.std_name_dh.include}'.")
-                exit(1)
-            print(f"Including '{inc_fn}'.")
+                raise StandardNotFoundError(f"No such file '{self.std_name_dh.include}'.")
+            self._print(f"Including '{inc_fn}'.")
             try:
                 include_ = _parse_standard(inc_fn)
             except IOError as detail:
-                print(detail)
+                self._print(detail)
                 raise
 
+            self.standardKey = (self.standardKey, _file_digest(inc_fn))
+
             # included file is the base; main file entries override
             merged = include_.dict
             merged.update(self.std_name_dh.dict)
@@ -542,89 +1364,379 @@ class CMSAFChecker:
 
 
     def __del__(self):
-        if self.refDataset:
+        self.close()
+
+
+    def close(self):
+        """
+        Close the reference file, if any.
+        """
+        if getattr(self, "refDataset", None):
             self.refDataset.close();
+            self.refDataset = None
+        if getattr(self, "tracer", None) is not None:
+            self.tracer.flush()
+        if getattr(self, "scanPoolExecutor", None) is not None:
+            self.scanPoolExecutor.shutdown()
+            self.scanPoolExecutor = None
+        if getattr(self, "coordinateCacheChanged", False) and self.coordinateCacheFile is not None:
+            self._saveCoordinateCache()
+
+
+    def _loadCoordinateCache(self):
+        """
+        Load the coordinate verdicts of earlier runs from coordinateCacheFile.
+        """
+        import json
+        try:
+            with open(self.coordinateCacheFile) as fh:
+                entries = json.load(fh)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as detail:
+            self._warning(f"ignoring coordinate cache '{self.coordinateCacheFile}': {detail}")
+            return
+        try:
+            recordings = {key: _Recording(*entry) for key, entry in entries.items()}
+            if not all(len(line) == 4 for entry in recordings.values() for line in entry.lines):
+                raise ValueError("unknown format")
+        except (TypeError, ValueError) as detail:
+            self._warning(f"ignoring coordinate cache '{self.coordinateCacheFile}': {detail}")
+            return
+        for key, recording in recordings.items():
+            self.coordinateMemo.store(key, recording)
+
+
+    def _saveCoordinateCache(self):
+        """
+        Write the coordinate verdicts to coordinateCacheFile, replaced atomically.
+        """
+        import json
+        tmp = f"{self.coordinateCacheFile}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            json.dump({key: list(entry) for key, entry in self.coordinateMemo.items()}, fh)
+        os.replace(tmp, self.coordinateCacheFile)
+        self.coordinateCacheChanged = False
 
 
     def _reset(self):
         self.err = 0
-        self.errAttr = []
+        self.errAttr = _AttrSet()
         self.warn = 0
-        self.warnAttr = []
+        self.warnAttr = _AttrSet()
         self.info = 0
-        self.infoAttr = []
+        self.infoAttr = _AttrSet()
+        self.findings = []
+        self.stages = {}
+        self.profile = None
+        self.statistics = None
+        self.fingerprint = None
+        self.failedStage = None
+
+
+    def _print(self, *args, sep=' ', end='\n'):
+        """
+        Report a message that is not a finding.
+        """
+        self._emit(sep.join(str(a) for a in args), end)
+
+
+    def _finding(self, level, message, indent=0, end='\n'):
+        """
+        Report *message* tagged with *level* (error, warning, info) and
+        record it as a finding of the current stage.
+        """
+        self._emit(f"{'':<{indent}}{RC_LEVEL[level]} {message}", end, level, message.strip(" :\n"))
+
+
+    def _error(self, message, indent=0, end='\n'):
+        self._finding("error", message, indent, end)
+
+
+    def _warning(self, message, indent=0, end='\n'):
+        self._finding("warning", message, indent, end)
+
+
+    def _info(self, message, indent=0, end='\n'):
+        self._finding("info", message, indent, end)
+
+
+    def _emit(self, text, end, level=None, message=None):
+        if self._recording is not None:
+            self._recording.append((text, end, level, message))
+        if level is not None:
+            self.findings.append(Finding(self.stageName, level, message))
+        if self.log is not None:
+            self.log(text, end=end)
+
+
+    def _record(self, func, *args):
+        """
+        Call *func* and return a _Recording of its output lines, finding counts and result.
+        """
+        counts = (self.err, self.warn, self.info)
+        outer, self._recording = self._recording, []
+        try:
+            value = func(*args)
+        finally:
+            lines, self._recording = self._recording, outer
+            if outer is not None:
+                outer.extend(lines)
+        return _Recording(lines, self.err - counts[0], self.warn - counts[1], self.info - counts[2], value)
+
+
+    def _replay(self, recording):
+        """
+        Repeat the output and finding counts of *recording* and return its result.
+        """
+        for text, end, level, message in recording.lines:
+            self._emit(text, end, level, message)
+        self.err  += recording.err
+        self.warn += recording.warn
+        self.info += recording.info
+        return recording.value
+
+
+    def _checkStructure(self, name, func):
+        """
+        Run the structure-only check *func*, or replay its verdict for a file
+        of the same structure fingerprint checked before.
+        """
+        if self.structureMemo.maxsize <= 0:
+            return func()
+        if self.fingerprint is None:
+            self.fingerprint = self.Dataset.fingerprint()
+        key = (self.fingerprint, name)
+        recording = self.structureMemo.lookup(key)
+        if recording is None:
+            recording = self._record(func)
+            self.structureMemo.store(key, recording)
+            return recording.value
+        return self._replay(recording)
+
+
+    @contextlib.contextmanager
+    def _stage(self, name):
+        """
+        Attribute all findings reported within the block to stage *name*.
+        """
+        parent = self.stageName
+        self.stageName = name if parent is None else f"{parent}/{name}"
+        if self.profile is not None:
+            from .profiling import Counters, accumulate
+            start = Counters.now(self.Dataset)
+            if self.heapPeaks is not None:
+                self.heapPeaks.enter()
+        try:
+            yield
+        except Exception:
+            if self.failedStage is None:
+                self.failedStage = self.stageName
+            raise
+        finally:
+            if self.profile is not None:
+                values = Counters.now(self.Dataset).since(start)
+                if self.heapPeaks is not None:
+                    values["peak"] = self.heapPeaks.leave()
+                accumulate(self.profile["stages"], self.stageName, values)
+            self.stageName = parent
+
+
+    def _span(self, name, **args):
+        """
+        Record the block as trace span *name* when tracing, else do nothing.
+        """
+        if self.tracer is None:
+            return contextlib.nullcontext()
+        return self.tracer.span(name, **args)
+
+
+    def _arrayCacheSize(self):
+        """
+        Return the size of the array cache of a file, at most the memory budget.
+        """
+        if self.memoryBudget is None:
+            return self.arrayCache
+        return min(self.arrayCache, self.memoryBudget)
 
 
+    def _blocks(self, var, elementBytes):
+        """
+        Return the slices of the first dimension of *var* to evaluate at once.
+
+        A single slice covers the variable unless its estimated footprint of
+        *elementBytes* per element exceeds the memory budget, FIELD_BUDGET
+        for fields of two and more dimensions without one. Blocks are aligned
+        to the chunks of the variable where the budget allows.
+        """
+        budget = self.memoryBudget
+        if budget is None and var.ndim >= 2:
+            budget = FIELD_BUDGET
+        if budget is None or var.ndim == 0 or var.size * elementBytes <= budget:
+            return [slice(None)]
+        n = var.shape[0]
+        rows = max(1, budget // (var.size // n * elementBytes))
+        chunking = var.chunking()
+        if chunking != "contiguous" and rows >= chunking[0]:
+            rows -= rows % chunking[0]
+        return [slice(i, min(i + rows, n)) for i in range(0, n, rows)]
+
+
+    def _scanPool(self):
+        """
+        Return the thread pool evaluating bands of 2-D fields, None without scanThreads.
+        """
+        if self.scanThreads <= 0:
+            return None
+        if self.scanPoolExecutor is None:
+            import concurrent.futures
+            self.scanPoolExecutor = concurrent.futures.ThreadPoolExecutor(self.scanThreads, thread_name_prefix="scan")
+        return self.scanPoolExecutor
+
+
+    def check(self, file):
+        """
+        Check a single file and return a Result.
+        """
+        self._reset()
+        if self.profiling:
+            from .profiling import Counters, read_rss_peak, reset_rss_peak
+            self.profile = {"stages": {}, "total": None}
+            reset_rss_peak()
+            if self.heapPeaks is not None:
+                self.heapPeaks.enter()
+            start = Counters.now()
+        rc = self.checker(file)
+        if self.tracer is not None:
+            self.tracer.flush()
+        if self.profiling:
+            total = Counters.now().since(start)
+            total["reads"] = sum(v["reads"] for k, v in self.profile["stages"].items() if "/" not in k)
+            if self.heapPeaks is not None:
+                total["peak"] = self.heapPeaks.leave()
+            total["rss"] = read_rss_peak()
+            self.profile["total"] = total
+        return Result(file, rc, stages=self.stages, findings=self.findings,
+            errAttr=self.errAttr, warnAttr=self.warnAttr, infoAttr=self.infoAttr, profile=self.profile,
+            statistics=self.statistics)
+
+
+    def failure(self, file, detail):
+        """
+        Return the failed Result of *file* whose check raised *detail*, with
+        the findings so far and the exception as error of the stage it was
+        raised in.
+        """
+        stage = self.failedStage or "check"
+        message = str(detail) if isinstance(detail, CheckerError) else f"{type(detail).__name__}: {detail}"
+        self.stageName = stage
+        try:
+            self._error(message)
+        finally:
+            self.stageName = None
+        self.stages[stage.split("/")[0]] = 1
+        return Result(file, 1, stages=self.stages, findings=self.findings,
+            errAttr=self.errAttr, warnAttr=self.warnAttr, infoAttr=self.infoAttr)
+
+
+    @traced
     def checker(self, file):
         """
         check wrapping procedure
         """
 
-        # Load standard file for this file
+        # Load standard once, it is shared by all checked files
         if self.refDataset is None:
-            self._loadStandard()
-            print(f"Using CM SAF Metadata Standard Version {self.std_name_dh.version_number} ({self.std_name_dh.last_modified})")
+            if self.std_name_dh is None:
+                self._loadStandard()
+            self._print(f"Using CM SAF Metadata Standard Version {self.std_name_dh.version_number} ({self.std_name_dh.last_modified})")
 
         # Check for valid filename
         fileSuffix = re.compile(r'^\S+\.nc$')
         if not fileSuffix.match(file):
-            print(f"{RC_ERR} Filename must have '.nc' suffix")
-            exit(1)
+            raise InvalidFilenameError("Filename must have '.nc' suffix")
 
         # Read in netCDF file
-        try:
-            self.Dataset = DatasetX(file, mode='r')
-            self.File    = os.path.basename(os.path.realpath(self.Dataset.filepath()))
-        except RuntimeError as detail:
-            print(f"{RC_ERR} ", detail)
-            return 1
-        except Exception:
-            print(f"{RC_ERR} Could not open file, please check that NetCDF is formatted correctly.\n".upper())
-            return 1
-
-        # test compression
-        print(f"\n{'':=^80}\n>>> checking compression\n{'':=^80}")
-        rcCompress = self._checkCompression()
-        if rcCompress == 0:
-            print(f"\n{RC_OK} <<< compression")
-        else:
-            print(f"\n{RC_FAIL} <<< compression")
-
-        # test variables
-        print(f"\n{'':=^80}\n>>> checking variables\n{'':=^80}")
-        rcVariables = self._checkVariables()
-        if rcVariables == 0:
-            print(f"\n{RC_OK} <<< variables")
-        else:
-            print(f"\n{RC_FAIL} <<< variables")
+        with self._stage("open"), self._span("open", file=file):
+            try:
+                self.Dataset = DatasetX(file, mode='r', warn=self._warning, cache_size=self._arrayCacheSize())
+                self.File    = os.path.basename(os.path.realpath(self.Dataset.filepath()))
+                self.FileName = decode_filename(self.File)
+            except RuntimeError as detail:
+                self._error(str(detail))
+                self.stages["open"] = 1
+                return 1
+            except Exception:
+                self._error("Could not open file, please check that NetCDF is formatted correctly.\n".upper())
+                self.stages["open"] = 1
+                return 1
 
-        # test against reference
         try:
+            # test compression
+            self._print(f"\n{'':=^80}\n>>> checking compression\n{'':=^80}")
+            with self._stage("compression"):
+                rcCompress = self._checkStructure("compression", self._checkCompression)
+            self.stages["compression"] = rcCompress
+            if rcCompress == 0:
+                self._print(f"\n{RC_OK} <<< compression")
+            else:
+                self._print(f"\n{RC_FAIL} <<< compression")
+
+            # test variables
+            self._print(f"\n{'':=^80}\n>>> checking variables\n{'':=^80}")
+            with self._stage("variables"):
+                rcVariables = self._checkStructure("variables", self._checkVariables)
+            self.stages["variables"] = rcVariables
+            if rcVariables == 0:
+                self._print(f"\n{RC_OK} <<< variables")
+            else:
+                self._print(f"\n{RC_FAIL} <<< variables")
+
+            # test against reference
             if self.refDataset is not None:
-                print(f"\n{'':=^80}\n>>> checking metadata reference file\n{'':=^80}")
-                rc = self._checkReferenceFile()
+                self._print(f"\n{'':=^80}\n>>> checking metadata reference file\n{'':=^80}")
+                with self._stage("reference"):
+                    rc = self._checkReferenceFile()
+                self.stages["reference"] = rc
                 if rc == 0:
-                    print(f"\n{RC_OK} <<< metadata reference file")
+                    self._print(f"\n{RC_OK} <<< metadata reference file")
                 else:
-                    print(f"\n{RC_FAIL} <<< metadata reference file")
+                    self._print(f"\n{RC_FAIL} <<< metadata reference file")
             else:
-                print(f"\n{'':=^80}\n>>> checking metadata standard\n{'':=^80}")
-                rc = self._checkStandard()
+                self._print(f"\n{'':=^80}\n>>> checking metadata standard\n{'':=^80}")
+                with self._stage("standard"):
+                    rc = self._checkStandard()
+                self.stages["standard"] = rc
 
             if self.coordinates:
-                print(f"\n{'':=^80}\n>>> Checking coordinates\n{'':=^80}")
-                rcCoord = self._checkCoordinates()
+                self._print(f"\n{'':=^80}\n>>> Checking coordinates\n{'':=^80}")
+                with self._stage("coordinates"):
+                    rcCoord = self._checkCoordinates()
+                self.stages["coordinates"] = rcCoord
                 if rcCoord == 0:
-                    print(f"\n{RC_OK} <<< coordinates")
+                    self._print(f"\n{RC_OK} <<< coordinates")
                 else:
-                    print(f"\n{RC_FAIL} <<< coordinates")
+                    self._print(f"\n{RC_FAIL} <<< coordinates")
                 rc += rcCoord
+
+            if self.data:
+                self._print(f"\n{'':=^80}\n>>> checking data\n{'':=^80}")
+                with self._stage("data"):
+                    rcData = self._checkData()
+                self.stages["data"] = rcData
+                if rcData == 0:
+                    self._print(f"\n{RC_OK} <<< data")
+                else:
+                    self._print(f"\n{RC_FAIL} <<< data")
+                rc += rcData
         finally:
-            self.Dataset.close()
+            with self._span("close"):
+                self.Dataset.close()
 
         return rc+rcCompress+rcVariables
 
 
+    @traced
     def _checkStandard(self):
         """
         check global metadata against CM SAF standard
@@ -634,26 +1746,27 @@ class CMSAFChecker:
         # check global attributes
         rc = self._checkGlobalAttributes()
 
-        print(f"\n{'':=^80}\nMetadata Summary\n{'':=^80}")
-        print(f"ERRORs given: {self.err}")
+        self._print(f"\n{'':=^80}\nMetadata Summary\n{'':=^80}")
+        self._print(f"ERRORs given: {self.err}")
         if self.err > 0:
-            print("  in attributes: ", [s for s in self.errAttr])
-        print(f"WARNINGS given: {self.warn}")
+            self._print("  in attributes: ", [s for s in self.errAttr])
+        self._print(f"WARNINGS given: {self.warn}")
         if self.warn > 0:
-            print("  in attributes: ", [s for s in self.warnAttr])
-        print(f"INFORMATION messages: {self.info}")
+            self._print("  in attributes: ", [s for s in self.warnAttr])
+        self._print(f"INFORMATION messages: {self.info}")
         if self.info > 0:
-            print("  in attributes: ", [s for s in self.infoAttr])
+            self._print("  in attributes: ", [s for s in self.infoAttr])
 
         return rc
 
 
+    @traced
     def _checkGlobalAttributes(self):
         """
         Check global attributes
         """
 
-        print("\ncheck validity of global attributes.")
+        self._print("\ncheck validity of global attributes.")
         ds = self.Dataset
         rc = 0
 
@@ -661,316 +1774,350 @@ class CMSAFChecker:
         fn = os.path.realpath(ds.filepath())
         fn = os.path.basename (fn)
 
-        kwList = {}
-
-        # loop and find required attributes
-        for key in self.std_name_dh.dict:
-            attr = self.std_name_dh.dict[key]
+        kwList = self.keywords
 
-            # evaluate placeholders
+        # evaluate placeholders on a per file copy, the loaded standard is shared by all files
+        stdDict = dict(self.std_name_dh.dict)
+        for key, attr in stdDict.items():
             if attr['evaluate'] == "yes":
+                content = [dict(item) for item in attr['content']]
 
                 # reference attribute
                 if hasattr(ds, 'references'):
                     tmp = getattr(ds,'references')
-                    for index, item in enumerate(attr['content']):
+                    for item in content:
                         item['value'] = item['value'].replace("${references}", tmp)
 
                 # year
                 now = os.environ.get('CMSAF_RELEASE_YEAR')
                 if now is None:
                     now = datetime.datetime.now().strftime("%Y")
-                for index, item in enumerate(attr['content']):
+                for item in content:
                     item['value'] = item['value'].replace("${year}", now)
 
+                stdDict[key] = dict(attr, content=content)
+
+        # loop and find required attributes
+        for key, attr in stdDict.items():
+
             # test if required is defined
             if attr['required'] == "yes":
                 if not hasattr(ds, key):
                     if key in self.gIgnoreAtt:
-                        print(f"{RC_INFO} Ignoring missing required attribute '{key}'")
+                        self._info(f"Ignoring missing required attribute '{key}'")
                         self.info += 1
-                        self.infoAttr.append(key)
+                        self.infoAttr.add(key)
                     else:
-                        print(f"{RC_ERR} Missing required attribute '{key}'")
+                        self._error(f"Missing required attribute '{key}'")
                         self.err += 1
-                        self.errAttr.append(key)
+                        self.errAttr.add(key)
 
             # test improper attributes
             if attr['required'] == "none":
                 if hasattr(ds,key):
-                    print(f"{RC_ERR} Found improper attribute '{key}'")
+                    self._error(f"Found improper attribute '{key}'")
                     self.err += 1
-                    self.errAttr.append(key)
+                    self.errAttr.add(key)
 
         # loop global attributes and check
         for key in ds.ncattrs():
 
             attr  = getattr(ds,key)
-            keyRc = 0
 
             # file name
             if key == 'filename':
-                print(f"\n{key}:\n{attr}")
+                self._print(f"\n{key}:\n{attr}")
                 if fn != ds.filename:
-                    print(f"{RC_ERR} incorrect file name :: '{ds.filename}'")
-                    self.err += 1
-                    self.errAttr.append(key)
-
-            if key in self.std_name_dh.dict:
-                print(f"\n{key}:")
-                std = self.std_name_dh.dict[key]
-
-                # check attributes type
-                attrType = type(attr)
-                if attrType == type(np.array([])):
-                    if (attr.size == 1) and (type(attr[0]) == type(np.float32(1.0))):
-                        attrType = "f32"
-                    elif (attr.size == 1) and (type(attr[0]) == type(np.float64(1.0))):
-                        attrType = "f64"
-                else:
-                    if attrType == type(np.float64(1.0)):
-                        attrType = "f64"
-                    elif attrType == type(np.float32(1.0)):
-                        attrType = "f32"
-                    elif attrType == type(str('s')):
-                        attrType = 's'
-
-                if str.find(attrType, std['type']) == -1:
-                    print(f"{RC_ERR} Incorrect attribute data type")
-                    print(f"Expecting: {std['type']}, found: {attrType}")
-                    keyRc = 1
+                    self._error(f"incorrect file name :: '{ds.filename}'")
                     self.err += 1
-                    self.errAttr.append(key)
-
-                # report empty string attributes
-                if attrType == 's':
-                    if len(attr) == 0:
-                        if std['required'] == "yes":
-                            if key in self.gIgnoreAtt:
-                                print(f"{RC_INFO} Ignoring empty required attribute")
-                                self.info += 1
-                                if key not in self.infoAttr:
-                                    self.infoAttr.append(key)
-                            else:
-                                print(f"{RC_ERR} empty required attribute")
-                                self.err += 1
-                                if key not in self.errAttr:
-                                    self.errAttr.append(key)
-                        else:
-                            print(f"{RC_INFO} empty attribute")
-                            self.info += 1
-                            if key not in self.infoAttr:
-                                self.infoAttr.append(key)
-                        continue
+                    self.errAttr.add(key)
 
-                # skip non string from further checks
-                if attrType != 's':
-                    print(attr)
-                    continue
+            if key in stdDict:
+                self._print(f"\n{key}:")
+                self._checkGlobalAttributeMemo(key, attr, stdDict[key], kwList)
 
-                # start with empty list
-                attrList = []
+        if self.err > 0:
+            rc = 1
 
-                # join=or:  did any validator fire for any list element?
-                or_passed = False
+        return rc
 
-                # join=and: which required content values have been seen?
-                and_seen     = set()
 
-                # and_required covers <content> values only — <regex> elements act as format
-                # guards on whatever value is present, not as independently required entries.
-                # If join=and with <regex> is ever needed, revisit this assumption.
-                and_required = {item['value'] for item in std['content']}
+    def _checkGlobalAttributeMemo(self, key, attr, std, kwList):
+        """
+        Check the value of global attribute *key*, replaying the findings of
+        an identical value checked before.
 
-                # make a list if attribute is defined as a list of values
-                try:
-                    if len(std['list']) > 0:
-                        for row in csv.reader([attr], delimiter=std['list']):
-                            attrList = row
+        String values are memoized by standard, attribute, value, ignore state,
+        evaluated content and vocabulary version.
+        """
+        ds = self.Dataset
+        if self.attributeMemo.maxsize <= 0 or type(attr) is not str:
+            self._checkGlobalAttribute(key, attr, std, kwList)
+            return
+
+        vocabularies = ()
+        if len(std['keywords']) > 0:
+            vocabularies = tuple(getattr(ds, name, None) for name in re.findall(r'\$\{([a-z_]*)_version\}', std['keywords'][0]))
+        memoKey = (self.standardKey, key, attr, key in self.gIgnoreAtt,
+            tuple(item['value'] for item in std['content']), vocabularies)
+
+        recording = self.attributeMemo.lookup(memoKey)
+        if recording is None:
+            self.attributeMemo.store(memoKey, self._record(self._checkGlobalAttribute, key, attr, std, kwList))
+            return
+
+        self._replay(recording)
+        # every counted finding also adds the attribute to the matching list
+        if recording.err > 0:
+            self.errAttr.add(key)
+        if recording.warn > 0:
+            self.warnAttr.add(key)
+        if recording.info > 0:
+            self.infoAttr.add(key)
+
+
+    def _checkGlobalAttribute(self, key, attr, std, kwList):
+        """
+        Check the value of global attribute *key* against its standard entry *std*.
+        """
+        ds = self.Dataset
+        keyRc = 0
+
+        # check attributes type
+        attrType = type(attr)
+        if attrType == type(np.array([])):
+            if (attr.size == 1) and (type(attr[0]) == type(np.float32(1.0))):
+                attrType = "f32"
+            elif (attr.size == 1) and (type(attr[0]) == type(np.float64(1.0))):
+                attrType = "f64"
+        else:
+            if attrType == type(np.float64(1.0)):
+                attrType = "f64"
+            elif attrType == type(np.float32(1.0)):
+                attrType = "f32"
+            elif attrType == type(str('s')):
+                attrType = 's'
+
+        if str.find(attrType, std['type']) == -1:
+            self._error("Incorrect attribute data type")
+            self._print(f"Expecting: {std['type']}, found: {attrType}")
+            keyRc = 1
+            self.err += 1
+            self.errAttr.add(key)
+
+        # report empty string attributes
+        if attrType == 's':
+            if len(attr) == 0:
+                if std['required'] == "yes":
+                    if key in self.gIgnoreAtt:
+                        self._info("Ignoring empty required attribute")
+                        self.info += 1
+                        self.infoAttr.add(key)
                     else:
-                        attrList = [attr]
-                except UnicodeEncodeError as detail:
-                    print(f"{RC_ERR} {detail}")
-                    self.err += 1
-                    self.errAttr.append(key)
-
-                # loop content list
-                for a in attrList:
-                    attrMatch = []
-
-                    # remove white spaces, and quotes
-                    a_ = a.strip()
-                    a_ = a_.strip('"')
-                    if a != a_:
-                        print(f"{RC_WARN} white spaces or quotes detected")
-                        self.warn += 1
-                        if key not in self.warnAttr:
-                            self.warnAttr.append(key)
-                    a = a_
-                    print(a)
-
-                    # check attribute content
-                    if len(std['content']) > 0:
-
-                        # find the first matching content entry
-                        matched_item = next(
-                            (item for item in std['content'] if item['value'] == a),
-                            None,
-                        )
-
-                        if matched_item is not None:
-                            or_passed = True
-                            and_seen.add(matched_item['value'])
-                            attrMatch.append(matched_item)
+                        self._error("empty required attribute")
+                        self.err += 1
+                        self.errAttr.add(key)
+                else:
+                    self._info("empty attribute")
+                    self.info += 1
+                    self.infoAttr.add(key)
+                return
+
+        # skip non string from further checks
+        if attrType != 's':
+            self._print(attr)
+            return
+
+        # start with empty list
+        attrList = []
+
+        # join=or:  did any validator fire for any list element?
+        or_passed = False
+
+        # join=and: which required content values have been seen?
+        and_seen     = set()
+
+        # and_required covers <content> values only — <regex> elements act as format
+        # guards on whatever value is present, not as independently required entries.
+        # If join=and with <regex> is ever needed, revisit this assumption.
+        and_required = {item['value'] for item in std['content']}
+
+        # make a list if attribute is defined as a list of values
+        try:
+            if len(std['list']) > 0:
+                for row in csv.reader([attr], delimiter=std['list']):
+                    attrList = row
+            else:
+                attrList = [attr]
+        except UnicodeEncodeError as detail:
+            self._error(f"{detail}")
+            self.err += 1
+            self.errAttr.add(key)
+
+        # loop content list
+        for a in attrList:
+            attrMatch = []
+
+            # remove white spaces, and quotes
+            a_ = a.strip()
+            a_ = a_.strip('"')
+            if a != a_:
+                self._warning("white spaces or quotes detected")
+                self.warn += 1
+                self.warnAttr.add(key)
+            a = a_
+            self._print(a)
+
+            # check attribute content
+            if len(std['content']) > 0:
+
+                # find the first matching content entry
+                matched_item = next(
+                    (item for item in std['content'] if item['value'] == a),
+                    None,
+                )
+
+                if matched_item is not None:
+                    or_passed = True
+                    and_seen.add(matched_item['value'])
+                    attrMatch.append(matched_item)
+                else:
+                    if key in self.gIgnoreAtt:
+                        self._info(f"Ignoring incorrect attribute content '{key}'")
+                        self.info += 1
+                        self.infoAttr.add(key)
+                    else:
+                        self._error(f"incorrect attribute content :: '{a}'")
+                        if len(std['content']) == 1:
+                            self._print(f"Expecting: '{std['content'][0]['value']}'")
+                        keyRc = 1
+                        self.err += 1
+                        self.errAttr.add(key)
+
+            # check attribute content with regular expression
+            if len(std['regex']) > 0:
+                regex_matched = False
+                for item in std['regex']:
+                    if re.search(item['value'], a):
+                        if item['warn'] != "":
+                            self._warning(f"{item['warn']}")
+                            self.warn += 1
+                            self.warnAttr.add(key)
                         else:
-                            if key in self.gIgnoreAtt:
-                                print(f"{RC_INFO} Ignoring incorrect attribute content '{key}'")
-                                self.info += 1
-                                if key not in self.infoAttr:
-                                    self.infoAttr.append(key)
-                            else:
-                                print(f"{RC_ERR} incorrect attribute content :: '{a}'")
-                                if len(std['content']) == 1:
-                                    print(f"Expecting: '{std['content'][0]['value']}'")
-                                keyRc = 1
-                                self.err += 1
-                                if key not in self.errAttr:
-                                    self.errAttr.append(key)
-
-                    # check attribute content with regular expression
-                    if len(std['regex']) > 0:
-                        regex_matched = False
-                        for item in std['regex']:
-                            if re.search(item['value'], a):
-                                if item['warn'] != "":
-                                    print(f"{RC_WARN} {item['warn']}")
-                                    self.warn += 1
-                                    if key not in self.warnAttr:
-                                        self.warnAttr.append(key)
-                                else:
-                                    regex_matched = True
-                                    attrMatch.append(item)
+                            regex_matched = True
+                            attrMatch.append(item)
 
-                        if regex_matched:
-                            or_passed = True
+                if regex_matched:
+                    or_passed = True
+                else:
+                    if key in self.gIgnoreAtt:
+                        self._info(f"Ignoring incorrect attribute content '{key}'")
+                        self.info += 1
+                        self.infoAttr.add(key)
+                    else:
+                        self._error(f"incorrect attribute content :: '{a}'")
+                        keyRc = 1
+                        self.err += 1
+                        self.errAttr.add(key)
+
+            # check keyword list
+            if len(std['keywords']) > 0:
+                # read new keyword list from file
+                keywordsFn = std['keywords'][0]
+                if not keywordsFn in kwList:
+                    # evaluate keyword version number
+                    if keywordsFn.find('${') >= 0:
+                        vocabulary_version = None
+                        vocabulary_name    = None
+                        decode = re.match(r'^.*\$\{([a-z_]*)_version\}.*$', keywordsFn)
+                        if decode is not None:
+                            vocabulary_name = decode.group(1)
+                        if vocabulary_name is not None and hasattr(ds,vocabulary_name):
+                            decode = re.match(r'^.*Version +([0-9\.]*)$', getattr(ds,vocabulary_name))
+                            if decode is not None:
+                                vocabulary_version = decode.group(1)
+                        if vocabulary_version is not None and vocabulary_name is not None:
+                            keywordsFn = keywordsFn.replace('${'+vocabulary_name+'_version}',vocabulary_version)
+                    kw = Keywords(filename=keywordsFn, search_paths=self.search_paths)
+                    with self._span("vocabulary", file=keywordsFn):
+                        kwRc = kw.readFile()
+                    if kwRc != 0:
+                        self._print(kw.error)
+                        self._error("Test incomplete")
+                        self.err += 1
+                        self.errAttr.add(key)
+                        continue
+                    kwList[keywordsFn] = kw;
+                else:
+                    kw = kwList[keywordsFn]
+
+                # loop matches
+                for mIndex, mItem in enumerate(attrMatch):
+                    if mItem['type'] == "keyword":
+                        # split keyword path on ' > ' separator
+                        entryList = re.split(" *> *", a)
+                        entryItem = " > ".join(entryList)
+
+                        # find all vocabulary paths whose leaf matches the last element
+                        kwItem = kw.findKeywordList(entryList[-1])
+                        if not kwItem:
+                            self._error(f"'{entryList[-1]}' not found as a keyword leaf in the vocabulary")
+                            self.err += 1
+                            self.errAttr.add(key)
                         else:
-                            if key in self.gIgnoreAtt:
-                                print(f"{RC_INFO} Ignoring incorrect attribute content '{key}'")
-                                self.info += 1
-                                if key not in self.infoAttr:
-                                    self.infoAttr.append(key)
+                            # Build a pattern that matches the supplied path at the right end.
+                            # For Short_Name-structured vocabularies (providers, instruments),
+                            # a single term may be the Short_Name at the start of the path,
+                            # so match it as any complete path segment.
+                            # For science keyword hierarchies, a single term must be the
+                            # leaf (rightmost element), so anchor to the end only.
+                            if len(entryList) == 1:
+                                if 'Short_Name' in (kw.groups or []):
+                                    entryP = "(^| > )" + re.escape(entryItem) + "( > |$)"
+                                else:
+                                    entryP = "(^| > )" + re.escape(entryItem) + "$"
                             else:
-                                print(f"{RC_ERR} incorrect attribute content :: '{a}'")
-                                keyRc = 1
+                                entryP = ".*" + re.escape(entryItem) + "$"
+
+                            matchingPaths = [item for item in kwItem
+                                             if re.search(entryP, item) is not None]
+                            entryHits = len(matchingPaths)
+
+                            if entryHits == 1:
+                                self._print(f"decoded as '{matchingPaths[0]}'")
+                                or_passed = True
+                            elif entryHits == 0:
+                                self._error(f"keyword path '{entryItem}' not found; "
+                                      f"valid paths containing '{entryList[-1]}':")
+                                for item in kwItem:
+                                    self._print(f"  {item}")
                                 self.err += 1
-                                if key not in self.errAttr:
-                                    self.errAttr.append(key)
-
-                    # check keyword list
-                    if len(std['keywords']) > 0:
-                        # read new keyword list from file
-                        keywordsFn = std['keywords'][0]
-                        if not keywordsFn in kwList:
-                            # evaluate keyword version number
-                            if keywordsFn.find('${') >= 0:
-                                vocabulary_version = None
-                                vocabulary_name    = None
-                                decode = re.match(r'^.*\$\{([a-z_]*)_version\}.*$', keywordsFn)
-                                if decode is not None:
-                                    vocabulary_name = decode.group(1)
-                                if vocabulary_name is not None and hasattr(ds,vocabulary_name):
-                                    decode = re.match(r'^.*Version +([0-9\.]*)$', getattr(ds,vocabulary_name))
-                                    if decode is not None:
-                                        vocabulary_version = decode.group(1)
-                                if vocabulary_version is not None and vocabulary_name is not None:
-                                    keywordsFn = keywordsFn.replace('${'+vocabulary_name+'_version}',vocabulary_version)
-                            kw = Keywords(filename=keywordsFn, search_paths=self.search_paths)
-                            keyRc = kw.readFile()
-                            if keyRc != 0:
-                                print(f"{RC_ERR} Test incomplete")
+                                self.errAttr.add(key)
+                            else:
+                                self._error(f"keyword '{entryItem}' is ambiguous "
+                                      f"({entryHits} matches); be more specific, e.g.:")
+                                for item in matchingPaths:
+                                    self._print(f"  {item}")
                                 self.err += 1
-                                self.errAttr.append(key)
-                                continue
-                            kwList[keywordsFn] = kw;
-                        else:
-                            kw = kwList[keywordsFn]
-
-                        # loop matches
-                        for mIndex, mItem in enumerate(attrMatch):
-                            if mItem['type'] == "keyword":
-                                # split keyword path on ' > ' separator
-                                entryList = re.split(" *> *", a)
-                                entryItem = " > ".join(entryList)
-
-                                # find all vocabulary paths whose leaf matches the last element
-                                kwItem = kw.findKeywordList(entryList[-1])
-                                if not kwItem:
-                                    print(f"{RC_ERR} '{entryList[-1]}' not found as a keyword leaf in the vocabulary")
-                                    self.err += 1
-                                    if key not in self.errAttr:
-                                        self.errAttr.append(key)
-                                else:
-                                    # Build a pattern that matches the supplied path at the right end.
-                                    # For Short_Name-structured vocabularies (providers, instruments),
-                                    # a single term may be the Short_Name at the start of the path,
-                                    # so match it as any complete path segment.
-                                    # For science keyword hierarchies, a single term must be the
-                                    # leaf (rightmost element), so anchor to the end only.
-                                    if len(entryList) == 1:
-                                        if 'Short_Name' in (kw.groups or []):
-                                            entryP = "(^| > )" + re.escape(entryItem) + "( > |$)"
-                                        else:
-                                            entryP = "(^| > )" + re.escape(entryItem) + "$"
-                                    else:
-                                        entryP = ".*" + re.escape(entryItem) + "$"
-
-                                    matchingPaths = [item for item in kwItem
-                                                     if re.search(entryP, item) is not None]
-                                    entryHits = len(matchingPaths)
-
-                                    if entryHits == 1:
-                                        print(f"decoded as '{matchingPaths[0]}'")
-                                        or_passed = True
-                                    elif entryHits == 0:
-                                        print(f"{RC_ERR} keyword path '{entryItem}' not found; "
-                                              f"valid paths containing '{entryList[-1]}':")
-                                        for item in kwItem:
-                                            print(f"  {item}")
-                                        self.err += 1
-                                        if key not in self.errAttr:
-                                            self.errAttr.append(key)
-                                    else:
-                                        print(f"{RC_ERR} keyword '{entryItem}' is ambiguous "
-                                              f"({entryHits} matches); be more specific, e.g.:")
-                                        for item in matchingPaths:
-                                            print(f"  {item}")
-                                        self.err += 1
-                                        if key not in self.errAttr:
-                                            self.errAttr.append(key)
-
-                # evaluate hits
-                if len(attrList) >= 1:
-                    if std['join'].lower() == "or":
-                        if not or_passed and keyRc == 0:
-                            print(f"{RC_ERR} missing a correct value for attribute '{key}'")
-                            keyRc = 1
-                            self.err += 1
-                            if key not in self.errAttr:
-                                self.errAttr.append(key)
-                    elif std['join'].lower() == "and":
-                        for value in sorted(and_required - and_seen):
-                            print(f"{RC_ERR} missing required specific attribute content :: '{value}'")
-                            keyRc = 1
-                            self.err += 1
-                            if key not in self.errAttr:
-                                self.errAttr.append(key)
-
-        if self.err > 0:
-            rc = 1
+                                self.errAttr.add(key)
 
-        return rc
+        # evaluate hits
+        if len(attrList) >= 1:
+            if std['join'].lower() == "or":
+                if not or_passed and keyRc == 0:
+                    self._error(f"missing a correct value for attribute '{key}'")
+                    keyRc = 1
+                    self.err += 1
+                    self.errAttr.add(key)
+            elif std['join'].lower() == "and":
+                for value in sorted(and_required - and_seen):
+                    self._error(f"missing required specific attribute content :: '{value}'")
+                    keyRc = 1
+                    self.err += 1
+                    self.errAttr.add(key)
 
 
+    @traced
     def _checkReferenceAttributes(self, new, ref, parent, ignore=None):
         """
         check all attributes in group against refence file
@@ -991,9 +2138,9 @@ class CMSAFChecker:
             # just test if attribute is there
             if not hasattr(new, attName):
                 if attName in ignore:
-                    print(f"{RC_INFO} Missing attribute :: '{attNameFull}'")
+                    self._info(f"Missing attribute :: '{attNameFull}'")
                 else:
-                    print(f"{RC_ERR} Missing attribute :: '{attNameFull}'")
+                    self._error(f"Missing attribute :: '{attNameFull}'")
                     rc = 1
             else:
                 # mark as read
@@ -1002,13 +2149,13 @@ class CMSAFChecker:
                 # file name
                 if attName == 'filename':
                     if self.File != new.filename:
-                        print(f"{RC_ERR} incorrect file name :: '{new.filename}'")
+                        self._error(f"incorrect file name :: '{new.filename}'")
                         rc = 1
                     continue
 
                 # skip attributes that are allowed to change
                 elif attName in ignore:
-                    print(f"{RC_INFO} changing attribute {attNameFull} :: '{getattr(new,attName)}'")
+                    self._info(f"changing attribute {attNameFull} :: '{getattr(new,attName)}'")
                     continue
 
                     # test if attributes are identical
@@ -1022,13 +2169,13 @@ class CMSAFChecker:
                         else:
                             tmp = np.where(np.absolute(ar-ac) > 0)[0]
                         if len(tmp) > 0:
-                            print(f"{RC_ERR} attribute '{attNameFull}' differ")
-                            print(f"{'':<4}{attNameFull} :: expecting '{ar}', found '{ac}'")
+                            self._error(f"attribute '{attNameFull}' differ")
+                            self._print(f"{'':<4}{attNameFull} :: expecting '{ar}', found '{ac}'")
                             rc = 1
                     else:
                         if ar != ac:
-                            print(f"{RC_ERR} attribute '{attNameFull}' differ")
-                            print(f"{'':<4}{attNameFull} ::  expecting '{ar}', found '{ac}'")
+                            self._error(f"attribute '{attNameFull}' differ")
+                            self._print(f"{'':<4}{attNameFull} ::  expecting '{ar}', found '{ac}'")
                             rc = 1
 
         # check for new attributes
@@ -1041,14 +2188,15 @@ class CMSAFChecker:
             if not attName in attCheck:
                 # skip attributes that are allowed to change
                 if attName in ignore:
-                    print(f"{RC_INFO} changing new attribute {attNameFull} :: '{getattr(new,attName)}'")
+                    self._info(f"changing new attribute {attNameFull} :: '{getattr(new,attName)}'")
                 else:
-                    print(f"{RC_ERR} New attribute {attNameFull} :: '{getattr(new,attName)}'")
+                    self._error(f"New attribute {attNameFull} :: '{getattr(new,attName)}'")
                     rc = 1
 
         return rc
 
 
+    @traced
     def _checkReferenceVariables(self, new, ref):
         """
         check all variables in group against refence file
@@ -1060,7 +2208,7 @@ class CMSAFChecker:
         for varName in ref.variables:
             # test if variable exists
             if not varName in new.variables:
-                print(f"{RC_ERR} missing variable :: '{varName}'")
+                self._error(f"missing variable :: '{varName}'")
                 rc = 1
             else:
                 # mark as read
@@ -1080,14 +2228,14 @@ class CMSAFChecker:
 
                 # check data type
                 if vr.dtype != vc.dtype:
-                    print(f"{RC_ERR} type of variable '{varName}' differs from reference.")
-                    print(f"## ref='{vr.dtype}', file='{vc.dtype}'")
+                    self._error(f"type of variable '{varName}' differs from reference.")
+                    self._print(f"## ref='{vr.dtype}', file='{vc.dtype}'")
                     rc = 1
 
                 # check array shape
                 if not self.refDataset.isSwathData() and vr.shape != vc.shape:
-                    print(f"{RC_ERR} shape of variable '{varName}' differs from reference.")
-                    print(f"## ref='{vr.shape}', file='{vc.shape}'")
+                    self._error(f"shape of variable '{varName}' differs from reference.")
+                    self._print(f"## ref='{vr.shape}', file='{vc.shape}'")
                     rc = 1
 
                 # track global attributes
@@ -1100,12 +2248,13 @@ class CMSAFChecker:
         # check for new variables
         for varName in new.variables:
             if not varName in varCheck:
-                print(f"{RC_ERR} new variable '{varName}'")
+                self._error(f"new variable '{varName}'")
                 rc = 1
 
         return rc
 
 
+    @traced
     def _checkReferenceFile(self):
         """
         Check metadata from a file against a reference file.
@@ -1118,7 +2267,7 @@ class CMSAFChecker:
         fn = os.path.basename (fn)
 
         # process global attributes
-        print("global attributes")
+        self._print("global attributes")
 
         # track global attributes
         grpCheck = {}
@@ -1127,41 +2276,42 @@ class CMSAFChecker:
         rc = self._checkReferenceAttributes(self.Dataset, self.refDataset, "/")
 
         # check group attributes
-        print("\ngroup attributes")
+        self._print("\ngroup attributes")
         for grpName in self.refDataset.groups:
             if grpName in self.Dataset.groups:
                 rc = self._checkReferenceAttributes(self.Dataset.groups[grpName], self.refDataset.groups[grpName], grpName)
                 grpCheck[grpName] = 1
             else:
-                print(f"{RC_ERR} missing group '{grpName}'")
+                self._error(f"missing group '{grpName}'")
 
         # check for new groups
         for grpName in self.Dataset.groups:
             if not grpName in grpCheck:
-                print(f"{RC_ERR} new group '{grpName}'")
+                self._error(f"new group '{grpName}'")
                 rc = 1
 
         # print global attribute check result
         if rc == 0:
-            print(f"\n{RC_OK} <<< reference attributes")
+            self._print(f"\n{RC_OK} <<< reference attributes")
         else:
-            print(f"\n{RC_FAIL} <<< reference attributes")
+            self._print(f"\n{RC_FAIL} <<< reference attributes")
         rcAll = rc
 
         # process variables
-        print("\nvariables")
+        self._print("\nvariables")
         rc = self._checkReferenceVariables(self.Dataset, self.refDataset)
 
         # print result
         if rc == 0:
-            print(f"\n{RC_OK} <<< variables")
+            self._print(f"\n{RC_OK} <<< variables")
         else:
-            print(f"\n{RC_FAIL} <<< variables")
+            self._print(f"\n{RC_FAIL} <<< variables")
 
         # return to caller
         return rcAll + rc
 
 
+    @traced
     def _checkCoordinates(self):
         """
         Check coordinates of a netcdf file.
@@ -1180,32 +2330,32 @@ class CMSAFChecker:
             timeResolution = decode_timeDuration(ds.time_coverage_resolution)
 
         # decode stats and cycle
-        decode = re.match(CMSAF_NAMING_STANDARD, self.File)
+        decode = self.FileName
         expRecords = None
         expClimate = False
         expTimeDuration   = None
         expTimeResolution = None
 
         if decode is None:
-            print(f"{RC_WARN} filename '{self.File}' does not match CM SAF naming convention, skipping filename-derived checks")
+            self._warning(f"filename '{self.File}' does not match CM SAF naming convention, skipping filename-derived checks")
         else:
             # test for diurnal cycle
-            if decode.group(3) == 'd':
+            if decode.statistic == 'd':
                 expRecords = 24
                 if timeResolution is None:
                     timeResolution = decode_timeDuration("PT1H")
                 elif timeResolution != decode_timeDuration("PT1H"):
-                    print(f"{RC_ERR} ## expecting 'PT1H' as time_coverage_resolution for diurnal cycle")
+                    self._error("## expecting 'PT1H' as time_coverage_resolution for diurnal cycle")
                     tests['time'] = 1
                     timeResolution = decode_timeDuration("PT1H")
             # monthly climatology
-            elif decode.group(2) == 'c' and decode.group(3) == 'm':
+            elif decode.timeCode == 'c' and decode.statistic == 'm':
                 expRecords = 12
-            elif decode.group(2) != 'i':
+            elif decode.timeCode != 'i':
                 expRecords = 1
 
             # get expected number of records from time_coverage_resolution and time_coverage_duration
-            if decode.group(2) == 'i':
+            if decode.timeCode == 'i':
                 if (timeDuration is not None) and (timeResolution is not None):
                     td = datetime.timedelta(days=timeDuration.day,   hours=timeDuration.hour,   minutes=timeDuration.minute,   seconds=timeDuration.second)
                     tr = datetime.timedelta(days=timeResolution.day, hours=timeResolution.hour, minutes=timeResolution.minute, seconds=timeResolution.second)
@@ -1213,19 +2363,19 @@ class CMSAFChecker:
                     expRecords = int(expRecords[0])
 
             # expect climate attribute
-            if decode.group(2) == 'c' or decode.group(3) == 'd':
+            if decode.timeCode == 'c' or decode.statistic == 'd':
                 expClimate = True
 
             # expecting duration and resolution
-            if decode.group(2) == 'm':
+            if decode.timeCode == 'm':
                 expTimeDuration   = ('P1M','P0000-01-00T00:00:00')
                 expTimeResolution = ('P1M','P0000-01-00T00:00:00')
-            if decode.group(2) == 'd':
+            if decode.timeCode == 'd':
                 expTimeDuration   = ('P1D', 'P0000-00-01T00:00:00')
                 expTimeResolution = ('P1D', 'P0000-00-01T00:00:00')
-            if decode.group(3) == 'd':
+            if decode.statistic == 'd':
                 expTimeResolution = ('PT1H', 'P0000-00-00T01:00:00')
-            if decode.group(2) == 'h':
+            if decode.timeCode == 'h':
                 expTimeResolution = ('PT1H', 'P0000-00-00T01:00:00')
                 expTimeDuration   = ('P1D', 'P0000-00-01T00:00:00', 'PT1H', 'P0000-00-00T01:00:00')
                 if (timeDuration is not None) and (timeResolution is not None):
@@ -1238,180 +2388,192 @@ class CMSAFChecker:
         axisTime = ds.getCoordinates("time", shortName=["time"])
 
         # find record_status variables
-        tmp = ds.getVariableByName("record_status")
-        recordStatus = {}
-        print("\n>>> record_status")
+        with self._stage("record_status"):
+            tmp = ds.getVariableByName("record_status")
+            recordStatus = {}
+            self._print("\n>>> record_status")
 
-        if len(tmp) == 0:
-            if ds.isSwathData():
-                print(f"{RC_INFO} record_status variable not required for 'swath' data")
-                tests['record_status'] = 0
-            else:
-                print(f"{RC_ERR} missing record_status variable")
-                tests['record_status'] = 1
-        else:
-            tests['record_status'] = 0
-
-        # test all record status variables
-        for key in tmp.keys():
-            print(f"{'':<4}{key}")
-            item = tmp[key]
-            recordStatus[key] = { "var": item, "dict": None, "val": None, "mask": None, "time": None, }
-
-            itemPath = os.path.dirname(key)
-            if hasattr(item,'flag_meanings') and hasattr(item,'flag_values'):
-                recordStatus[key]["dict"] = dict(zip(item.flag_values,item.flag_meanings.split(" ")))
-                recordStatus[key]["val"]  = item[:]
-                recordStatus[key]["mask"] = np.ma.getmaskarray(item[:])
+            if len(tmp) == 0:
+                if ds.isSwathData():
+                    self._info("record_status variable not required for 'swath' data")
+                    tests['record_status'] = 0
+                else:
+                    self._error("missing record_status variable")
+                    tests['record_status'] = 1
             else:
-                print(f"{'':<4}{RC_ERR} missing valid variable '{key}'")
-                tests['record_status'] = 1
-                rc = 1
+                tests['record_status'] = 0
 
-            # select valid time variable
-            keyTime = ds.matchCoordinateTime(item, axisTime)
-            if keyTime is not None:
-                recordStatus[key]["time"] = keyTime
-                if os.path.basename(keyTime) not in item.dimensions:
-                    print(f"{'':<4}{RC_ERR} missing time dimension for '{key}'")
+            # test all record status variables
+            for key in tmp.keys():
+                self._print(f"{'':<4}{key}")
+                item = tmp[key]
+                recordStatus[key] = { "var": item, "dict": None, "val": None, "mask": None, "time": None, }
+
+                itemPath = os.path.dirname(key)
+                if hasattr(item,'flag_meanings') and hasattr(item,'flag_values'):
+                    recordStatus[key]["dict"] = dict(zip(item.flag_values,item.flag_meanings.split(" ")))
+                    recordStatus[key]["val"]  = ds.readVar(item)
+                    recordStatus[key]["mask"] = np.ma.getmaskarray(recordStatus[key]["val"])
+                else:
+                    self._error(f"missing valid variable '{key}'", indent=4)
                     tests['record_status'] = 1
                     rc = 1
+
+                # select valid time variable
+                keyTime = ds.matchCoordinateTime(item, axisTime)
+                if keyTime is not None:
+                    recordStatus[key]["time"] = keyTime
+                    if os.path.basename(keyTime) not in item.dimensions:
+                        self._error(f"missing time dimension for '{key}'", indent=4)
+                        tests['record_status'] = 1
+                        rc = 1
+                else:
+                    self._error(f"missing valid time for '{key}'", indent=4)
+                    tests['record_status'] = 1
+                    rc = 1
+
+            # print result
+            if tests['record_status'] == 0:
+                self._print(f"\n{RC_OK} <<< record_status")
             else:
-                print(f"{'':<4}{RC_ERR} missing valid time for '{key}'")
-                tests['record_status'] = 1
+                self._print(f"\n{RC_FAIL} <<< record_status")
                 rc = 1
 
-        # print result
-        if tests['record_status'] == 0:
-            print(f"\n{RC_OK} <<< record_status")
-        else:
-            print(f"\n{RC_FAIL} <<< record_status")
-            rc = 1
+        with self._stage("time"):
+            self._print("\n>>> time")
 
-        print("\n>>> time")
+            # test time coordinates
+            tests['time'] = 0
+            if len(axisTime) == 0:
+                self._error("missing time variable")
+                tests['time'] = 1
 
-        # test time coordinates
-        tests['time'] = 0
-        if len(axisTime) == 0:
-            print(f"{RC_ERR} missing time variable")
-            tests['time'] = 1
+            for vTime in axisTime.keys():
+                self._print(f"\n{'':<4}{vTime}")
 
-        for vTime in axisTime.keys():
-            print(f"\n{'':<4}{vTime}")
+                itRc = self._checkCoordinatesTime(axisTime[vTime], expClimate=expClimate, expRecords=expRecords, \
+                        expResolution=timeResolution, recordStatus=recordStatus)
 
-            itRc = self._checkCoordinatesTime(axisTime[vTime], expClimate=expClimate, expRecords=expRecords, \
-                    expResolution=timeResolution, recordStatus=recordStatus)
+                # print result
+                if itRc == 0:
+                    self._print(f"\n{'':<4}{RC_OK} <<< coordinate '{vTime}'")
+                else:
+                    self._print(f"\n{'':<4}{RC_FAIL} <<< coordinate '{vTime}'")
+                    tests['time'] = 1
 
-            # print result
-            if itRc == 0:
-                print(f"\n{'':<4}{RC_OK} <<< coordinate '{vTime}'")
-            else:
-                print(f"\n{'':<4}{RC_FAIL} <<< coordinate '{vTime}'")
-                tests['time'] = 1
+            # time related global attributes
+            if expTimeDuration is not None and hasattr(ds,"time_coverage_duration"):
+                if ds.time_coverage_duration not in expTimeDuration:
+                    self._print("")
+                    self._error(f"Unexpected time_coverage_duration '{ds.time_coverage_duration}'", indent=4)
+                    tests['time'] = 1
+                else:
+                    self._print(f"\n{'':<4}time coverage duration: '{ds.time_coverage_duration}'")
 
-        # time related global attributes
-        if expTimeDuration is not None and hasattr(ds,"time_coverage_duration"):
-            if ds.time_coverage_duration not in expTimeDuration:
-                print(f"\n{'':<4}{RC_ERR} Unexpected time_coverage_duration '{ds.time_coverage_duration}'")
-                tests['time'] = 1
-            else:
-                print(f"\n{'':<4}time coverage duration: '{ds.time_coverage_duration}'")
+            if expTimeResolution is not None and hasattr(ds,"time_coverage_resolution"):
+                if ds.time_coverage_resolution not in expTimeResolution:
+                    self._error(f"Unexpected time_coverage_resolution '{ds.time_coverage_resolution}'", indent=4)
+                    tests['time'] = 1
+                else:
+                    self._print(f"{'':<4}time coverage resolution: '{ds.time_coverage_resolution}'")
 
-        if expTimeResolution is not None and hasattr(ds,"time_coverage_resolution"):
-            if ds.time_coverage_resolution not in expTimeResolution:
-                print(f"{'':<4}{RC_ERR} Unexpected time_coverage_resolution '{ds.time_coverage_resolution}'")
-                tests['time'] = 1
+            # print final time check result
+            if tests['time'] == 0:
+                self._print(f"\n{'':<4}{RC_OK} <<< time")
             else:
-                print(f"{'':<4}time coverage resolution: '{ds.time_coverage_resolution}'")
-
-        # print final time check result
-        if tests['time'] == 0:
-            print(f"\n{'':<4}{RC_OK} <<< time")
-        else:
-            print(f"\n{'':<4}{RC_FAIL} <<< time")
-            rc = 1
+                self._print(f"\n{'':<4}{RC_FAIL} <<< time")
+                rc = 1
 
-        resFile = cmsaf_decode_grid (self.File)
+        resFile = cmsaf_decode_grid(self.FileName, warn=self._warning)
 
         # test latitude
-        tests['lat'] = 0
-        axisLat = ds.getCoordinates("latitude", shortName=["lat","latitude"])
+        with self._stage("lat"):
+            tests['lat'] = 0
+            axisLat = ds.getCoordinates("latitude", shortName=["lat","latitude"])
 
-        print("\n>>> latitude")
+            self._print("\n>>> latitude")
 
-        if len(axisLat) == 0:
-            if resFile is None:
-                print(f"{'':<4}{RC_INFO} no regular grid expected from filename, skipping latitude coordinate check")
-                tests['lat'] = 0
-            else:
-                print(f"{'':<4}{RC_ERR} missing latitude coordinate")
+            if len(axisLat) == 0 and resFile is None:
+                axisLat = ds.getAuxiliaryCoordinates("latitude", shortName=["lat","latitude"])
+                if len(axisLat) == 0:
+                    self._info("no regular grid expected from filename, skipping latitude coordinate check", indent=4)
+                    tests['lat'] = 0
+                else:
+                    self._info("no regular grid expected from filename, checking 2-D latitude fields", indent=4)
+            elif len(axisLat) == 0:
+                self._error("missing latitude coordinate", indent=4)
                 tests['lat'] = 1
                 rc = 1
 
-        for vLat in axisLat.keys():
-            print(f"\n{'':<4}{vLat}")
+            for vLat in axisLat.keys():
+                self._print(f"\n{'':<4}{vLat}")
 
-            keyTime = ds.matchCoordinateTime(axisLat[vLat], axisTime)
-            itRc = self._checkCoordinatesGeo(axisLat[vLat], axisTime[keyTime], shortName="lat", longName="latitude", expAxis="Y")
+                keyTime = ds.matchCoordinateTime(axisLat[vLat], axisTime)
+                itRc = self._checkCoordinatesGeo(axisLat[vLat], axisTime.get(keyTime), shortName="lat", longName="latitude", expAxis="Y")
 
-            # print result
-            if itRc == 0:
-                print(f"\n{'':<4}{RC_OK} <<< coordinate '{vLat}'")
-            else:
-                print(f"\n{'':<4}{RC_FAIL} <<< coordinate '{vLat}'")
-                tests['lat'] = 1
+                # print result
+                if itRc == 0:
+                    self._print(f"\n{'':<4}{RC_OK} <<< coordinate '{vLat}'")
+                else:
+                    self._print(f"\n{'':<4}{RC_FAIL} <<< coordinate '{vLat}'")
+                    tests['lat'] = 1
 
-        # print final latitude check result
-        if tests['lat'] == 0:
-            print(f"\n{'':<4}{RC_OK} <<< latitude")
-        else:
-            print(f"\n{'':<4}{RC_FAIL} <<< latitude")
-            rc = 1
+            # print final latitude check result
+            if tests['lat'] == 0:
+                self._print(f"\n{'':<4}{RC_OK} <<< latitude")
+            else:
+                self._print(f"\n{'':<4}{RC_FAIL} <<< latitude")
+                rc = 1
 
         ## test longitude ##
-        tests['lon'] = 0
-        axisLon = ds.getCoordinates("longitude", shortName=["lon","longitude"])
+        with self._stage("lon"):
+            tests['lon'] = 0
+            axisLon = ds.getCoordinates("longitude", shortName=["lon","longitude"])
 
-        print("\n>>> longitude")
+            self._print("\n>>> longitude")
 
-        if len(axisLon) == 0:
-            if resFile is None:
-                print(f"{'':<4}{RC_INFO} no regular grid expected from filename, skipping longitude coordinate check")
-                tests['lon'] = 0
-            else:
-                print(f"{'':<4}{RC_ERR} missing longitude coordinate")
+            if len(axisLon) == 0 and resFile is None:
+                axisLon = ds.getAuxiliaryCoordinates("longitude", shortName=["lon","longitude"])
+                if len(axisLon) == 0:
+                    self._info("no regular grid expected from filename, skipping longitude coordinate check", indent=4)
+                    tests['lon'] = 0
+                else:
+                    self._info("no regular grid expected from filename, checking 2-D longitude fields", indent=4)
+            elif len(axisLon) == 0:
+                self._error("missing longitude coordinate", indent=4)
                 tests['lon'] = 1
                 rc = 1
 
-        for vLon in axisLon.keys():
-            print(f"\n{'':<4}{vLon}")
+            for vLon in axisLon.keys():
+                self._print(f"\n{'':<4}{vLon}")
 
-            keyTime = ds.matchCoordinateTime(axisLon[vLon], axisTime)
-            itRc = self._checkCoordinatesGeo(axisLon[vLon], axisTime[keyTime], shortName="lon", longName="longitude", expAxis="X")
+                keyTime = ds.matchCoordinateTime(axisLon[vLon], axisTime)
+                itRc = self._checkCoordinatesGeo(axisLon[vLon], axisTime.get(keyTime), shortName="lon", longName="longitude", expAxis="X")
 
-            # print result
-            if itRc == 0:
-                print(f"\n{'':<4}{RC_OK} <<< coordinate '{vLon}'")
-            else:
-                print(f"\n{'':<4}{RC_FAIL} <<< coordinate '{vLon}'")
-                tests['lon'] = 1
+                # print result
+                if itRc == 0:
+                    self._print(f"\n{'':<4}{RC_OK} <<< coordinate '{vLon}'")
+                else:
+                    self._print(f"\n{'':<4}{RC_FAIL} <<< coordinate '{vLon}'")
+                    tests['lon'] = 1
 
-        # print final longitude check result
-        if tests['lon'] == 0:
-            print(f"\n{'':<4}{RC_OK} <<< longitude")
-        else:
-            print(f"\n{'':<4}{RC_FAIL} <<< longitude")
-            rc = 1
+            # print final longitude check result
+            if tests['lon'] == 0:
+                self._print(f"\n{'':<4}{RC_OK} <<< longitude")
+            else:
+                self._print(f"\n{'':<4}{RC_FAIL} <<< longitude")
+                rc = 1
 
-        print("\nsummary coordinates")
+        self._print("\nsummary coordinates")
         tmp=["OK", "FAILED"]
         for key in tests:
-            print(f"{'':<4}{key} :: {tmp[tests[key]]}", end='')
-        print('')
+            self._print(f"{'':<4}{key} :: {tmp[tests[key]]}", end='')
+        self._print('')
 
         return rc
 
 
+    @traced
     def _checkCoordinatesTime(self, timeC, expClimate=False, expRecords=None, expResolution=None, recordStatus=None):
         """
         Check time coordinates of a netcdf file.
@@ -1420,6 +2582,7 @@ class CMSAFChecker:
         rc = 0
         ds = self.Dataset
         tUnits = None
+        sinceYr = None
         tSteps = None
         timeCoverStart = None
         timeCoverEnd = None
@@ -1439,34 +2602,34 @@ class CMSAFChecker:
 
         # test axis attribute
         if not hasattr(timeC,"axis"):
-            print(f"{'':<8}{RC_ERR} missing mandatory attribute 'axis'")
+            self._error("missing mandatory attribute 'axis'", indent=8)
             rc = -1
         elif timeC.axis != "T":
-            print(f"{'':<8}{RC_ERR} invalid value attribute 'axis={timeC.axis}'")
+            self._error(f"invalid value attribute 'axis={timeC.axis}'", indent=8)
             rc = -1
 
         # test for climate bounds
         if expClimate:
             if not hasattr(timeC,'climatology'):
-                print(f"{'':<8}{RC_WARN} Expecting attribute 'climatology' as attribute for time bounds time")
+                self._warning("Expecting attribute 'climatology' as attribute for time bounds time", indent=8)
         else:
             if hasattr(timeC,'climatology'):
-                print(f"{'':<8}{RC_WARN} Found unexpected attribute 'climatology' as attribute for time bounds time")
+                self._warning("Found unexpected attribute 'climatology' as attribute for time bounds time", indent=8)
 
         # decode time record in file
         if not hasattr(timeC,'units'):
-            print(f"{'':<8}{RC_ERR} missing mandatory attribute 'units' for time axis")
+            self._error("missing mandatory attribute 'units' for time axis", indent=8)
             rc = 1
         else:
             tUnits = timeC.units
             sinceYr = re.match('(.*since )((-)?[-0-9]{4})(.*)', tUnits)
             if sinceYr == None:
-                print(f"{'':<8}{RC_ERR} invalid time axis: '{tUnits}'")
+                self._error(f"invalid time axis: '{tUnits}'", indent=8)
                 rc = 1
             else:
                 sinceYr = int(sinceYr.group(2))
                 if sinceYr < 1958:
-                    print(f"{'':<8}{RC_ERR} invalid time axis: '{tUnits}'")
+                    self._error(f"invalid time axis: '{tUnits}'", indent=8)
                     rc = -1
 
         # found valid time unit
@@ -1475,69 +2638,75 @@ class CMSAFChecker:
                 calendar = timeC.calendar
 
             # decode all time steps if not swath files, otherwise just first and last step
-            axisTmp = timeC
+            # and check the order and gaps of all scanlines without decoding them;
+            # the values are read in blocks within the memory budget
             if ds.isSwathData():
                 axisTmp = np.empty(2, dtype=timeC.dtype)
-                axisTmp[0] = timeC[0]
-                axisTmp[1] = timeC[-1]
-                print(f"{'':<8}{RC_INFO} checking only first an last record for swath data.")
+                axisTmp[0] = ds.readVar(timeC, 0)
+                axisTmp[1] = ds.readVar(timeC, -1)
+                blocks = [(0, axisTmp)]
+                self._info("decoding first and last record for swath data, checking all scanline times on the stored values.", indent=8)
+                if self._checkScanlineTimes(timeC, expResolution):
+                    rc = 1
+            else:
+                axisTmp = timeC
+                blocks = ((rows.start or 0, ds.readVar(timeC, rows)) for rows in self._blocks(timeC, timeC.dtype.itemsize))
 
             try:
                 tSteps = np.empty(axisTmp.shape, dtype=datetime.datetime)
-                it = np.nditer(axisTmp, flags=['c_index'])
-                while not it.finished:
-                    if sinceYr < 1:
-                        t = Time(axisTmp[it.index], format='jd', scale='utc', precision=4)
-                        t = datetime.datetime.strptime(t.isot, "%Y-%m-%dT%H:%M:%S.%f")
-                        if t is not None:
-                            tSteps[it.index] = t.replace(tzinfo=pytz.utc);
-                    else:
+                for start, values in blocks:
+                    for index, value in enumerate(values, start):
+                        if sinceYr < 1:
+                            tSteps[index] = julian_day_to_datetime(value)
+                            continue
                         try:
-                            t = num2date (axisTmp[it.index], timeC.units, calendar=calendar)
+                            t = netCDF4.num2date(value, timeC.units, calendar=calendar)
                             if isinstance(t, datetime.datetime):
-                                t = t.replace(tzinfo=pytz.utc)
+                                t = t.replace(tzinfo=datetime.timezone.utc)
                             tmp = np.around(t.microsecond * np.float64(0.01)).astype(np.int64)*100
                             if t.microsecond > 0:
-                                print(f"{'':<8}{RC_WARN} time record not exact (mus={t.microsecond})")
+                                self._warning(f"time record not exact (mus={t.microsecond})", indent=8)
                             t  = t + datetime.timedelta(microseconds=int(tmp-t.microsecond))
                         except ValueError:
-                            print(f"{'':<8}{RC_ERR} invalid time record")
+                            self._error("invalid time record", indent=8)
                             rc = 1
                             t = None
 
                         if t is not None:
-                            tSteps[it.index] = t
-                    it.iternext()
+                            tSteps[index] = t
             except Exception:
                 rc = 1
-                print(f"{'':<8}{RC_ERR} invalid time axis.")
+                self._error("invalid time axis.", indent=8)
 
         # decode time record in file name
-        decode = re.match(CMSAF_NAMING_STANDARD, self.File)
-        try:
-            timeStepFn = datetime.datetime.strptime(self.File[5:17], "%Y%m%d%H%M")
-            timeStepFn = timeStepFn.replace(tzinfo=pytz.utc);
-        except ValueError:
-            timeStepFn = None
+        decode = self.FileName
+        if decode is not None:
+            timeStepFn = decode.time
+        else:
+            try:
+                timeStepFn = datetime.datetime.strptime(self.File[5:17], "%Y%m%d%H%M")
+                timeStepFn = timeStepFn.replace(tzinfo=datetime.timezone.utc)
+            except ValueError:
+                timeStepFn = None
 
         # checks on time steps
         if tSteps is not None:
             # compare dates
             if decode is not None and ds.isSwathData() == False:
-                if timeStepFn is not None and decode.group(9) == "002" and decode.group(1) == "UTH":
+                if timeStepFn is not None and decode.version == "002" and decode.product == "UTH":
                     timeStepFn = timeStepFn - datetime.timedelta(days=0, hours=0, minutes=30, seconds=0)
                 if (timeStepFn is not None) and (timeStepFn != tSteps[0]):
-                    print(f"{'':<8}{RC_ERR} time record mismatch, expecting {timeStepFn.isoformat()} as first record")
+                    self._error(f"time record mismatch, expecting {timeStepFn.isoformat()} as first record", indent=8)
                     rc = 1
             else:
                 if (timeStepFn is not None) and (tSteps[0] is not None) and (timeStepFn > tSteps[0]):
-                    print(f"{'':<8}{RC_ERR} time record mismatch, expecting {timeStepFn.isoformat()} before first record")
+                    self._error(f"time record mismatch, expecting {timeStepFn.isoformat()} before first record", indent=8)
                     rc = 1
 
             # test records
             if expRecords is not None:
                 if expRecords != tSteps.size:
-                    print(f"{'':<8}{RC_ERR} Expecting {expRecords} records but found {tSteps.size}.")
+                    self._error(f"Expecting {expRecords} records but found {tSteps.size}.", indent=8)
                     rc = 1
 
         # test time bounds
@@ -1555,35 +2724,39 @@ class CMSAFChecker:
                 if tmp in ds.getgrp(timeC.group().path).variables:
                     timeBoundsVar = ds.getvar(os.path.join(timeC.group().path,tmp))
             if timeBoundsVar is None:
-                print(f"{'':<8}{RC_ERR} Missing configured bounds variable '{tmp}'.")
+                self._error(f"Missing configured bounds variable '{tmp}'.", indent=8)
                 rc = 1
 
         # check bound units
         if timeBoundsVar is not None:
             if hasattr(timeBoundsVar,'units'):
                 if timeBoundsVar.units != tUnits:
-                    print(f"{'':<8}{RC_ERR} time bounds must have same axis as time, but found: {timeBoundsVar.units}")
+                    self._error(f"time bounds must have same axis as time, but found: {timeBoundsVar.units}", indent=8)
                     rc = 1
-            if timeBoundsVar.shape != (timeC[:].size,2):
-                print(f"{'':<8}{RC_ERR} time bounds must have shape (size_of_time,2), but found: {timeBoundsVar.shape}")
+            if timeBoundsVar.shape != (timeC.size,2):
+                self._error(f"time bounds must have shape (size_of_time,2), but found: {timeBoundsVar.shape}", indent=8)
+                rc = 1
+            elif sinceYr is None:
+                self._error("time bounds cannot be decoded without a valid time axis", indent=8)
                 rc = 1
             else:
                 timeBounds = np.empty(timeBoundsVar.shape, dtype=type(tSteps))
-                it = np.nditer(timeBoundsVar, flags=['multi_index'])
-                while not it.finished:
-                    if sinceYr < 1:
-                        t = Time(it[0], format='jd', scale='utc', precision=4)
-                        t = datetime.datetime.strptime(t.isot, "%Y-%m-%dT%H:%M:%S.%f")
-                        timeBounds[it.multi_index] = t.replace(tzinfo=pytz.utc)
-                    else:
-                        t = num2date(it[0], tUnits, calendar=calendar)
-                        if isinstance(t, datetime.datetime):
-                            t = t.replace(tzinfo=pytz.utc)
-                        timeBounds[it.multi_index] = t
-                    it.iternext()
+                for rows in self._blocks(timeBoundsVar, timeBoundsVar.dtype.itemsize):
+                    start = rows.start or 0
+                    it = np.nditer(ds.readVar(timeBoundsVar, rows), flags=['multi_index'])
+                    while not it.finished:
+                        index = (start + it.multi_index[0], it.multi_index[1])
+                        if sinceYr < 1:
+                            timeBounds[index] = julian_day_to_datetime(it[0])
+                        else:
+                            t = netCDF4.num2date(it[0], tUnits, calendar=calendar)
+                            if isinstance(t, datetime.datetime):
+                                t = t.replace(tzinfo=datetime.timezone.utc)
+                            timeBounds[index] = t
+                        it.iternext()
 
             # check if time bounds are required
-            if timeBounds is None:
+            if timeBounds is None and sinceYr is not None:
                 expTimeBounds = True
 
                 # no bounds for swath data
@@ -1608,17 +2781,17 @@ class CMSAFChecker:
                         expTimeBounds = False
 
                 if expTimeBounds:
-                    print(f"{'':<8}{RC_ERR} Missing time bounds")
+                    self._error("Missing time bounds", indent=8)
                     if not self.lazy:
                         rc = 1
                     else:
-                        print(f"{'':<8}Ignoring while beeing lazy")
+                        self._print(f"{'':<8}Ignoring while beeing lazy")
                 else:
-                    print(f"{'':<8}{RC_INFO} No time bounds required ")
+                    self._info("No time bounds required ", indent=8)
 
         # loop records
         if tSteps is not None:
-            print("")
+            self._print("")
             prevTimeEnd    = None
             timeBoundRight = None
             itRecord       = tSteps[0]
@@ -1667,13 +2840,14 @@ class CMSAFChecker:
                         itRecStatus = rsItem["dict"][recordStatusValC]
                     else:
                         rc = 1
-                        print(f"{'':<8}{RC_ERR} invalid record_status value [{recordStatusValC}]")
+                        self._error(f"invalid record_status value [{recordStatusValC}]", indent=8)
                         itRecStatus = None
 
                 # define timeBoundRight and adjust if climatology is defined
                 if timeBounds is not None:
                     timeBoundRight = timeBounds[it.index,1]
                     if timeBoundsKey == 'climatology' and timeDuration is not None:
+                        from dateutil.relativedelta import relativedelta
                         lb = timeBounds[it.index,0]
                         lb = datetime.datetime(year=lb.year, month=lb.month, day=lb.day,
                                 hour=lb.hour, minute=lb.minute, second=lb.second)
@@ -1720,7 +2894,7 @@ class CMSAFChecker:
                     if itRecStatus is not None:
                         itRc = itRc + ' [status='+itRecStatus+']'
                         itRecStatus = None
-                    print(f"{'':<8}{it.index+1: >3} {tSteps[it.index]} [{timeBounds[it.index,0].isoformat()}, {timeBounds[it.index,1].isoformat()}] -> {itRc}")
+                    self._print(f"{'':<8}{it.index+1: >3} {tSteps[it.index]} [{timeBounds[it.index,0].isoformat()}, {timeBounds[it.index,1].isoformat()}] -> {itRc}")
 
                     # test coverage
                     if prevTimeEnd is not None:
@@ -1729,11 +2903,11 @@ class CMSAFChecker:
                         if timeDiff > 0.:
                             itRc = 'FAILED'
                             rc = 1
-                            print(f"{'':<8}{RC_ERR} gap in time coverage {timeDiff} seconds")
+                            self._error(f"gap in time coverage {timeDiff} seconds", indent=8)
                         elif timeDiff < 0.:
                             itRc = 'FAILED'
                             rc = 1
-                            print(f"{'':<8}{RC_ERR} overlap in time coverage {timeDiff} seconds")
+                            self._error(f"overlap in time coverage {timeDiff} seconds", indent=8)
 
                 # test time records against file name time resolution
                 elif expResolution is not None:
@@ -1746,9 +2920,9 @@ class CMSAFChecker:
                         itRc = itRc + ' [status='+itRecStatus+']'
                         itRecStatus = None
                     if timeDiff.total_seconds() == 0.:
-                        print(f"{'':<8}{it.index+1: >3} {tSteps[it.index]} -> {itRc}")
+                        self._print(f"{'':<8}{it.index+1: >3} {tSteps[it.index]} -> {itRc}")
                     else:
-                        print(f"{'':<8}{it.index+1: >3} {tSteps[it.index]} expected {itRecord} -> {itRc}")
+                        self._print(f"{'':<8}{it.index+1: >3} {tSteps[it.index]} expected {itRecord} -> {itRc}")
 
                 else:
                     itRc = 'OK'
@@ -1756,7 +2930,7 @@ class CMSAFChecker:
                         itRc = 'FAILED'
                     if itRecStatus is not None:
                         itRc = itRc + ' [status='+itRecStatus+']'
-                    print(f"{'':<8}{it.index+1: >3} {tSteps[it.index]} -> {itRc}")
+                    self._print(f"{'':<8}{it.index+1: >3} {tSteps[it.index]} -> {itRc}")
 
                 if timeBounds is not None and timeBoundRight is not None:
                     prevTimeEnd = timeBoundRight
@@ -1766,111 +2940,245 @@ class CMSAFChecker:
             # test time coverage range start
             if hasattr(ds,"time_coverage_start"):
                 try:
-                    t = num2date(0, "days since {}".format(ds.time_coverage_start))
+                    t = netCDF4.num2date(0, "days since {}".format(ds.time_coverage_start))
                     if isinstance(t, datetime.datetime):
-                        t = t.replace(tzinfo=pytz.utc, microsecond=0)
+                        t = t.replace(tzinfo=datetime.timezone.utc, microsecond=0)
                     timeCoverStart = t
                 except ValueError:
-                    print(f"{'':<8}{RC_ERR} Unexpected time format: '{ds.time_coverage_start}'")
+                    self._error(f"Unexpected time format: '{ds.time_coverage_start}'", indent=8)
                 else:
                     if timeCoverStart > tSteps[0]:
-                        print(f"{'':<8}{RC_ERR} first time record '{tSteps[0].isoformat()}' not within time_coverage_start attribute: '{timeCoverStart.isoformat()}'")
+                        self._error(f"first time record '{tSteps[0].isoformat()}' not within time_coverage_start attribute: '{timeCoverStart.isoformat()}'", indent=8)
                         rc = 1
                     if (timeBounds is not None) and (timeCoverStart != timeBounds[0,0]):
-                        print(f"{'':<8}{RC_ERR} time bound [0,0] is not matching time_coverage_start attribute: '{timeCoverStart.isoformat()}'")
+                        self._error(f"time bound [0,0] is not matching time_coverage_start attribute: '{timeCoverStart.isoformat()}'", indent=8)
                         rc = 1
 
             # test time coverage range
             if hasattr(ds,"time_coverage_end"):
                 try:
-                    t = num2date(0, "days since {}".format(ds.time_coverage_end))
+                    t = netCDF4.num2date(0, "days since {}".format(ds.time_coverage_end))
                     if isinstance(t, datetime.datetime):
-                        t = t.replace(tzinfo=pytz.utc, microsecond=0)
+                        t = t.replace(tzinfo=datetime.timezone.utc, microsecond=0)
                     timeCoverEnd = t
                 except ValueError:
-                    print(f"{'':<8}{RC_ERR} Unexpected time format: {ds.time_coverage_end}")
+                    self._error(f"Unexpected time format: {ds.time_coverage_end}", indent=8)
                 else:
                     if timeCoverEnd < tSteps[-1]:
-                        print(f"{'':<8}{RC_ERR} last time record '{tSteps[-1].isoformat()}' not within time_coverage_end attribute: '{timeCoverEnd.isoformat()}'")
+                        self._error(f"last time record '{tSteps[-1].isoformat()}' not within time_coverage_end attribute: '{timeCoverEnd.isoformat()}'", indent=8)
                         rc = 1
                     if (timeBounds is not None) and (timeBoundsKey != 'climatology') and timeCoverEnd != timeBounds[-1,1]:
-                        print(f"{'':<8}{RC_ERR} time bound [-1,1] is not matching time_coverage_end attribute: '{timeCoverEnd.isoformat()}'")
+                        self._error(f"time bound [-1,1] is not matching time_coverage_end attribute: '{timeCoverEnd.isoformat()}'", indent=8)
                         rc = 1
 
-            print(f"\n{'':<8}first time record: {tSteps[0].isoformat()}")
-            print(f"{'':<8}last  time record: {tSteps[-1].isoformat()}")
+            self._print(f"\n{'':<8}first time record: {tSteps[0].isoformat()}")
+            self._print(f"{'':<8}last  time record: {tSteps[-1].isoformat()}")
 
         if timeCoverStart and timeCoverEnd:
-            print(f"{'':<8}time coverage: [{timeCoverStart.isoformat()}, {timeCoverEnd.isoformat()}]")
+            self._print(f"{'':<8}time coverage: [{timeCoverStart.isoformat()}, {timeCoverEnd.isoformat()}]")
+
+        return rc
+
+
+    def _checkScanlineTimes(self, timeC, expResolution=None):
+        """
+        Check all records of a swath time axis on the raw time offsets, in
+        chunk-aligned blocks: increasing, without duplicates and without gaps
+        beyond twice the expected step. Offending records are reported as
+        index ranges.
+
+        The expected step is time_coverage_resolution if it has a fixed
+        length, otherwise the median step of the first SCANLINE_PROBE records.
+        """
+        rc = 0
+        ds = self.Dataset
+        unit = time_unit_seconds(timeC.units)
+
+        # expected step in units of the time axis
+        step = duration_seconds(expResolution)
+        if step and unit is not None:
+            step = step / unit
+        else:
+            probe = np.ma.filled(np.ma.asarray(ds.readVar(timeC, slice(0, SCANLINE_PROBE + 1)), dtype=np.float64), np.nan)
+            probe = np.diff(probe)
+            probe = probe[probe > 0]
+            step  = float(np.median(probe)) if len(probe) > 0 else None
+
+        missing    = _IndexRanges()
+        decreasing = _IndexRanges()
+        duplicates = _IndexRanges()
+        gaps       = _IndexRanges()
+        maxStep    = None
+        prev       = None
+        for rows in self._blocks(timeC, timeC.dtype.itemsize):
+            start  = rows.start or 0
+            values = np.ma.filled(np.ma.asarray(ds.readVar(timeC, rows), dtype=np.float64), np.nan)
+            missing.add(np.flatnonzero(np.isnan(values)) + start)
+
+            # step i leads to record offset + i
+            if prev is None:
+                steps, offset = np.diff(values), start + 1
+            else:
+                steps, offset = np.diff(np.concatenate([[prev], values])), start
+            prev = values[-1]
+            decreasing.add(np.flatnonzero(steps < 0) + offset)
+            duplicates.add(np.flatnonzero(steps == 0) + offset)
+            if step:
+                gaps.add(np.flatnonzero(steps > 2 * step) + offset)
+            if np.any(steps > 0):
+                blockMax = np.nanmax(steps)
+                maxStep = blockMax if maxStep is None else max(maxStep, blockMax)
+
+        for ranges, text in ((missing, "missing time at"), (decreasing, "time decreasing at"),
+                             (duplicates, "duplicate time at"), (gaps, "time gap above twice the expected step at")):
+            if ranges.count > 0:
+                self._error(f"{text} {ranges.count} records: {ranges}", indent=8)
+                rc = 1
+
+        if maxStep is not None:
+            scale, name = (unit, "s") if unit is not None else (1, timeC.units.split()[0])
+            self._print(f"{'':<8}{timeC.size} records, largest step {maxStep * scale:g} {name}")
 
         return rc
 
 
+    @traced
     def _checkCoordinatesGeo(self, coordVar, axisTime, shortName, longName, expAxis=None):
         """
-        Check geo coordinates of a netcdf file.
+        Check 1-D or 2-D geo coordinates of a netcdf file, or replay the
+        verdict for 1-D coordinate and bounds arrays checked before.
+        """
+        if coordVar.ndim == 2:
+            return self._checkCoordinatesGeo2D(coordVar, shortName, longName)
+
+        resFile = cmsaf_decode_grid(self.FileName, warn=self._warning)
+        args = (coordVar, axisTime, shortName, longName, expAxis, resFile)
+        arrays = self._coordinateArrays(coordVar)
+        # hashing arrays beyond the memory budget would read them once more
+        if self.coordinateMemo.maxsize <= 0 or \
+                any(len(self._blocks(var, 2 * var.dtype.itemsize)) > 1 for var in arrays):
+            return self._checkCoordinatesGeoValues(*args)
+
+        key = self._coordinateDigest(arrays, *args)
+        recording = self.coordinateMemo.lookup(key)
+        if recording is None:
+            recording = self._record(self._checkCoordinatesGeoValues, *args)
+            self.coordinateMemo.store(key, recording)
+            self.coordinateCacheChanged = True
+            return recording.value
+        return self._replay(recording)
+
+
+    @staticmethod
+    def _coordinateArrays(coordVar):
+        """
+        Return *coordVar* and its bounds variable, if there is one.
+        """
+        arrays = [coordVar]
+        bounds = getattr(coordVar, "bounds", None)
+        if isinstance(bounds, str) and bounds in coordVar.group().variables:
+            arrays.append(coordVar.group().variables[bounds])
+        return arrays
+
+
+    def _coordinateDigest(self, arrays, coordVar, axisTime, shortName, longName, expAxis, resFile):
+        """
+        Return a digest of all input of _checkCoordinatesGeoValues(): the
+        coordinate and bounds *arrays* with their attributes, the geospatial
+        global attributes, the grid from the file name and the options.
+        """
+        import hashlib
+        ds = self.Dataset
+        digest = hashlib.sha256()
+
+        def update(*items):
+            digest.update(repr(items).encode())
+
+        update(__version__, shortName, longName, expAxis, resFile, self.lazy, axisTime is not None and axisTime.name in coordVar.dimensions)
+        for suffix in ("min", "max", "resolution"):
+            name = f"geospatial_{shortName}_{suffix}"
+            update(name, _attr_token(getattr(ds, name)) if hasattr(ds, name) else None)
+
+        for var in arrays:
+            update(var.group().path, var.name, str(var.dtype), var.dimensions, var.shape)
+            for name in var.ncattrs():
+                update(name, _attr_token(var.getncattr(name)))
+            values = ds.readVar(var)
+            update(values.dtype.str, values.shape)
+            digest.update(np.ma.getdata(values).tobytes())
+            digest.update(np.ma.getmaskarray(values).tobytes())
+        return digest.hexdigest()
+
+
+    def _checkCoordinatesGeoValues(self, coordVar, axisTime, shortName, longName, expAxis, resFile):
+        """
+        Check the axis attribute, values, grid and bounds of geo coordinate
+        *coordVar*; *axisTime* is the matching time coordinate or None.
         """
 
         rc = 0
         ds = self.Dataset
-        resFile = cmsaf_decode_grid(self.File)
 
         # test axis attribute
         if not hasattr(coordVar, "axis"):
             # exclude from checks if not fixed
-            if axisTime.name in coordVar.dimensions:
-                print(f"{'':<4}{RC_INFO} coordinate is not fixed in time")
+            if axisTime is not None and axisTime.name in coordVar.dimensions:
+                self._info("coordinate is not fixed in time", indent=4)
                 rc = 10
             else:
-                print(f"{'':<8}{RC_ERR} missing mandatory attribute 'axis'")
+                self._error("missing mandatory attribute 'axis'", indent=8)
                 rc = -1
         elif expAxis is not None:
             if coordVar.axis != expAxis:
-                print(f"{'':<8}{RC_ERR} invalid value attribute 'axis={coordVar.axis}'")
+                self._error(f"invalid value attribute 'axis={coordVar.axis}'", indent=8)
                 rc = -1
 
         # test axis values
         if rc <= 0:
-            coord = coordVar[:]
+            # coordinate and bounds are evaluated in blocks of rows in ascending
+            # order; the grid test needs about 80 bytes per coordinate value
+            blocks = self._blocks(coordVar, 80)
             coordOrder = 1
-            if len(coord.shape) == 1:
-                if coord[0] > coord[-1]:
-                    coordOrder = -1
-                    coord[:] = coord[::-1]
-            precision = np.finfo(coord.dtype).precision
-            np.set_printoptions(precision=precision, suppress=False, threshold=10,linewidth=80)
-
-            coordMin = np.min(coord)
-            coordMax = np.max(coord)
+            if len(blocks) == 1:
+                coord = ds.readVar(coordVar)
+                if len(coord.shape) == 1:
+                    if coord[0] > coord[-1]:
+                        coordOrder = -1
+                        coord = coord[::-1]
+            elif coordVar.ndim == 1 and ds.readVar(coordVar, 0) > ds.readVar(coordVar, -1):
+                coordOrder = -1
+
+            def readRows(var, rows):
+                """Read the block *rows* of *var* in ascending coordinate order."""
+                if var is coordVar and len(blocks) == 1:
+                    return coord
+                if coordOrder == 1:
+                    return ds.readVar(var, rows)
+                start, stop, step = rows.indices(var.shape[0])
+                return np.flip(ds.readVar(var, slice(var.shape[0]-stop, var.shape[0]-start)))
+
+            coordMin = None
+            coordMax = None
+            coordMasked = 0
+            for rows in blocks:
+                block = readRows(coordVar, rows)
+                if coordMin is None:
+                    coordFirst = block.ravel()[:1]
+                    precision  = np.finfo(block.dtype).precision
+                    finfo      = np.finfo(block.dtype)
+                    coordMin   = np.min(block)
+                    coordMax   = np.max(block)
+                else:
+                    coordMin   = min(coordMin, np.min(block))
+                    coordMax   = max(coordMax, np.max(block))
+                coordMasked += np.ma.count_masked(block)
 
             # test global geospatial bounds
             geoMinAttrName = f"geospatial_{shortName}_min"
-            geoMinAttr = None
-            if hasattr(ds,geoMinAttrName):
-                try:
-                    tmp_ = getattr(ds,geoMinAttrName)
-                    if tmp_ > coordMin:
-                        print(f"{'':<8}{RC_ERR} {geoMinAttrName} mismatch: {tmp_} > {coordMin}")
-                        rc = 1
-                except TypeError:
-                    print(f"{'':<8}{RC_ERR} {geoMinAttrName}: unexpected data format")
-                    rc = 1
-                else:
-                    geoMinAttr = tmp_
-
             geoMaxAttrName = f"geospatial_{shortName}_max"
-            geoMaxAttr = None
-            if hasattr(ds,geoMaxAttrName):
-                try:
-                    tmp_ = getattr(ds,geoMaxAttrName)
-                    if tmp_ < coordMax:
-                        print(f"{'':<8}{RC_ERR} {geoMaxAttrName} mismatch: {tmp_} < {coordMax}")
-                        rc = 1
-                except TypeError:
-                    print(f"{'':<8}{RC_ERR} {geoMaxAttrName}: unexpected data format")
-                    rc = 1
-                else:
-                    geoMaxAttr = tmp_
+            geoRc, geoMinAttr, geoMaxAttr = self._checkGeospatialRange(shortName, coordMin, coordMax)
+            if geoRc:
+                rc = 1
 
             # get grid definition
             resAttr = None
@@ -1883,7 +3191,7 @@ class CMSAFChecker:
                         resAttr = np.float64(resAttr.group(1))
                 else:
                     rc = 1
-                    print(f"{'':<8}{RC_ERR} {geoResAttrName} :: must be a text type")
+                    self._error(f"{geoResAttrName} :: must be a text type", indent=8)
 
             # select grid
             if (resAttr is None) and (resFile is None):
@@ -1896,45 +3204,56 @@ class CMSAFChecker:
                 coordRes = resAttr
                 if resFile != resAttr:
                     rc = 1
-                    print(f"{'':<8}{RC_ERR} grid definition from file name '{resFile}' <--> and attributes '{resAttr}'")
+                    self._error(f"grid definition from file name '{resFile}' <--> and attributes '{resAttr}'", indent=8)
 
             # check grid
             if coordRes is not None:
-                if np.ma.count_masked(coord) > 0:
-                    print(f"{'':<8}{RC_ERR} {longName} contains missing data")
+                if coordMasked > 0:
+                    self._error(f"{longName} contains missing data", indent=8)
                     rc = 1
                 else:
-                    finfo    = np.finfo(coord.dtype)
-                    eps      = significant_digits(coord) * finfo.resolution
-                    indx     = np.arange(np.int64(0),len(coord),dtype=np.int64)
-                    meshExp  = np.multiply(indx, np.multiply(np.int64(10000),coordRes)).astype(np.int64)
-                    tmp      = np.rint(1./eps[0]).astype(np.float64)
-                    tmp      = np.divide(np.rint(np.divide(coord[0], eps[0])), tmp)
-                    tmp      = np.multiply(tmp, np.int64(10000)).astype(np.int64)
-                    meshExp  = np.multiply(np.add(tmp,meshExp),np.float64(0.0001))
-                    tmp      = np.absolute(np.subtract(meshExp, coord))
-                    eps      = float_spacing(meshExp, coord)
-                    indx     = np.where(tmp > eps)[0]
-                    if len(indx) > 0:
-                        print(f"{'':<8}{RC_ERR} at {len(indx)} locations:")
-                        print(f"{'':<10}found:    {coord[indx]}")
-                        print(f"{'':<10}expecting:{meshExp[indx]}")
+                    eps      = significant_digits(coordFirst) * finfo.resolution
+                    origin   = np.rint(1./eps[0]).astype(np.float64)
+                    origin   = np.divide(np.rint(np.divide(coordFirst[0], eps[0])), origin)
+                    origin   = np.multiply(origin, np.int64(10000)).astype(np.int64)
+                    found    = []
+                    expected = []
+                    centered = 0
+                    for rows in blocks:
+                        block    = readRows(coordVar, rows)
+                        start    = rows.start or 0
+                        indx     = np.arange(np.int64(start),start+len(block),dtype=np.int64)
+                        meshExp  = np.multiply(indx, np.multiply(np.int64(10000),coordRes)).astype(np.int64)
+                        meshExp  = np.multiply(np.add(origin,meshExp),np.float64(0.0001))
+                        tmp      = np.absolute(np.subtract(meshExp, block))
+                        eps      = float_spacing(meshExp, block)
+                        indx     = np.where(tmp > eps)[0]
+                        found.append(block[indx])
+                        expected.append(meshExp[indx])
+
+                        # test 0,0 [must not be in center]
+                        tmp  = np.absolute(block)
+                        centered += len(np.where(tmp < eps)[0])
+
+                    found    = np.ma.concatenate(found)
+                    expected = np.concatenate(expected)
+                    if len(found) > 0:
+                        self._error(f"at {len(found)} locations:", indent=8)
+                        with np.printoptions(precision=precision, suppress=False, threshold=10, linewidth=80):
+                            self._print(f"{'':<10}found:    {found}")
+                            self._print(f"{'':<10}expecting:{expected}")
                         if not self.lazy:
                             rc = 1
                         else:
-                            print(f"{'':<8}{RC_INFO} Ignoring while beeing lazy")
+                            self._info("Ignoring while beeing lazy", indent=8)
 
-                    # test 0,0 [must not be in center]
-                    tmp  = np.absolute(coord)
-                    indx = np.where(tmp < eps)[0]
-                    if len(indx) > 0:
+                    if centered > 0:
                         rc = 1
-                        print(f"{'':<8}{RC_ERR} {shortName}=0 is not allowed as {longName} center value.")
+                        self._error(f"{shortName}=0 is not allowed as {longName} center value.", indent=8)
 
             # test coordinate bounds
             boundsKey = 'bounds'
             boundsVar = None
-            bounds    = None
             if hasattr(coordVar,boundsKey):
                 tmp = getattr(coordVar,boundsKey)
                 if coordVar.group().name == "/":
@@ -1943,18 +3262,13 @@ class CMSAFChecker:
                 else:
                     if tmp in ds.getgrp(coordVar.group().path).variables:
                         boundsVar = ds.getgrp(coordVar.group().path).variables[tmp]
-                if boundsVar is not None:
-                    if coordOrder == 1:
-                        bounds = boundsVar[:]
-                    else:
-                        bounds = np.flip(boundsVar[:])
-                else:
-                    print(f"{'':<8}{RC_ERR} Missing configured bounds variable '{tmp}'.")
+                if boundsVar is None:
+                    self._error(f"Missing configured bounds variable '{tmp}'.", indent=8)
                     rc = 1
 
-            if bounds is None:
+            if boundsVar is None:
                 rc = 1
-                print(f"{'':<8}{RC_ERR} missing bounds for {longName} coordinate")
+                self._error(f"missing bounds for {longName} coordinate", indent=8)
             else:
                 if shortName == 'lat':
                     leftName = "lower"
@@ -1965,77 +3279,223 @@ class CMSAFChecker:
                 leftMaxName = leftName+"most"
                 rightMaxName = rightName+"most"
 
-                print(f"{'':<8}[{bounds[0,0]!s} -> {bounds[-1,0]!s}] {leftName} bounds")
-                print(f"{'':<8}[{bounds[0,1]!s} -> {bounds[-1,1]!s}] {rightName} bounds")
-
                 # test coordinate within bounds
-                indx1 = np.where(bounds[:,0] > coord)[0]
-                indx2 = np.where(bounds[:,1] < coord)[0]
-                if len(indx1) > 0 or len(indx2) > 0:
+                outside = 0
+                for rows in blocks:
+                    bounds = readRows(boundsVar, rows)
+                    block  = readRows(coordVar, rows)
+                    if not rows.start:
+                        boundsFirst = bounds[0]
+                    boundsLast = bounds[-1]
+                    indx1 = np.where(bounds[:,0] > block)[0]
+                    indx2 = np.where(bounds[:,1] < block)[0]
+                    outside += len(indx1) + len(indx2)
+
+                self._print(f"{'':<8}[{boundsFirst[0]!s} -> {boundsLast[0]!s}] {leftName} bounds")
+                self._print(f"{'':<8}[{boundsFirst[1]!s} -> {boundsLast[1]!s}] {rightName} bounds")
+
+                if outside > 0:
                     rc = 1
-                    print(f"{'':<8}{RC_ERR} {longName} values not within bounds")
+                    self._error(f"{longName} values not within bounds", indent=8)
+
+                # test for gaps and overlap in coordinate bounds, in file order
+                gaps     = 0
+                overlaps = 0
+                for rows in blocks:
+                    start, stop, step = rows.indices(boundsVar.shape[0])
+                    stop = min(stop, boundsVar.shape[0]-2)
+                    if start >= stop:
+                        continue
+                    tmp = ds.readVar(boundsVar, np.s_[start:stop+1])
+                    tmp = np.subtract(tmp[:-1,1], tmp[1:,0])
+                    gaps     += len(np.where(tmp > 0)[0])
+                    overlaps += len(np.where(tmp < 0)[0])
 
-                # test for gaps in coordinate bounds
-                tmp = np.subtract(boundsVar[0:-2,1],boundsVar[1:-1,0])
-                indx = np.where(tmp > 0)[0]
-                if len(indx) > 0:
+                if gaps > 0:
                     rc = 1
-                    print(f"{'':<8}{RC_ERR} gaps in {longName} bounds")
+                    self._error(f"gaps in {longName} bounds", indent=8)
 
                 # test for ovarlap in coordinate bounds
-                indx = np.where(tmp < 0)[0]
-                if len(indx) > 0:
+                if overlaps > 0:
                     rc = 1
-                    print(f"{'':<8}{RC_ERR} {longName} bounds overlap")
+                    self._error(f"{longName} bounds overlap", indent=8)
 
                 # test bounds against global attribute
                 if geoMinAttr is not None:
-                    if geoMinAttr != bounds[0,0]:
+                    if geoMinAttr != boundsFirst[0]:
                         rc = 1
-                        print(f"{'':<8}{RC_ERR} mismatch between {leftMaxName} {longName} bound '{boundsVar[0,0]}' and {geoMinAttrName} '{geoMinAttr}'")
+                        self._error(f"mismatch between {leftMaxName} {longName} bound '{ds.readVar(boundsVar, np.s_[0,0])}' and {geoMinAttrName} '{geoMinAttr}'", indent=8)
                 if geoMaxAttr is not None:
-                    if geoMaxAttr != bounds[-1,1]:
+                    if geoMaxAttr != boundsLast[1]:
                         rc = 1
-                        print(f"{'':<8}{RC_ERR} mismatch between {rightMaxName} {longName} bound '{boundsVar[-1,1]}' and {geoMaxAttrName} '{geoMaxAttr}'")
+                        self._error(f"mismatch between {rightMaxName} {longName} bound '{ds.readVar(boundsVar, np.s_[-1,1])}' and {geoMaxAttrName} '{geoMaxAttr}'", indent=8)
 
             # print result
             if coordRes is not None:
-                print(f"{'':<8}[{coordMin!s} -> {coordMax!s} by {coordRes!s}]")
+                self._print(f"{'':<8}[{coordMin!s} -> {coordMax!s} by {coordRes!s}]")
             else:
-                print(f"{'':<8}[{coordMin!s} -> {coordMax!s}]")
+                self._print(f"{'':<8}[{coordMin!s} -> {coordMax!s}]")
 
         rc = 0 if rc>=10 else rc
         return(rc)
 
 
-    def _checkCompression(self):
+    def _checkCoordinatesGeo2D(self, coordVar, shortName, longName):
         """
-        Check compression settings for all 3-dimensional variables.
+        Check a 2-D latitude or longitude field and its 4-vertex bounds in
+        bands of rows: value range and geospatial bounding box, monotonicity
+        along the grid axes, cells enclosing their centers and shared vertices
+        of neighbouring cells.
         """
 
         rc = 0
         ds = self.Dataset
+        period = 360. if shortName == "lon" else None
+        validRange = (-90., 90.) if shortName == "lat" else (-180., 360.)
+        dimY, dimX = coordVar.dimensions
+
+        # find 4-vertex bounds
+        boundsVar = None
+        if hasattr(coordVar, "bounds"):
+            tmp = coordVar.bounds
+            if isinstance(tmp, str):
+                boundsVar = coordVar.group().variables.get(tmp)
+            if boundsVar is None:
+                self._error(f"Missing configured bounds variable '{tmp}'.", indent=8)
+                rc = 1
+            elif boundsVar.shape != coordVar.shape + (4,):
+                self._error(f"bounds must have shape {coordVar.shape + (4,)}, but found: {boundsVar.shape}", indent=8)
+                boundsVar = None
+                rc = 1
+        else:
+            self._info(f"no cell bounds for {longName}, skipping cell checks", indent=8)
+
+        # a longitude bounding box with west > east crosses the date line
+        box = None
+        if shortName == "lon":
+            west = getattr(ds, "geospatial_lon_min", None)
+            east = getattr(ds, "geospatial_lon_max", None)
+            if isinstance(west, (int, float, np.number)) and isinstance(east, (int, float, np.number)) and west > east:
+                self._info(f"geospatial bounding box [{west} -> {east}] crosses the date line", indent=8)
+                box = (west, east)
+
+        # vertex order (counterclockwise or clockwise) from the first two rows
+        edges = None
+        if boundsVar is not None:
+            head = ds.readVar(boundsVar, slice(0, 2))
+            counts = {order: sum(_edge_mismatches(head, pairs, period).values())
+                      for order, pairs in _CELL_EDGES.items()}
+            edges = _CELL_EDGES[min(counts, key=counts.get)]
+
+        # rows are evaluated in chunk-aligned bands within the memory budget,
+        # about 200 bytes per value with bounds for every band in flight
+        threads = self.scanThreads
+        blocks = self._blocks(coordVar, (200 if boundsVar is not None else 48) * (threads + 1))
+
+        def bands():
+            prevRow = prevBounds = None
+            for rows in blocks:
+                block  = ds.readVar(coordVar, rows)
+                bounds = None if boundsVar is None else ds.readVar(boundsVar, rows)
+                yield block, bounds, prevRow, prevBounds
+                prevRow    = block[-1:]
+                prevBounds = None if bounds is None else bounds[-1:]
+
+        band = functools.partial(_geo2d_band, period=period, validRange=validRange, box=box, edges=edges,
+            pole=shortName == "lat")
+        total = None
+        for result in _pipeline(band, bands(), self._scanPool(), threads + 1):
+            total = _merge_geo2d(total, result)
+
+        if total["min"] is None:
+            self._error(f"{longName} contains no valid data", indent=8)
+            return 1
 
-        # find time coordinate
-        axisTime = ds.getCoordinates("time", shortName=["time"])
+        # test global geospatial bounds
+        if box is None:
+            rc = max(rc, self._checkGeospatialRange(shortName, total["min"], total["max"])[0])
+        elif total["outsideBox"] > 0:
+            self._error(f"{longName} values outside geospatial bounding box at {total['outsideBox']} locations", indent=8)
+            rc = 1
 
-        if (ds.data_model == "NETCDF4") or (ds.data_model == "NETCDF4_CLASSIC"):
-            vList = ds.getVariableList()
-            vFilter = []
+        if total["masked"] > 0:
+            self._info(f"{longName} contains {total['masked']} missing values", indent=8)
+        if total["invalid"] > 0:
+            self._error(f"{longName} values outside [{validRange[0]}, {validRange[1]}] at {total['invalid']} locations", indent=8)
+            rc = 1
 
-            # filter variables to test
-            if ds.isSwathData():
-                for vName in vList:
-                    aTime = None
-                    for dim in ds.getvar(vName).get_dims():
-                        aTime = ds.matchCoordinate(dim, axisTime)
-                        if aTime is not None: break
-                    if aTime is not None: vFilter.append(vName)
+        for dim, count, lines in ((dimX, total["rowTurns"], coordVar.shape[0]),
+                                  (dimY, np.count_nonzero(total["colTurns"] > 1), coordVar.shape[1])):
+            if count > 0:
+                self._error(f"{longName} not monotonic along '{dim}' in {count} of {lines} grid lines", indent=8)
+                rc = 1
+
+        if boundsVar is not None:
+            if total["outside"] > 0:
+                self._error(f"{longName} values not within cell bounds at {total['outside']} cells", indent=8)
+                rc = 1
+            for dim, key in ((dimX, "x"), (dimY, "y")):
+                if total["mismatches"][key] > 0:
+                    self._error(f"{longName} bounds not contiguous along '{dim}' at {total['mismatches'][key]} cell vertices", indent=8)
+                    rc = 1
+
+        # print result
+        self._print(f"{'':<8}[{total['min']!s} -> {total['max']!s}] on {coordVar.shape[0]} x {coordVar.shape[1]} cells")
+
+        return rc
+
+
+    def _checkGeospatialRange(self, shortName, coordMin, coordMax):
+        """
+        Test the coordinate range against geospatial_<shortName>_min/max.
+
+        Returns (rc, minimum attribute, maximum attribute), None for missing
+        or unusable attributes.
+        """
+        rc = 0
+        ds = self.Dataset
+        geoMinAttrName = f"geospatial_{shortName}_min"
+        geoMinAttr = None
+        if hasattr(ds,geoMinAttrName):
+            try:
+                tmp_ = getattr(ds,geoMinAttrName)
+                if tmp_ > coordMin:
+                    self._error(f"{geoMinAttrName} mismatch: {tmp_} > {coordMin}", indent=8)
+                    rc = 1
+            except TypeError:
+                self._error(f"{geoMinAttrName}: unexpected data format", indent=8)
+                rc = 1
+            else:
+                geoMinAttr = tmp_
+
+        geoMaxAttrName = f"geospatial_{shortName}_max"
+        geoMaxAttr = None
+        if hasattr(ds,geoMaxAttrName):
+            try:
+                tmp_ = getattr(ds,geoMaxAttrName)
+                if tmp_ < coordMax:
+                    self._error(f"{geoMaxAttrName} mismatch: {tmp_} < {coordMax}", indent=8)
+                    rc = 1
+            except TypeError:
+                self._error(f"{geoMaxAttrName}: unexpected data format", indent=8)
+                rc = 1
             else:
-                for vName in vList:
-                    if len(ds.getvar(vName).shape) >= 3: vFilter.append(vName)
+                geoMaxAttr = tmp_
+
+        return rc, geoMinAttr, geoMaxAttr
+
+
+    @traced
+    def _checkCompression(self):
+        """
+        Check compression settings for all 3-dimensional variables.
+        """
+
+        rc = 0
+        ds = self.Dataset
 
-            for vName in vFilter:
+        if (ds.data_model == "NETCDF4") or (ds.data_model == "NETCDF4_CLASSIC"):
+            for vName in ds.getDataVariables():
                 xRc = 1
                 filters = ds.getvar(vName).filters()
                 if filters is None:
@@ -2043,19 +3503,20 @@ class CMSAFChecker:
                 else:
                     if 'zlib' in filters:
                         if filters['zlib']:
-                            print(f"{vName:<15} level={filters['complevel']}")
+                            self._print(f"{vName:<15} level={filters['complevel']}")
                             if filters['complevel'] > 0: xRc = 0
                 if xRc == 1:
                     rc = 1
-                    print(f"{RC_ERR} Variable {vName} is not compressed.")
+                    self._error(f"Variable {vName} is not compressed.")
 
         else:
             rc = 1
-            print(f"{RC_ERR} file data dype is not netcdf4: '{ds.data_model}'")
+            self._error(f"file data dype is not netcdf4: '{ds.data_model}'")
 
         return rc
 
 
+    @traced
     def _checkVariables(self):
         """
         Check variables.
@@ -2075,12 +3536,12 @@ class CMSAFChecker:
                          item.dtype == np.dtype(np.int16) or
                          item.dtype == np.dtype(np.int32)    ) ):
                     rc = 1
-                    print(f"{RC_ERR} incorrect data type of '{key}'\n")
+                    self._error(f"incorrect data type of '{key}'\n")
 
         # no record status for swath data required
         elif not ds.isSwathData():
             rc = 1
-            print(f"{RC_ERR} missing mandatory variable 'record_status'\n")
+            self._error("missing mandatory variable 'record_status'\n")
 
         # recommended attributes
         listRec = ['units', 'standard_name', 'grid_mapping']
@@ -2108,7 +3569,7 @@ class CMSAFChecker:
             if vNameB in listSkip:
                 continue
 
-            print(vName)
+            self._print(vName)
             var = ds.getvar(vName)
             if var.group().name != "/":
                 grp = ds.groups[var.group().name]
@@ -2120,17 +3581,17 @@ class CMSAFChecker:
 
                 if var.grid_mapping_name == "latitude_longitude":
                     if len(axisLat) == 0:
-                        print(f"{RC_ERR} missing required latitude coordinate")
+                        self._error("missing required latitude coordinate")
                         rc = 1
                     if len(axisLon) == 0:
-                        print(f"{RC_ERR} missing required longitude coordinate")
+                        self._error("missing required longitude coordinate")
                         rc = 1
 
                 varGridMapping = grp.get_variables_by_attributes(grid_mapping_name=var.grid_mapping_name)
                 if len(varGridMapping) == 0:
                     varGridMapping = ds.get_variables_by_attributes(grid_mapping_name=var.grid_mapping_name)
                 if len(varGridMapping) > 1:
-                    print(f"{RC_ERR} grid_mapping_name='{var.grid_mapping_name}' ambiguous")
+                    self._error(f"grid_mapping_name='{var.grid_mapping_name}' ambiguous")
                     rc = 1
 
                 continue
@@ -2151,7 +3612,7 @@ class CMSAFChecker:
             if aLon is not None and aLat is not None:
                 if aTime is None:
                     rc = 1
-                    print(f"{'':<4}{RC_ERR} {vName} :: missing time dimension")
+                    self._error(f"{vName} :: missing time dimension", indent=4)
 
             # test attributes
             for item in [*listMan, *listRec]:
@@ -2178,10 +3639,10 @@ class CMSAFChecker:
                     xList = listManSkip[vNameB] if vNameB in listManSkip else []
                     if item in listMan and item not in xList:
                         rc = 1
-                        print(f"{'':<4}{RC_ERR} {vName} :: missing mandatory attribute '{item}'")
+                        self._error(f"{vName} :: missing mandatory attribute '{item}'", indent=4)
                     xList = listRecSkip[vNameB] if vNameB in listRecSkip else []
                     if item in listRec and item not in xList:
-                        print(f"{'':<4}{RC_WARN} {vName} :: missing recommended attribute '{item}'")
+                        self._warning(f"{vName} :: missing recommended attribute '{item}'", indent=4)
 
             # test flags
             if hasattr(var,'flag_values') and hasattr(var,'flag_meanings'):
@@ -2189,56 +3650,327 @@ class CMSAFChecker:
                 flagM = var.flag_meanings.split(" ")
                 if len(flagV) != len(flagM):
                     rc = 1
-                    print(f"{'':<4}{RC_ERR} {vName} :: mismatch between flag_values and flag_value")
+                    self._error(f"{vName} :: mismatch between flag_values and flag_value", indent=4)
 
             # test grid mapping
             if hasattr(var, 'grid_mapping'):
                 varGrid = ds.getVariableByName(var.grid_mapping)
                 if not ((os.path.join(grp.path,var.grid_mapping) in varGrid.keys()) or
                        (os.path.join("/",var.grid_mapping) in varGrid.keys())):
-                    print(f"{RC_ERR} missing defined 'grid_mapping' variable '{var.grid_mapping}'")
+                    self._error(f"missing defined 'grid_mapping' variable '{var.grid_mapping}'")
                     rc = 1
 
         # test variables defined in variable_id
         if hasattr(ds, 'variable_id'):
-            print(f"\nvariable_id :: '{ds.variable_id}'")
+            self._print(f"\nvariable_id :: '{ds.variable_id}'")
             for item in ds.variable_id.split(","):
                 try:
                     var = ds.getvar(item)
                 except (KeyError, IndexError):
                     rc = 1
-                    print(f"{'':<4}{RC_ERR} missing variable '{item}'")
+                    self._error(f"missing variable '{item}'", indent=4)
                 else:
-                    print(f"{'':<4}{RC_OK} '{item}'")
+                    self._print(f"{'':<4}{RC_OK} '{item}'")
 
         return rc
 
 
-def main():
+    @traced
+    def _checkData(self):
+        """
+        Check the values of the variables of variable_id, with dataAll of all
+        data variables: no values outside valid_min/valid_max/valid_range,
+        no NaN unless _FillValue or missing_value is NaN, not only fill or
+        missing values. All flag
+        variables of the file are included; their values must be declared by
+        flag_values or flag_masks. The min, max,
+        mean and fill fraction of every time record of the variable_id fields
+        are kept in the same pass for Result.statistics.
+
+        The stored values are streamed in chunk-aligned blocks within the
+        memory budget (FIELD_BUDGET without one). Blocks are evaluated in
+        scanThreads threads while the next block, possibly of the next
+        variable, is read.
+        """
+        rc = 0
+        ds = self.Dataset
+
+        vList = []
+        if hasattr(ds, 'variable_id'):
+            vList = [os.path.join("/", item.strip()) for item in ds.variable_id.split(",") if item.strip()]
+        mainVars = set(vList)
+        if self.dataAll:
+            vList += [vName for vName in ds.getDataVariables() if vName not in vList]
+        for vName in ds.getVariableList():
+            var = ds.getvar(vName)
+            if vName not in vList and (hasattr(var, "flag_values") or hasattr(var, "flag_masks")):
+                vList.append(vName)
+
+        variables = []
+        axisTime = None
+        for vName in vList:
+            try:
+                var = ds.getvar(vName)
+            except (KeyError, IndexError):
+                self._info(f"{vName} :: skipped, no such variable")
+                continue
+            if var.dtype.kind not in "iuf":
+                self._info(f"{vName} :: skipped, not numeric")
+                continue
+
+            # records of the fields of variable_id along the time dimension
+            timeDim = None
+            if vName in mainVars and var.ndim >= 2:
+                if axisTime is None:
+                    axisTime = ds.getCoordinates("time", shortName=["time"])
+                for n, dim in enumerate(var.get_dims()):
+                    if ds.matchCoordinate(dim, axisTime) is not None:
+                        timeDim = n
+                        break
+            variables.append((vName, var, timeDim))
+        if len(variables) == 0:
+            self._info("no data variables to check")
+            return rc
+
+        threads = self.scanThreads
+        budget = self.memoryBudget or FIELD_BUDGET
+
+        def limits(var):
+            # the fill value and missing_value both mark missing data
+            fill = getattr(var, "_FillValue", None)
+            if fill is None:
+                fill = netCDF4.default_fillvals.get(var.dtype.str[1:])
+            fills = [] if fill is None else [np.ravel(fill)[0].item()]
+            if hasattr(var, "missing_value"):
+                fills += np.ravel(var.missing_value).tolist()
+            if hasattr(var, "valid_range"):
+                validMin, validMax = np.ravel(var.valid_range)[:2]
+            else:
+                validMin, validMax = getattr(var, "valid_min", None), getattr(var, "valid_max", None)
+            return [fills] + [None if v is None else np.ravel(v)[0].item() for v in (validMin, validMax)]
+
+        def flags(var):
+            flagValues = np.atleast_1d(var.flag_values) if hasattr(var, "flag_values") else None
+            flagMasks  = np.atleast_1d(var.flag_masks) if hasattr(var, "flag_masks") else None
+            if flagValues is None and flagMasks is None:
+                return None
+            return flagValues, flagMasks
+
+        def position(key, shape, flat):
+            # index of element *flat* of the block *key* in the variable
+            local = [int(i) for i in np.unravel_index(flat, shape)]
+            outer = [k for k in key if isinstance(k, int)]
+            if len(outer) < len(key):
+                local[0] += key[len(outer)].start
+            return outer + local
+
+        def blocks():
+            for i, (vName, var, timeDim) in enumerate(variables):
+                chunking = var.chunking()
+                elements = budget // ((2 * var.dtype.itemsize + DATA_FOOTPRINT) * (threads + 1))
+                args = limits(var)
+                flagArgs = flags(var)
+                for key in _hyperslabs(var.shape, None if chunking == "contiguous" else chunking, elements):
+                    # the records of the block: a single one if the time dimension is indexed
+                    start, records, timeAxis = 0, timeDim is not None, None
+                    if records:
+                        indexed = sum(isinstance(k, int) for k in key)
+                        if timeDim < indexed:
+                            start = key[timeDim]
+                        else:
+                            timeAxis = timeDim - indexed
+                            start = key[timeDim].start if timeDim < len(key) else 0
+                    yield i, key, start, ds.readVar(var, key, raw=True), *args, records, timeAxis, flagArgs
+
+        def block(i, key, start, values, *args):
+            return i, key, start, values.shape, _data_block(values, *args)
+
+        totals = [None] * len(variables)
+        undeclared = [{} for _ in variables]    # code -> [count, first position]
+        statistics = [None] * len(variables)
+        for i, (vName, var, timeDim) in enumerate(variables):
+            if timeDim is not None:
+                n = var.shape[timeDim]
+                statistics[i] = {"fill": np.zeros(n, np.int64), "count": np.zeros(n, np.int64), "sum": np.zeros(n),
+                                 "min": np.full(n, np.inf), "max": np.full(n, -np.inf)}
+        for i, key, start, shape, result in _pipeline(block, blocks(), self._scanPool(), threads + 1):
+            totals[i] = _merge_data(totals[i], result)
+            if "undeclared" in result:
+                for code, count, flat in zip(*(a.tolist() for a in result["undeclared"])):
+                    if code in undeclared[i]:
+                        undeclared[i][code][0] += count
+                    else:
+                        undeclared[i][code] = [count, position(key, shape, flat)]
+            if "records" in result:
+                _merge_records(statistics[i], start, result["records"])
+
+        for (vName, var, timeDim), total, codes, stats in zip(variables, totals, undeclared, statistics):
+            fills, validMin, validMax = limits(var)
+            shape = " x ".join(str(n) for n in var.shape) or "1"
+            if total is None or total["size"] == 0:
+                self._print(f"{vName:<15} {shape} values: empty")
+                continue
+            packed = " (packed)" if hasattr(var, "scale_factor") or hasattr(var, "add_offset") else ""
+            if total["min"] is None:
+                self._print(f"{vName:<15} {shape} values: {total['fill'] + total['nan']} missing")
+            else:
+                self._print(f"{vName:<15} {shape} values: {total['fill']} fill, [{total['min']:g} -> {total['max']:g}]{packed}")
+
+            if total["outside"] > 0:
+                rc = 1
+                self._error(f"{vName} :: {total['outside']} values outside valid range [{validMin}, {validMax}]", indent=4)
+            if total["nan"] > 0 and not any(isinstance(fill, float) and math.isnan(fill) for fill in fills):
+                if hasattr(var, "_FillValue"):
+                    rc = 1
+                    self._error(f"{vName} :: {total['nan']} NaN values, _FillValue is {fills[0]}", indent=4)
+                else:
+                    self._warning(f"{vName} :: {total['nan']} NaN values without _FillValue", indent=4)
+            if total["min"] is None:
+                self._warning(f"{vName} :: no valid values", indent=4)
+            if codes:
+                rc = 1
+                what = "values with undeclared flag bits" if hasattr(var, "flag_masks") else "undeclared flag values"
+                text = ", ".join(f"{code} ({count} values, first at {first})" for code, (count, first) in sorted(codes.items())[:10])
+                if len(codes) > 10:
+                    text += f", ... ({len(codes) - 10} more)"
+                self._error(f"{vName} :: {what}: {text}", indent=4)
+            if stats is not None:
+                self._recordStatistics(vName, var, timeDim, stats, total["min"] is None)
+
+        return rc
+
+
+    def _recordStatistics(self, vName, var, timeDim, stats, empty=False):
+        """
+        Keep the per-record statistics *stats* of _checkData() of variable
+        *vName*, unpacked, in self.statistics and report records without
+        valid values unless the variable is *empty*.
+        """
+        count = stats["count"]
+        fill  = stats["fill"]
+        size  = var.size // max(1, var.shape[timeDim])
+        valid = count > 0
+        scale, offset = getattr(var, "scale_factor", 1), getattr(var, "add_offset", 0)
+        low, high = stats["min"] * scale + offset, stats["max"] * scale + offset
+        if scale < 0:
+            low, high = high, low
+        mean = np.divide(stats["sum"], count, out=np.zeros(len(count)), where=valid) * scale + offset
+
+        def values(array):
+            return [float(v) if ok else None for v, ok in zip(array.tolist(), valid.tolist())]
+
+        if self.statistics is None:
+            self.statistics = {}
+        self.statistics[vName] = {
+            "dimension":     var.dimensions[timeDim],
+            "min":           values(low),
+            "max":           values(high),
+            "mean":          values(mean),
+            "fill_fraction": (fill / size if size > 0 else np.ones(len(count))).tolist(),
+        }
+
+        text = f"{'':<4}{len(count)} records along '{var.dimensions[timeDim]}'"
+        if valid.any():
+            text += f", mean [{mean[valid].min():g} -> {mean[valid].max():g}]"
+        self._print(text)
+        if not empty and not valid.all():
+            ranges = _IndexRanges()
+            ranges.add(np.flatnonzero(~valid))
+            self._warning(f"{vName} :: no valid values in {ranges.count} records: {ranges}", indent=4)
+
+
+def share_path():
+    """Return the share folder installed next to the scripts."""
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "share")
+
+
+def default_search_paths(path=None):
     """
-    Main program
+    Return the standards search paths in order: (c) *path*, (b) $CMSAF_CHECKER_PREFIX, (a) script share
+    """
+    return [p for p in [path, os.getenv('CMSAF_CHECKER_PREFIX'), share_path()] if p is not None]
+
+
+def _checker_options(options):
+    """Apply library defaults to CMSAFChecker keyword arguments."""
+    options = dict(options)
+    if options.get("search_paths") is None:
+        options["search_paths"] = default_search_paths()
+    options.setdefault("log", None)
+    return options
+
+
+def check(path, **options):
+    """
+    Check a single file and return its Result.
+
+    Keyword arguments are passed to CMSAFChecker; unless given, the default
+    search paths are used and no output is written. Raises CheckerError if
+    the standard cannot be loaded or the file name is invalid.
     """
+    checker = CMSAFChecker(**_checker_options(options))
+    try:
+        return checker.check(path)
+    finally:
+        checker.close()
 
+
+def check_file(checker, path):
+    """
+    Check *path* with *checker* and return its Result.
+
+    A file the checks raise an exception for (invalid file name, a failing
+    check) gives a failed Result with the exception as error finding, so
+    that batches go on with the next file.
+    """
+    try:
+        return checker.check(path)
+    except Exception as detail:
+        return checker.failure(path, detail)
+
+
+def check_many(paths, **options):
+    """
+    Check files one after another with a single checker and yield a Result per file.
+
+    The standard and vocabularies are loaded once and shared by all files.
+    Keyword arguments are handled as for check(); a file that cannot be
+    checked gives a failed Result, see check_file().
+    """
+    checker = CMSAFChecker(**_checker_options(options))
+    try:
+        for path in paths:
+            yield check_file(checker, path)
+    finally:
+        checker.close()
+
+
+def memory_size(text):
+    """Decode a size in bytes with an optional k, M or G suffix (powers of 1024)."""
     import argparse
-    import fnmatch
-    from os  import getenv
-    from sys import argv,exit
+    match = re.fullmatch(r"\s*([0-9.]+)\s*([kKMG]?)i?B?\s*", text)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"invalid size '{text}'")
+    size = float(match.group(1)) * 1024 ** " KMG".index(match.group(2).upper() or " ")
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"invalid size '{text}'")
+    return int(size)
 
-    # get standards search paths in order: (c) -s option, (b) prefix, (a) script share
-    prefix = getenv('CMSAF_CHECKER_PREFIX')
-    path_a = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "share")
-    path_b = prefix if prefix is not None else None
-    default_search_paths = [p for p in [path_b, path_a] if p is not None]
 
-    print(f"CMSAF Checker Version {__version__}")
+def cache_size(text):
+    """Decode a cache size like memory_size(), 0 disables the cache."""
+    return 0 if text.strip() == "0" else memory_size(text)
 
-    # argument parser
-    parser = argparse.ArgumentParser(prog='cmsaf-checker')
+
+def add_checker_arguments(parser):
+    """
+    Add the options configuring a CMSAFChecker to an argument parser.
+    """
     parser.add_argument('-s', '--cmsaf_metadata_standard',
         default=None, metavar='PATH',
         help='additional search path for CM SAF standard and GCMD keyword files. '
              'Files are resolved in order: this path, $CMSAF_CHECKER_PREFIX, '
-             f'{path_a}')
+             f'{share_path()}')
     parser.add_argument('-v', '--version',
         help='CM SAF standards version to apply')
     parser.add_argument('-f', '--standard_file',
@@ -2249,101 +3981,347 @@ def main():
         help='Ignore list of attributes')
     parser.add_argument('-c', '--coordinates', action='store_true',
         help='Test coordinates time, latitude, longitude')
-    parser.add_argument('-m', '--missing', nargs='?', const='filename',
-        help='Test for missing files')
     parser.add_argument('-l', '--lazy', action='store_true',
         help='Turn some errors to warnings')
+    parser.add_argument('--profile', action='store_true',
+        help='Record wall and CPU time, bytes and variable reads per check stage')
+    parser.add_argument('--trace', metavar='FILE',
+        help='Append a Chrome trace-event timeline of the checks to FILE')
+    parser.add_argument('--memory', action='store_true',
+        help='Also record the peak Python heap per check stage, implies --profile (slows the checks down)')
+    parser.add_argument('--memory-budget', type=memory_size, metavar='SIZE',
+        help='Evaluate coordinate arrays in blocks when a check would need more than SIZE bytes (k, M, G suffixes)')
+    parser.add_argument('--array-cache', type=cache_size, default=256*1024**2, metavar='SIZE',
+        help='Read variables of a file once and keep up to SIZE bytes of them for later checks, at most the memory budget (default: 256M, 0 disables)')
+    parser.add_argument('--scan-threads', type=int, default=0, metavar='N',
+        help='Evaluate bands of 2-D latitude/longitude fields in N threads while reading the next (default: 0)')
+    parser.add_argument('--attribute-cache', type=int, default=4096, metavar='N',
+        help='Reuse the verdicts of up to N global attribute values seen in earlier files (default: 4096, 0 disables)')
+    parser.add_argument('--structure-cache', type=int, default=256, metavar='N',
+        help='Reuse the variable and compression verdicts of up to N file structures seen in earlier files (default: 256, 0 disables)')
+    parser.add_argument('--coordinate-cache', type=int, default=64, metavar='N',
+        help='Reuse the verdicts of up to N latitude/longitude arrays seen in earlier files (default: 64, 0 disables)')
+    parser.add_argument('--coordinate-cache-file', metavar='FILE',
+        help='Keep the latitude/longitude verdicts in FILE for later runs')
+    parser.add_argument('--data', action='store_true',
+        help='Test the values of the variable_id variables against their valid range and _FillValue, and of all flag variables against their declared flags')
+    parser.add_argument('--data-all', action='store_true',
+        help='Like --data for all data variables (3-D, or with a time dimension in swath files)')
+
+
+def checker_options(args, search_paths):
+    """
+    Return CMSAFChecker keyword arguments for parsed command line *args*.
+    """
+    if args.reference == None:
+        return dict(search_paths=search_paths, version=args.version,
+            coordinates=args.coordinates, lazy=args.lazy, ignore=args.ignore_attr,
+            standard_file=args.standard_file, profile=args.profile, trace=args.trace,
+            memory=args.memory, memory_budget=args.memory_budget, attribute_cache=args.attribute_cache,
+            structure_cache=args.structure_cache, coordinate_cache=args.coordinate_cache,
+            coordinate_cache_file=args.coordinate_cache_file, array_cache=args.array_cache,
+            scan_threads=args.scan_threads, data=args.data, data_all=args.data_all)
+    else:
+        return dict(referenceFile=args.reference, ignore=args.ignore_attr,
+            coordinates=args.coordinates, lazy=args.lazy,
+            standard_file=args.standard_file, profile=args.profile, trace=args.trace,
+            memory=args.memory, memory_budget=args.memory_budget, attribute_cache=args.attribute_cache,
+            structure_cache=args.structure_cache, coordinate_cache=args.coordinate_cache,
+            coordinate_cache_file=args.coordinate_cache_file, array_cache=args.array_cache,
+            scan_threads=args.scan_threads, data=args.data, data_all=args.data_all)
+
+
+def pattern_matcher(patterns):
+    """Return a function testing a file name against any of the shell *patterns*."""
+    import fnmatch
+    return re.compile("|".join(fnmatch.translate(os.path.normcase(p)) for p in patterns)).match
+
+
+def read_file_list(name):
+    """Yield the paths listed in file *name*, one per line; '-' reads standard input."""
+    fh = sys.stdin if name == "-" else open(name)
+    try:
+        for line in fh:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+
+def scan_directory(directory, patterns, recursive=False, log=print):
+    """
+    Yield the files in *directory* whose names match any of *patterns*.
+
+    Directories are read with os.scandir and the matching names of each
+    directory are yielded in sorted order before descending into its
+    subdirectories (only with *recursive*, symbolic links are followed once).
+    Directories that cannot be read are skipped and reported to *log*
+    (None: silently).
+    """
+    match = pattern_matcher(patterns)
+    seen  = set()
+    stack = [directory]
+    while stack:
+        path = stack.pop()
+        names = []
+        dirs  = []
+        try:
+            if recursive:
+                st = os.stat(path)
+                if (st.st_dev, st.st_ino) in seen:
+                    continue
+                seen.add((st.st_dev, st.st_ino))
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        isDir = entry.is_dir()
+                    except OSError:
+                        isDir = False
+                    if isDir:
+                        if recursive:
+                            dirs.append(entry.path)
+                    elif match(os.path.normcase(entry.name)):
+                        names.append(entry.name)
+        except OSError as detail:
+            if log is not None:
+                log(f"Skipping directory '{path}': {detail.strerror}")
+            continue
+        names.sort()
+        for name in names:
+            yield os.path.join(path, name)
+        stack.extend(sorted(dirs, reverse=True))
+
+
+def shard_type(text):
+    """argparse type of --shard, see shard.parse_shard()."""
+    from .shard import parse_shard
+    return parse_shard(text)
+
+
+def iter_inputs(args):
+    """
+    Yield the files given on the command line.
+
+    '@FILE' and '-' read file lists; with -d/--directory the remaining
+    arguments are file name patterns, otherwise file paths.
+    """
+    patterns = []
+    for arg in args.files:
+        if arg == "-" or arg.startswith("@"):
+            yield from read_file_list(arg if arg == "-" else arg[1:])
+        elif args.directory is None:
+            yield arg
+        else:
+            patterns.append(arg)
+    if args.directory is not None and patterns:
+        yield from scan_directory(args.directory, patterns, recursive=args.recursive)
+
+
+def main():
+    """
+    Main program
+    """
+
+    import argparse
+    import itertools
+    import json
+    import time
+    from sys import argv,exit
+
+    # sub commands
+    if len(argv) > 1 and argv[1] == "serve":
+        from .server import main as serve
+        return serve(argv[2:])
+    if len(argv) > 1 and argv[1] == "merge":
+        from .shard import main as merge
+        return merge(argv[2:])
+
+    print(f"CMSAF Checker Version {__version__}")
+
+    # argument parser
+    parser = argparse.ArgumentParser(prog='cmsaf-checker',
+        epilog="Run 'cmsaf-checker serve -h' for the checker daemon and "
+               "'cmsaf-checker merge -h' to combine the results of --shard runs.")
+    add_checker_arguments(parser)
+    parser.add_argument('-m', '--missing', nargs='?', const='filename',
+        help='Test for missing and duplicate files. The time step is taken from the file names '
+             'or given as h, d, p, w, m, s, a, i or M<n>/H<n> (every n minutes/hours)')
     parser.add_argument('-d', '--directory',
         help='Search for files with pattern in this directory.')
-    parser.add_argument('files', nargs='+')
+    parser.add_argument('-R', '--recursive', action='store_true',
+        help='With -d, also search the subdirectories.')
+    parser.add_argument('--names-only', action='store_true',
+        help='Only check the file names against the CM SAF naming convention, without opening the files.')
+    parser.add_argument('-j', '--json', metavar='FILE',
+        help='Write structured results as JSON lines to this file.')
+    parser.add_argument('--watch', action='store_true',
+        help='Keep watching the directory given by -d and check new or modified files.')
+    parser.add_argument('--settle', type=float, default=5.0, metavar='SECONDS',
+        help='With --watch, check a file once it did not change for this time (default: 5).')
+    parser.add_argument('--shard', metavar='I/N', type=shard_type,
+        help='Check only block I (0 <= I < N) of the N contiguous blocks of the sorted files.')
+    parser.add_argument('--partial', metavar='FILE',
+        help="Write a partial result file for 'cmsaf-checker merge'.")
+    parser.add_argument('--enqueue', metavar='QUEUE',
+        help='Add the files to the work queue QUEUE (an SQLite file on shared storage) and exit.')
+    parser.add_argument('--worker', metavar='QUEUE',
+        help='Check files claimed from the work queue QUEUE until it is drained.')
+    parser.add_argument('--lease', type=float, default=600.0, metavar='SECONDS',
+        help='With --worker, time after which the file of a lost worker is checked again (default: 600).')
+    parser.add_argument('--progress', action='store_true',
+        help='Show files/s, MB/s, ETA and result counts in a progress line on standard error.')
+    parser.add_argument('--metrics', metavar='FILE',
+        help='Write throughput metrics and stage latency histograms to FILE for the Prometheus textfile collector.')
+    parser.add_argument('--metrics-interval', type=float, default=15.0, metavar='SECONDS',
+        help='With --metrics, time between updates of FILE (default: 15).')
+    parser.add_argument('--client', metavar='ADDRESS',
+        help='Send files to a running checker daemon at this socket path or [host:]port.')
+    parser.add_argument('files', nargs='*',
+        help="Files, or file name patterns with -d. '@FILE' reads a list of files from FILE, '-' from standard input.")
 
     args = parser.parse_args()
+    args.profile = args.profile or args.memory
+    if args.watch and args.directory is None:
+        parser.error("--watch requires -d/--directory")
+    if args.watch and (args.shard is not None or args.partial is not None):
+        parser.error("--watch cannot be combined with --shard/--partial")
+    if args.worker is not None and (args.watch or args.shard is not None or args.enqueue is not None):
+        parser.error("--worker cannot be combined with --watch, --shard or --enqueue")
+    if args.worker is None and not args.files:
+        parser.error("the following arguments are required: files")
 
     # build final search path list: prepend explicit -s if given
-    search_paths = default_search_paths
-    if args.cmsaf_metadata_standard is not None:
-        search_paths = [args.cmsaf_metadata_standard] + search_paths
+    search_paths = default_search_paths(args.cmsaf_metadata_standard)
     for i, p in enumerate(search_paths, start=ord('a')):
         print(f"CMSAF Standards path ({chr(i)}) '{p}'")
 
-    # get a new checker object
-    if args.reference == None:
-        inst = CMSAFChecker(search_paths=search_paths, version=args.version,
-            coordinates=args.coordinates, lazy=args.lazy, ignore=args.ignore_attr,
-            standard_file=args.standard_file)
-    else:
-        inst = CMSAFChecker(referenceFile=args.reference, ignore=args.ignore_attr,
-            coordinates=args.coordinates, lazy=args.lazy,
-            standard_file=args.standard_file)
+    # get a new checker object, or a connection to a running daemon
+    inst = None
+    if args.client is None and not args.names_only and args.enqueue is None:
+        options = checker_options(args, search_paths)
+        if args.metrics is not None:
+            # stage timings for the latency histograms
+            options["profile"] = True
+        inst = CMSAFChecker(**options)
 
-    # file pattern expansion
+    # file discovery, streamed into the checks unless the file order is needed
     files = []
-    if args.directory is not None:
-        for root, dirs, names in os.walk(args.directory, followlinks=True):
-            tmp = fnmatch.filter(names, args.files[0])
-            for fn in tmp:
-                if args.directory != root:
-                    continue
-                fnp=os.path.join(root,fn)
-                if os.access(fnp, os.R_OK):
-                    files.append(fnp)
-                else:
-                    print(f"Skipping file '{fnp}'")
+    count = None
+    queue = None
+    if args.watch:
+        pass
+    elif args.worker is not None:
+        from .workqueue import WorkQueue
+        try:
+            queue = WorkQueue(args.worker, lease=args.lease)
+        except CheckerError as detail:
+            print(f"{RC_ERR} {detail}")
+            exit(1)
+        files = iter(queue)
+    elif args.missing is not None or args.names_only or args.shard is not None or args.enqueue is not None:
+        files = sorted(iter_inputs(args), key=lambda s: os.path.basename(s))
+        count = len(files)
     else:
-        files.extend(args.files)
-    files.sort(key=lambda s: os.path.basename(s))
+        files = iter_inputs(args)
+
+    # fill the work queue, files are checked by --worker processes
+    if args.enqueue is not None:
+        from .workqueue import WorkQueue
+        queue = WorkQueue(args.enqueue, create=True)
+        added = queue.enqueue(files, missing=args.missing)
+        queue.close()
+        print(f"Queued {added} new of {count} files in '{args.enqueue}'")
+        exit(0)
 
     # result dict
-    res = {'OK': 0, 'FAILED': 0, 'MISSING' : 0}
-
-    # decode first file name
-    fileDelta = None
-    if len(files) > 1 and args.missing is not None:
-        if args.missing == "filename":
-            fileName = os.path.realpath(files[0])
-            fileName = os.path.basename (fileName)
-            fileAttr = re.match(CMSAF_NAMING_STANDARD, fileName)
-            fileStep = fileAttr.group(2)
-        else:
-            fileStep = args.missing
-        if fileStep == 'd':
-            fileDelta = datetime.timedelta(days=1, hours=0, minutes=0, seconds=0)
-        elif fileStep == 'm':
-            fileDelta = datetime.timedelta(days=31, hours=0, minutes=0, seconds=0)
-        elif fileStep == 'h':
-            fileDelta = datetime.timedelta(days=0, hours=1, minutes=0, seconds=0)
-        elif fileStep == 'M15':
-            fileDelta = datetime.timedelta(days=0, hours=0, minutes=15, seconds=0)
-
-    # loop files
-    lastTime = None
-    for index, file in enumerate(files):
-        # test missing
-        if fileDelta is not None:
-            currentFile = os.path.realpath(file)
-            currentFile = os.path.basename (currentFile)
-            currentTime = datetime.datetime.strptime(currentFile[5:17], "%Y%m%d%H%M")
-            currentTime = currentTime.replace(tzinfo=pytz.utc)
-            if lastTime is not None:
-                while 1:
-                    nextTime = lastTime + fileDelta
-                    if fileStep == 'm':
-                        nextTime = nextTime.replace(day=1)
-                    fileDiff = currentTime-nextTime
-                    if fileDiff.total_seconds() > 0:
-                        print(f"\n{'':=^80}\nMissing File for {nextTime.isoformat('T')}\n{'':=^80}")
-                        res['MISSING'] += 1
-                        lastTime = nextTime
-                    else:
-                        break
-            lastTime = currentTime
+    res = {'OK': 0, 'FAILED': 0, 'MISSING' : 0, 'DUPLICATE' : 0}
 
-        # print info
-        print(f"\n{'':=^80}\nChecking File {index+1}/{len(files)}\n{'':=^80}\n'{file}'")
-
-        # check current file
-        inst._reset()
-        rc = inst.checker(file)
+    # missing and duplicate files, decoded from the file names
+    step = None
+    if args.missing is not None and args.missing != "filename":
+        from .missing import parse_step
+        try:
+            step = parse_step(args.missing)
+        except ValueError as detail:
+            parser.error(f"-m/--missing: {detail}")
+
+    series = None
+    timeline = None
+    gaps = {}
+    if (args.missing is not None or args.names_only) and count is not None and count > 1:
+        from .missing import find_missing, gap_messages
+        series, invalid = find_missing(files, step)
+        gaps = gap_messages(series, missing=args.missing is not None)
+
+    # select the block of this shard, gaps stay attached to the following file
+    total = count
+    if args.shard is not None:
+        from .shard import shard_range
+        start, stop = shard_range(count, *args.shard)
+        files = files[start:stop]
+        count = len(files)
+        print(f"Shard {args.shard[0]}/{args.shard[1]}: files {start+1} to {stop} of {total}")
+
+    # structured results
+    jsonFile = open(args.json, "w") if args.json is not None else None
+    checked  = [] if args.partial is not None else None
+    profiles = []
+
+    # progress line and metrics file
+    metrics = None
+    if args.progress or args.metrics is not None:
+        from .metrics import Metrics
+        metrics = Metrics(res, total=count)
+    shown = {"progress": 0.0, "metrics": 0.0}
+
+    def showMetrics(final=False):
+        """Update the progress line and the metrics file, at most every interval."""
+        now = time.time()
+        if args.progress and (final or now - shown["progress"] >= 0.5):
+            shown["progress"] = now
+            if sys.stderr.isatty():
+                sys.stderr.write(f"\r\033[K{metrics.line()}" + ("\n" if final else ""))
+            elif final or now - shown.get("line", 0.0) >= 60.0:
+                shown["line"] = now
+                sys.stderr.write(metrics.line() + "\n")
+            sys.stderr.flush()
+        if args.metrics is not None and (final or now - shown["metrics"] >= args.metrics_interval):
+            shown["metrics"] = now
+            metrics.write_textfile(args.metrics)
+
+    def checkFiles(batch):
+        """Return results for *batch*, computed locally or streamed back from the daemon in file order."""
+        if args.names_only:
+            return (lint_filename(file) for file in batch)
+        if inst is not None:
+            # a file the checks raise for gives a failed result, the batch goes on
+            return (check_file(inst, file) for file in batch)
+        from .server import check_remote
+        return check_remote(args.client, batch)
+
+    def report(file, results):
+        """Take the result of *file* from *results* and report it."""
+        try:
+            result = next(results)
+        except CheckerError as detail:
+            # the daemon is gone, leave the claimed files to other workers
+            if queue is not None:
+                queue.release()
+            print(detail)
+            exit(1)
+        if inst is None:
+            for finding in result.findings:
+                print(f"{RC_LEVEL[finding.level]} [{finding.stage}] {finding.message}")
+        if jsonFile is not None:
+            jsonFile.write(json.dumps(result.to_dict()) + "\n")
+            jsonFile.flush()
+        rc = result.rc
+        if checked is not None:
+            checked.append((file, rc))
+        if queue is not None:
+            queue.complete(file, result)
         if rc == 0:
             res['OK'] += 1
             rcMsg = RC_OK
@@ -2351,17 +4329,107 @@ def main():
             res['FAILED'] += 1
             rcMsg = RC_FAIL
         print(f"\n{'':-^80}\n{rcMsg} <<< result for {file}\n{'':-^80}")
+        if metrics is not None:
+            try:
+                size = os.stat(file).st_size
+            except OSError:
+                size = 0
+            metrics.add(result, size)
+            showMetrics()
+        if args.profile and result.profile is not None:
+            total = result.profile["total"]
+            profiles.append((file, result.profile))
+            line = (f"{total['wall']*1e3:.1f} ms wall, {total['cpu']*1e3:.1f} ms cpu, "
+                f"{total['rchar']} bytes read, {total['reads']} variable reads")
+            if "peak" in total:
+                line += f", {total['peak']} bytes heap peak"
+            if total.get("rss"):
+                line += f", {total['rss']} bytes peak RSS"
+            print(line)
+
+    if args.watch:
+        # check files arriving in the directory until interrupted
+        import signal
+        from .watch import Timelines, Watcher
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        index = 0
+        try:
+            for batch in Watcher(args.directory, args.files, settle=args.settle):
+                batch.sort(key=lambda s: os.path.basename(s))
+
+                # test missing
+                if args.missing is not None:
+                    if timeline is None:
+                        timeline = Timelines(step)
+                    for file in batch:
+                        for nextTime in timeline.add(file):
+                            print(f"\n{'':=^80}\nMissing File for {nextTime.isoformat('T')}\n{'':=^80}")
+                    res['MISSING'] = len(timeline.missing)
+
+                results = checkFiles(batch)
+                for file in batch:
+                    index += 1
+                    print(f"\n{'':=^80}\nChecking File {index}\n{'':=^80}\n'{file}'")
+                    report(file, results)
+        except KeyboardInterrupt:
+            pass
+    else:
+        files, pending = itertools.tee(files)
+        results = checkFiles(pending)
+
+        # a worker returns its claimed file to the queue when interrupted
+        if queue is not None:
+            import signal
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        # loop files
+        try:
+            for index, file in enumerate(files):
+                # report missing slots before the next file of their series
+                for kind, msg in gaps.get(file, ()):
+                    print(f"\n{'':=^80}\n{msg}\n{'':=^80}")
+                    if kind is not None:
+                        res[kind] += 1
+
+                # print info
+                print(f"\n{'':=^80}\nChecking File {index+1}{'' if count is None else f'/{count}'}\n{'':=^80}\n'{file}'")
+
+                # check current file
+                report(file, results)
+        except KeyboardInterrupt:
+            if queue is None:
+                raise
+            queue.release()
+            print(f"\nInterrupted, claimed files returned to the work queue '{args.worker}'")
 
     # close reference file
-    if inst.refDataset is not None:
-        inst.refDataset.close();
-        inst.refDataset = None
+    if inst is not None:
+        inst.close()
+    if jsonFile is not None:
+        jsonFile.close()
+    if queue is not None:
+        queue.close()
+    if checked is not None:
+        from .shard import write_partial
+        write_partial(args.partial, *(args.shard or (0, 1)), args.missing,
+            len(checked) if total is None else total, res, checked)
+
+    if metrics is not None:
+        showMetrics(final=True)
+
+    # profiling summary
+    if profiles:
+        from .profiling import profile_table
+        print(f"\n{'':=^80}\nProfile\n{'':=^80}")
+        print("\n".join(profile_table(profiles)))
 
     # final result
     print(f"\n{'':=^80}\nOverall Summary\n{'':=^80}")
-    print(f"Out of {len(files)}, {res['FAILED']} FAILED")
-    if (args.missing) and (fileDelta is not None):
+    print(f"Out of {res['OK'] + res['FAILED']}, {res['FAILED']} FAILED")
+    if args.missing is not None and (series is not None or timeline is not None):
         print(f"{res['MISSING']} files MISSING")
+    if res['DUPLICATE'] > 0:
+        print(f"{res['DUPLICATE']} files DUPLICATE")
 
     if res['FAILED'] == 0:
         exit(0)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+differential.py
+
+Output equivalence of check engines.
+
+An engine is a set of CMSAFChecker options selecting an alternative
+implementation of some checks (block-wise evaluation, caches, ...), applied
+on top of REFERENCE, which disables all of them. The "default" engine is the
+checker as configured by default. The harness checks every file of a corpus
+with the reference engine and with the engines under test and reports any
+difference in return code, stage verdicts, findings, attribute lists or
+printed output. The corpus consists of the
+synthetic files of synthetic.py and pathological variants of them, plus any
+real files given.
+"""
+
+import difflib
+import os
+
+from .cli import CMSAFChecker, _checker_options, _lazy_import
+from .synthetic import KINDS, generate
+
+np      = _lazy_import("numpy")
+netCDF4 = _lazy_import("netCDF4")
+
+# CMSAFChecker options of the reference implementation
+REFERENCE = {
+    "memory_budget":    None,
+    "attribute_cache":  0,
+    "structure_cache":  0,
+    "coordinate_cache": 0,
+    "array_cache":      0,
+}
+
+# engine name -> CMSAFChecker options on top of REFERENCE, None for the defaults
+ENGINES = {
+    "reference":       {},
+    "default":         None,
+    # coordinates and bounds evaluated row by row
+    "blocks":          {"memory_budget": 1},
+    # global attribute verdicts replayed for repeated values
+    "attribute-memo":  {"attribute_cache": 4096},
+    # variable and compression verdicts replayed for files of the same structure
+    "structure-memo":  {"structure_cache": 256},
+    # latitude/longitude verdicts replayed for identical arrays
+    "coordinate-memo": {"coordinate_cache": 64},
+    # variables read once per file
+    "array-cache":     {"array_cache": 256 * 1024**2},
+    # 2-D coordinate bands evaluated in threads
+    "scan-threads":    {"scan_threads": 4, "memory_budget": 1024**2},
+}
+
+
+# ---------------------------------------------------------------------------
+# Pathological files
+# ---------------------------------------------------------------------------
+
+def _flip_lat(ds):
+    ds["lat"][:] = ds["lat"][::-1]
+    ds["lat_bnds"][:] = np.flip(ds["lat_bnds"][:])
+
+def _lon_off_grid(ds):
+    lon = ds["lon"][:]
+    lon[[3, 50, 51, 200]] += 0.3
+    ds["lon"][:] = lon
+
+def _lon_zero_center(ds):
+    ds["lon"][100] = 0.0
+
+def _lat_masked(ds):
+    ds["lat"][10] = netCDF4.default_fillvals["f8"]
+
+def _bounds_gap(ds):
+    ds["lon_bnds"][10, 1] = ds["lon_bnds"][10, 1] - 0.2
+
+def _bounds_overlap(ds):
+    ds["lat_bnds"][20, 0] = ds["lat_bnds"][20, 0] - 0.1
+
+def _bounds_missing(ds):
+    ds["lat"].delncattr("bounds")
+
+def _bounds_outside(ds):
+    ds["lon_bnds"][5, :] = ds["lon_bnds"][5, :] + 0.7
+
+def _lat_axis_missing(ds):
+    ds["lat"].delncattr("axis")
+
+def _lon_axis_wrong(ds):
+    ds["lon"].axis = "Y"
+
+def _time_shifted(ds):
+    ds["time"][:] = ds["time"][:] + 1
+
+def _time_inexact(ds):
+    ds["time"][:] = ds["time"][:] + 1.7e-8
+
+def _time_units_invalid(ds):
+    ds["time"].units = "hours since 1900-01-01"
+    ds["time_bnds"].units = "hours since 1900-01-01"
+
+def _time_units_garbage(ds):
+    ds["time"].units = "seconds"
+
+def _time_bounds_absent(ds):
+    ds["time"].bounds = "no_such_variable"
+
+def _time_not_in_bounds(ds):
+    ds["time_bnds"][:] = ds["time_bnds"][:] + 2
+
+def _record_status_invalid(ds):
+    ds["record_status"][0] = 5
+
+def _coverage_mismatch(ds):
+    ds.time_coverage_start = "2019-12-31T00:00:00Z"
+    ds.time_coverage_end   = "2020-01-01T12:00:00Z"
+
+def _coverage_garbage(ds):
+    ds.time_coverage_start = "yesterday"
+
+def _attribute_missing(ds):
+    ds.delncattr("summary")
+    ds.delncattr("keywords")
+
+def _attribute_type(ds):
+    ds.geospatial_lat_resolution = 1.0
+    ds.geospatial_lon_min = "west"
+
+def _geospatial_mismatch(ds):
+    ds.geospatial_lat_min = -80.0
+    ds.geospatial_lon_max = 170.0
+
+def _vocabulary_unknown(ds):
+    ds.platform = "NOT-A-PLATFORM"
+    ds.instrument = "NOT-AN-INSTRUMENT"
+
+def _instantaneous_gap(ds):
+    time = ds["time"][:]
+    time[10:] += 15 / 1440
+    ds["time"][:] = time
+
+def _variable_attributes(ds):
+    ds["tas"].delncattr("long_name")
+    ds["tas"].delncattr("units")
+    ds["tas"].valid_min = np.float32(400)
+
+def _swath_bounds_gap(ds):
+    ds["lon_bnds"][10, 10, :] = ds["lon_bnds"][10, 10, :] + 0.01
+
+def _swath_lat_reversed(ds):
+    ds["lat"][200, :] = ds["lat"][201, :] + 0.01
+
+def _swath_lat_outside(ds):
+    ds["lat"][5, 5] = ds["lat"][5, 5] + 0.5
+
+def _swath_time_reversed(ds):
+    ds["time"][100:103] = ds["time"][100:103][::-1]
+
+def _swath_time_duplicate(ds):
+    ds["time"][300] = ds["time"][299]
+
+def _swath_time_gap(ds):
+    ds["time"][400:] = ds["time"][400:] + 1 / 24
+
+def _swath_time_axis_missing(ds):
+    ds["time"].delncattr("axis")
+
+def _data_out_of_range(ds):
+    ds["tas"][0, 10:12, :] = 400
+
+def _data_nan(ds):
+    ds["tas"][0, 50, 7] = np.nan
+
+def _data_all_fill(ds):
+    ds["tas"][:] = np.ma.masked
+
+def _flag_cube(ds, values=None, masks=None):
+    qa = ds.createVariable("qa", "u1", ("time", "lat", "lon"), zlib=True)
+    qa.long_name = "quality flag"
+    data = np.arange(qa.size, dtype="u1").reshape(qa.shape) % 3
+    if values is not None:
+        qa.flag_values = np.array(values, "u1")
+    if masks is not None:
+        qa.flag_masks = np.array(masks, "u1")
+    qa.flag_meanings = " ".join(f"flag{i}" for i in range(len(masks or values)))
+    return qa, data
+
+def _flag_values_undeclared(ds):
+    qa, data = _flag_cube(ds, values=[0, 1, 2])
+    data[0, 100:110, 7] = 3
+    data[0, 20, 300] = 9
+    qa[:] = data
+
+def _flag_masks_undeclared(ds):
+    qa, data = _flag_cube(ds, masks=[1, 2, 4])
+    data[0, 170, 10:20] |= 8
+    qa[:] = data
+
+# swath of many scanline records
+SCANLINES = {"kind": "swath", "records": 500, "swath_shape": (20, 10)}
+
+# name -> (generate() options, mutation applied to the written file)
+MUTATIONS = {
+    "lat_descending":          ({}, _flip_lat),
+    "lon_off_grid":            ({}, _lon_off_grid),
+    "lon_zero_center":         ({}, _lon_zero_center),
+    "lat_masked":              ({}, _lat_masked),
+    "bounds_gap":              ({}, _bounds_gap),
+    "bounds_overlap":          ({}, _bounds_overlap),
+    "bounds_missing":          ({}, _bounds_missing),
+    "bounds_outside":          ({}, _bounds_outside),
+    "lat_axis_missing":        ({}, _lat_axis_missing),
+    "lon_axis_wrong":          ({}, _lon_axis_wrong),
+    "time_shifted":            ({}, _time_shifted),
+    "time_inexact":            ({}, _time_inexact),
+    "time_units_invalid":      ({}, _time_units_invalid),
+    "time_units_garbage":      ({}, _time_units_garbage),
+    "time_bounds_absent":      ({}, _time_bounds_absent),
+    "time_not_in_bounds":      ({}, _time_not_in_bounds),
+    "record_status_invalid":   ({}, _record_status_invalid),
+    "coverage_mismatch":       ({}, _coverage_mismatch),
+    "coverage_garbage":        ({}, _coverage_garbage),
+    "attribute_missing":       ({}, _attribute_missing),
+    "attribute_type":          ({}, _attribute_type),
+    "geospatial_mismatch":     ({}, _geospatial_mismatch),
+    "vocabulary_unknown":      ({}, _vocabulary_unknown),
+    "variable_attributes":     ({}, _variable_attributes),
+    "uncompressed":            ({"complevel": 0}, None),
+    "fine_grid":               ({"grid": "26"}, None),
+    "nested_groups":           ({"groups": 2, "variables": 3}, None),
+    "instantaneous_gap":       ({"kind": "instantaneous", "records": 48}, _instantaneous_gap),
+    "swath_bounds":            ({"kind": "swath", "swath_bounds": True}, None),
+    "swath_bounds_gap":        ({"kind": "swath", "swath_bounds": True}, _swath_bounds_gap),
+    "swath_lat_reversed":      ({"kind": "swath", "swath_bounds": True}, _swath_lat_reversed),
+    "swath_lat_outside":       ({"kind": "swath", "swath_bounds": True}, _swath_lat_outside),
+    "swath_time_reversed":     (SCANLINES, _swath_time_reversed),
+    "swath_time_duplicate":    (SCANLINES, _swath_time_duplicate),
+    "swath_time_gap":          (SCANLINES, _swath_time_gap),
+    "swath_time_axis_missing": (SCANLINES, _swath_time_axis_missing),
+    "data_out_of_range":       ({}, _data_out_of_range),
+    "data_nan":                ({}, _data_nan),
+    "data_all_fill":           ({}, _data_all_fill),
+    "flag_values_undeclared":  ({}, _flag_values_undeclared),
+    "flag_masks_undeclared":   ({}, _flag_masks_undeclared),
+}
+
+
+def corpus(directory, kinds=KINDS, mutations=MUTATIONS):
+    """
+    Write the synthetic corpus to *directory* and return the paths.
+
+    Two consecutive files are written for every product kind, and one daily
+    file (unless the mutation selects another kind) for every mutation.
+    """
+    paths = []
+    for kind in kinds:
+        paths += generate(os.path.join(directory, kind), kind, files=2)
+    for name, (options, mutate) in mutations.items():
+        options = dict(options)
+        kind = options.pop("kind", "daily")
+        path, = generate(os.path.join(directory, name), kind, **options)
+        if mutate is not None:
+            ds = netCDF4.Dataset(path, "a")
+            try:
+                mutate(ds)
+            finally:
+                ds.close()
+        paths.append(path)
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# Comparison
+# ---------------------------------------------------------------------------
+
+class _Engine:
+    """Checker of an engine, collecting the printed output per file."""
+
+    def __init__(self, name, coordinates=True, data=True, **options):
+        self.name    = name
+        self.output  = []
+        options = dict(options, coordinates=coordinates, data_all=data)
+        if ENGINES[name] is not None:
+            options.update(REFERENCE, **ENGINES[name])
+        options["log"] = self._log
+        self.checker = CMSAFChecker(**_checker_options(options))
+
+    def _log(self, text, end="\n"):
+        self.output.append(f"{text}{end}")
+
+    def check(self, path):
+        """Check *path*; return (result dict, output lines)."""
+        self.output = []
+        try:
+            result = self.checker.check(path).to_dict()
+        except Exception as detail:
+            result = {"path": path, "exception": f"{type(detail).__name__}: {detail}"}
+        result.pop("profile", None)
+        return result, "".join(self.output).splitlines(keepends=True)
+
+    def close(self):
+        self.checker.close()
+
+
+def diff_results(reference, other):
+    """Return the keys of the result dicts that differ."""
+    return sorted(k for k in reference.keys() | other.keys() if reference.get(k) != other.get(k))
+
+
+def compare(paths, engines, reference="reference", coordinates=True, data=True, context=3, log=print):
+    """
+    Check *paths* with the *reference* engine and each of *engines*.
+
+    Returns a list of differences, dicts with the path, engine, the keys of
+    the result that differ and a unified diff of the output.
+    """
+    ref = _Engine(reference, coordinates=coordinates, data=data)
+    others = [_Engine(name, coordinates=coordinates, data=data) for name in engines if name != reference]
+    differences = []
+    try:
+        for path in paths:
+            expected, expectedOutput = ref.check(path)
+            status = []
+            for engine in others:
+                result, output = engine.check(path)
+                keys = diff_results(expected, result)
+                if output != expectedOutput:
+                    keys.append("output")
+                if keys:
+                    differences.append({
+                        "path":   path,
+                        "engine": engine.name,
+                        "keys":   keys,
+                        "diff":   "".join(difflib.unified_diff(expectedOutput, output,
+                            fromfile=reference, tofile=engine.name, n=context)),
+                    })
+                    status.append(f"{engine.name}: {', '.join(keys)}")
+            verdict = expected.get("status", "EXCEPTION")
+            if log is not None:
+                log(f"{'DIFFERENT' if status else 'SAME':<10} {verdict:<9} {path}" + (f"  ({'; '.join(status)})" if status else ""))
+    finally:
+        ref.close()
+        for engine in others:
+            engine.close()
+    return differences
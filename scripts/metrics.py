@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+metrics.py
+
+Throughput and progress metrics of long checker runs.
+
+Metrics keeps the number of checked, failed and missing files, the bytes
+checked, the throughput and a latency histogram per check stage (from the
+profile of each Result). It renders a compact progress line for a terminal
+and the Prometheus text exposition format for the node_exporter textfile
+collector.
+"""
+
+import math
+import os
+import time
+
+# upper bounds of the stage latency histogram buckets in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, math.inf)
+
+
+def _duration(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class Metrics:
+    """
+    Metrics of a run; *counts* is the result dict of the run (OK, FAILED,
+    MISSING, ...), *total* the number of files to check if known.
+    """
+
+    def __init__(self, counts, total=None):
+        self.counts   = counts
+        self.total    = total
+        self.start    = time.time()
+        self.last     = None       # time of the last checked file
+        self.files    = 0
+        self.bytes    = 0
+        self.stages   = {}         # stage -> [bucket counts, sum, count]
+
+    def add(self, result, size=0):
+        """Account the Result of a checked file of *size* bytes."""
+        self.last   = time.time()
+        self.files += 1
+        self.bytes += size
+        if result.profile is None:
+            return
+        for name, values in [*result.profile["stages"].items(), ("total", result.profile["total"])]:
+            hist = self.stages.setdefault(name, [[0] * len(BUCKETS), 0.0, 0])
+            wall = values["wall"]
+            for i, bound in enumerate(BUCKETS):
+                if wall <= bound:
+                    hist[0][i] += 1
+            hist[1] += wall
+            hist[2] += 1
+
+    def rates(self):
+        """Return (files/s, bytes/s, ETA seconds or None)."""
+        elapsed = max(time.time() - self.start, 1e-9)
+        filesPerSec = self.files / elapsed
+        eta = None
+        if self.total is not None and filesPerSec > 0:
+            eta = (self.total - self.files) / filesPerSec
+        return filesPerSec, self.bytes / elapsed, eta
+
+    def line(self):
+        """Return the compact progress line."""
+        filesPerSec, bytesPerSec, eta = self.rates()
+        if self.total:
+            done = f"{self.files}/{self.total} {100 * self.files / self.total:5.1f}%"
+        else:
+            done = f"{self.files}"
+        text = f"[{done}] {filesPerSec:.2f} files/s {bytesPerSec / 1e6:.1f} MB/s"
+        if eta is not None:
+            text += f" ETA {_duration(eta)}"
+        text += f" | OK {self.counts.get('OK', 0)} FAILED {self.counts.get('FAILED', 0)}"
+        if self.counts.get('MISSING'):
+            text += f" MISSING {self.counts['MISSING']}"
+        return text
+
+    def prometheus(self):
+        """Return the metrics in the Prometheus text exposition format."""
+        filesPerSec, bytesPerSec, eta = self.rates()
+        lines = [
+            "# HELP cmsaf_checker_files_total Files checked, by result.",
+            "# TYPE cmsaf_checker_files_total counter",
+            f'cmsaf_checker_files_total{{status="ok"}} {self.counts.get("OK", 0)}',
+            f'cmsaf_checker_files_total{{status="failed"}} {self.counts.get("FAILED", 0)}',
+            "# HELP cmsaf_checker_missing_files_total Files detected as missing.",
+            "# TYPE cmsaf_checker_missing_files_total counter",
+            f"cmsaf_checker_missing_files_total {self.counts.get('MISSING', 0)}",
+            "# HELP cmsaf_checker_bytes_total Size of the checked files.",
+            "# TYPE cmsaf_checker_bytes_total counter",
+            f"cmsaf_checker_bytes_total {self.bytes}",
+            "# HELP cmsaf_checker_files_per_second Files checked per second since the start of the run.",
+            "# TYPE cmsaf_checker_files_per_second gauge",
+            f"cmsaf_checker_files_per_second {filesPerSec:.6g}",
+            "# HELP cmsaf_checker_bytes_per_second Bytes checked per second since the start of the run.",
+            "# TYPE cmsaf_checker_bytes_per_second gauge",
+            f"cmsaf_checker_bytes_per_second {bytesPerSec:.6g}",
+            "# HELP cmsaf_checker_start_time_seconds Start of the run, unix time.",
+            "# TYPE cmsaf_checker_start_time_seconds gauge",
+            f"cmsaf_checker_start_time_seconds {self.start:.3f}",
+        ]
+        if self.last is not None:
+            lines += [
+                "# HELP cmsaf_checker_last_file_time_seconds Time the last file was checked, unix time.",
+                "# TYPE cmsaf_checker_last_file_time_seconds gauge",
+                f"cmsaf_checker_last_file_time_seconds {self.last:.3f}",
+            ]
+        if self.total is not None:
+            lines += [
+                "# HELP cmsaf_checker_files_planned Files to check in this run.",
+                "# TYPE cmsaf_checker_files_planned gauge",
+                f"cmsaf_checker_files_planned {self.total}",
+            ]
+        if eta is not None:
+            lines += [
+                "# HELP cmsaf_checker_eta_seconds Estimated time until all files are checked.",
+                "# TYPE cmsaf_checker_eta_seconds gauge",
+                f"cmsaf_checker_eta_seconds {eta:.1f}",
+            ]
+        if self.stages:
+            lines += [
+                "# HELP cmsaf_checker_stage_duration_seconds Wall time of the check stages.",
+                "# TYPE cmsaf_checker_stage_duration_seconds histogram",
+            ]
+            for name, (buckets, total, count) in sorted(self.stages.items()):
+                for bound, n in zip(BUCKETS, buckets):
+                    le = "+Inf" if bound == math.inf else f"{bound:g}"
+                    lines.append(f'cmsaf_checker_stage_duration_seconds_bucket{{stage="{name}",le="{le}"}} {n}')
+                lines.append(f'cmsaf_checker_stage_duration_seconds_sum{{stage="{name}"}} {total:.6f}')
+                lines.append(f'cmsaf_checker_stage_duration_seconds_count{{stage="{name}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Write the Prometheus metrics to *path*, replaced atomically for the textfile collector."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as fh:
+            fh.write(self.prometheus())
+        os.replace(tmp, path)
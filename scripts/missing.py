@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+missing.py
+
+Calendar exact missing and duplicate file detection from CM SAF file names.
+
+All time stamps are decoded from the file names, grouped into product series
+(the file name with the time stamp masked) and compared with the expected
+calendar sequence of the series time code as a vectorized set difference.
+No file is opened.
+
+Time steps are given by the CM SAF time code of the file name or explicitly:
+
+  h            hourly
+  d            daily
+  p            pentads, 73 per year starting Jan 1, the leap day is added
+               to the pentad starting Feb 25
+  w            weekly
+  m            monthly
+  s            seasonal (three months)
+  a            annual
+  M<n>, H<n>   instantaneous slots every n minutes or hours
+  i            instantaneous slots, the step is the most frequent difference
+               between consecutive files
+"""
+
+import os
+import re
+from typing import NamedTuple
+
+from .cli import decode_filename, np
+
+
+class Step(NamedTuple):
+    """Calendar step: unit 'm' (minutes), 'M' (months) or 'p' (pentads), and count."""
+    unit:  str
+    count: int = 1
+
+    def __str__(self):
+        if self.unit == 'm':
+            return f"PT{self.count}M"
+        if self.unit == 'M':
+            return f"P{self.count}M"
+        return "pentad"
+
+
+TIME_STEPS = {
+    'h': Step('m', 60),
+    'd': Step('m', 1440),
+    'w': Step('m', 7 * 1440),
+    'p': Step('p'),
+    'm': Step('M', 1),
+    's': Step('M', 3),
+    'a': Step('M', 12),
+}
+
+
+def parse_step(code):
+    """
+    Return the Step of a time code ('d', 'm', 'M15', 'H3', ...).
+
+    Returns None for 'i' (inferred from the files) and raises ValueError
+    for unknown codes.
+    """
+    if code == 'i':
+        return None
+    if code in TIME_STEPS:
+        return TIME_STEPS[code]
+    decode = re.match(r'^([MH])([1-9][0-9]*)$', code)
+    if decode is None:
+        raise ValueError(f"unknown time step '{code}'")
+    return Step('m', int(decode.group(2)) * (60 if decode.group(1) == 'H' else 1))
+
+
+def _is_leap(years):
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+
+def expected_slots(first, last, step):
+    """
+    Return the expected time slots from *first* to *last* (datetime64[m]).
+
+    Slots keep the offset of *first* within its period, e.g. the time of
+    day for daily files or the day of month for monthly files.
+    """
+    first = np.datetime64(first, 'm')
+    last  = np.datetime64(last, 'm')
+    if step.unit == 'm':
+        return np.arange(first, last + np.timedelta64(1, 'm'), np.timedelta64(step.count, 'm'))
+
+    if step.unit == 'M':
+        month  = first.astype('M8[M]')
+        offset = first - month.astype('M8[m]')
+        months = np.arange(month, last.astype('M8[M]') + np.timedelta64(1, 'M'), np.timedelta64(step.count, 'M'))
+        slots  = months.astype('M8[m]') + offset
+
+    else:
+        # pentads start on the same day of month in every year
+        years   = np.arange(first.astype('M8[Y]'), last.astype('M8[Y]') + np.timedelta64(1, 'Y'))
+        offsets = np.arange(73, dtype=np.int64) * 5
+        offsets = offsets[None, :] + (_is_leap(years.astype(np.int64) + 1970)[:, None] & (offsets[None, :] >= 59))
+        days    = years.astype('M8[D]')[:, None] + offsets.astype('m8[D]')
+        offset  = first - first.astype('M8[D]').astype('M8[m]')
+        slots   = days.ravel().astype('M8[m]') + offset
+        slots   = slots[slots >= first]
+
+    return slots[slots <= last]
+
+
+def infer_step(times):
+    """Return the most frequent difference of sorted unique *times* as Step, or None."""
+    if len(times) < 2:
+        return None
+    diffs, counts = np.unique(np.diff(times).astype(np.int64), return_counts=True)
+    return Step('m', int(diffs[np.argmax(counts)]))
+
+
+class Series(NamedTuple):
+    """Missing and duplicate file analysis of one product series."""
+    product:    str           # file name with '*' in place of the time stamp
+    code:       str           # time code of the file name
+    step:       Step | None
+    times:      np.ndarray    # unique sorted file times, datetime64[m]
+    paths:      list          # first file for each of times
+    missing:    np.ndarray    # expected slots without file
+    duplicates: np.ndarray    # times with more than one file
+    unexpected: np.ndarray    # file times not on the expected time grid
+
+
+def decode_names(files):
+    """
+    Decode the time stamps of *files* from their file names.
+
+    Returns (products, ids, times, valid, invalid): the product keys, the
+    product index and datetime64[m] time of every file matching the naming
+    convention, their indices in *files*, and the files not matching it or
+    with an invalid date.
+    """
+    products = {}
+    ids      = []
+    stamps   = []
+    valid    = []
+    invalid  = []
+    for index, file in enumerate(files):
+        decode = decode_filename(file.rpartition(os.sep)[2])
+        # dates like Feb 30 match the naming convention but are invalid
+        if decode is None or decode.time is None:
+            invalid.append(file)
+            continue
+        ids.append(products.setdefault(decode.key, len(products)))
+        stamps.append(decode.time.replace(tzinfo=None))
+        valid.append(index)
+    ids   = np.array(ids, dtype=np.int64)
+    times = np.array(stamps, dtype='M8[m]')
+    return list(products), ids, times, valid, invalid
+
+
+def find_missing(files, step=None):
+    """
+    Find missing and duplicate files in *files* from their names.
+
+    *step* is a Step applied to all series; by default it is derived from
+    the time code of each series. Returns (list of Series, invalid files).
+    """
+    files = list(files)
+    products, ids, times, valid, invalid = decode_names(files)
+    series = []
+    if len(valid) == 0:
+        return series, invalid
+
+    order  = np.lexsort((times, ids))
+    bounds = np.flatnonzero(np.diff(ids[order])) + 1
+    for group in np.split(order, bounds):
+        product = products[ids[group[0]]]
+        code    = product[3]
+        gTimes  = times[group]
+
+        uTimes, first, counts = np.unique(gTimes, return_index=True, return_counts=True)
+        paths = [files[valid[i]] for i in group[first]]
+
+        gStep = step
+        if gStep is None:
+            gStep = infer_step(uTimes) if code == 'i' else TIME_STEPS.get(code)
+
+        if gStep is None:
+            missing    = np.array([], dtype='M8[m]')
+            unexpected = np.array([], dtype='M8[m]')
+        else:
+            expected   = expected_slots(uTimes[0], uTimes[-1], gStep)
+            missing    = np.setdiff1d(expected, uTimes, assume_unique=True)
+            unexpected = np.setdiff1d(uTimes, expected, assume_unique=True)
+
+        series.append(Series(product, code, gStep, uTimes, paths,
+            missing, uTimes[counts > 1], unexpected))
+
+    return series, invalid
+
+
+def gap_messages(series, missing=True):
+    """
+    Return {path: [(kind, message), ...]} for the findings of *series*.
+
+    Every message is attached to the file following the gap, *kind* is
+    'MISSING', 'DUPLICATE' or None. Missing and off-grid files are only
+    reported with *missing*.
+    """
+    gaps = {}
+    for item in series:
+        slots = []
+        if missing:
+            slots += [(slot, 'MISSING', "Missing File for {}") for slot in item.missing]
+        slots += [(slot, 'DUPLICATE', "Duplicate File for {}") for slot in item.duplicates]
+        if missing:
+            slots += [(slot, None, f"Unexpected File time {{}} for time step {item.step}") for slot in item.unexpected]
+        for slot, kind, msg in slots:
+            path = item.paths[min(np.searchsorted(item.times, slot), len(item.paths) - 1)]
+            gaps.setdefault(path, []).append((kind, msg.format(to_datetime(slot).isoformat('T'))))
+    return gaps
+
+
+def to_datetime(slot):
+    """Return a datetime64 slot as timezone aware datetime."""
+    import datetime
+    return slot.astype('M8[s]').item().replace(tzinfo=datetime.timezone.utc)
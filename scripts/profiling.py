@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+profiling.py
+
+Per-stage timing and I/O accounting of checks (cmsaf-checker --profile).
+
+For every stage of a check the wall and CPU time, the bytes read by the
+process according to /proc/self/io (rchar: all reads including the page
+cache, read_bytes: reads hitting the storage) and the number of variable data
+reads through DatasetX.readVar are recorded. With memory tracking the peak
+Python heap (tracemalloc, including numpy arrays) above the level at the start
+of every stage is recorded as well, and the peak resident set size of the
+process per file. profile_table() summarizes the profiles of a run.
+"""
+
+import math
+import time
+import tracemalloc
+from typing import NamedTuple
+
+FIELDS = ("wall", "cpu", "rchar", "read_bytes", "reads")
+
+# fields combined with max() instead of summed
+PEAK_FIELDS = ("peak",)
+
+
+def read_proc_io():
+    """Return (rchar, read_bytes) of this process, or (0, 0) without /proc/self/io."""
+    try:
+        with open("/proc/self/io") as fh:
+            io = dict(line.split(":") for line in fh)
+        return int(io["rchar"]), int(io["read_bytes"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+
+def read_rss_peak():
+    """Return the peak resident set size (VmHWM) of this process in bytes, or 0 without /proc."""
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def reset_rss_peak():
+    """Reset the peak resident set size of this process to the current one, return False if not supported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+        return True
+    except OSError:
+        return False
+
+
+class HeapPeaks:
+    """
+    Peak Python heap of nested blocks with tracemalloc.
+
+    enter() and leave() bracket a block; leave() returns the peak of the
+    traced memory during the block above the level at enter().
+    """
+
+    def __init__(self):
+        self.open = []    # [start, peak] of the open blocks
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _fold(self):
+        """Account the peak since the last call to all open blocks."""
+        current, peak = tracemalloc.get_traced_memory()
+        for block in self.open:
+            block[1] = max(block[1], peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def enter(self):
+        current = self._fold()
+        self.open.append([current, current])
+
+    def leave(self):
+        self._fold()
+        start, peak = self.open.pop()
+        return peak - start
+
+
+class Counters(NamedTuple):
+    """Snapshot of the profiling counters."""
+    wall:       float
+    cpu:        float
+    rchar:      int
+    read_bytes: int
+    reads:      int
+    dataset:    object    # DatasetX the reads were counted on
+
+    @classmethod
+    def now(cls, dataset=None):
+        return cls(time.perf_counter(), time.process_time(), *read_proc_io(),
+            0 if dataset is None else dataset.reads, dataset)
+
+    def since(self, start):
+        """Return the counter differences to the earlier snapshot *start* as dict."""
+        reads = self.reads - (start.reads if start.dataset is self.dataset else 0)
+        return {
+            "wall":       self.wall - start.wall,
+            "cpu":        self.cpu - start.cpu,
+            "rchar":      self.rchar - start.rchar,
+            "read_bytes": self.read_bytes - start.read_bytes,
+            "reads":      reads,
+        }
+
+
+def accumulate(profile, name, values):
+    """Add *values* to the entry *name* of *profile*."""
+    entry = profile.setdefault(name, dict.fromkeys(FIELDS, 0))
+    for key in FIELDS:
+        entry[key] += values[key]
+    for key in PEAK_FIELDS:
+        if key in values:
+            entry[key] = max(entry.get(key, 0), values[key])
+
+
+def percentile(values, q):
+    """Return the *q* percentile of *values* (nearest rank)."""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def _size(value):
+    for unit in ("B", "kB", "MB", "GB"):
+        if abs(value) < 1024 or unit == "GB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def profile_table(profiles, slowest=10):
+    """
+    Return the lines of the profiling summary of *profiles*, (path, Result.profile) pairs.
+
+    Stages are listed with the number of files, total wall and CPU time, wall
+    time percentiles, bytes and variable reads, and the largest heap peak if
+    recorded, followed by the slowest files and the peak RSS.
+    """
+    profiles = [(path, profile) for path, profile in profiles if profile is not None]
+    if not profiles:
+        return []
+
+    stages = {}
+    for path, profile in profiles:
+        for name, values in profile["stages"].items():
+            stages.setdefault(name, []).append(values)
+        stages.setdefault("total", []).append(profile["total"])
+
+    heap = any("peak" in profile["total"] for path, profile in profiles)
+    lines = [f"{'stage':<28} {'files':>6} {'wall s':>9} {'cpu s':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'read':>9} {'reads':>7}"
+        + (f" {'heap':>9}" if heap else "")]
+    for name in sorted(stages, key=lambda n: (n == "total", n)):
+        entries = stages[name]
+        walls = [e["wall"] for e in entries]
+        line = (f"{name:<28} {len(entries):>6} {sum(walls):>9.3f} {sum(e['cpu'] for e in entries):>9.3f}"
+            f" {percentile(walls, 50)*1e3:>8.1f} {percentile(walls, 95)*1e3:>8.1f} {max(walls)*1e3:>8.1f}"
+            f" {_size(sum(e['rchar'] for e in entries)):>9} {sum(e['reads'] for e in entries):>7}")
+        if heap:
+            line += f" {_size(max(e.get('peak', 0) for e in entries)):>9}"
+        lines.append(line)
+
+    lines.append("")
+    lines.append("slowest files (wall time):")
+    for path, profile in sorted(profiles, key=lambda p: -p[1]["total"]["wall"])[:slowest]:
+        lines.append(f"  {profile['total']['wall']*1e3:10.1f} ms  {path}")
+
+    rss = [(profile["total"].get("rss", 0), path) for path, profile in profiles]
+    if max(rss)[0] > 0:
+        lines.append("")
+        lines.append(f"peak RSS: {_size(max(rss)[0])} ({max(rss)[1]}), median {_size(percentile([r for r, p in rss], 50))}")
+    return lines
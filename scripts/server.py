@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+server.py
+
+Warm CM SAF checker daemon.
+
+The daemon listens on a Unix domain socket or a loopback TCP port and keeps
+a pool of worker processes, each holding a CMSAFChecker with the standard and
+vocabularies already loaded. The daemon opens any path a client sends and
+has no authentication, so it never listens on other interfaces. Instead of
+HTTP the protocol is plain newline delimited JSON, which needs no web
+framework and serves Unix and TCP sockets alike. Clients send requests
+
+    {"files": ["/abs/path/a.nc", "/abs/path/b.nc"]}
+
+and receive one JSON line per file (Result.to_dict(), in request order)
+followed by {"done": true}. Requests of several clients are checked
+concurrently by the shared worker pool. A file that cannot be checked gives
+a failed result; the pool is restarted if a worker process dies.
+"""
+
+import ipaddress
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from .cli import (RC_ERR, CMSAFChecker, CheckerError, Finding, Result, __version__,
+    add_checker_arguments, check_file, checker_options, default_search_paths)
+
+# ---------------------------------------------------------------------------
+# Worker processes
+# ---------------------------------------------------------------------------
+
+# checker of the current worker process, created by _init_worker
+_worker = None
+
+
+def _init_worker(options):
+    """Create the warm checker of a worker process."""
+    global _worker
+    _worker = CMSAFChecker(**options, log=None)
+    if _worker.refDataset is None:
+        _worker._loadStandard()
+
+
+def _check_file(path):
+    """Check *path* in a worker process and return Result.to_dict()."""
+    return check_file(_worker, path).to_dict()
+
+
+class _WorkerPool:
+    """
+    Process pool of warm checkers shared by all requests, replaced by a new
+    one when a worker process dies (e.g. a crash in the HDF5 library).
+    """
+
+    def __init__(self, workers, options):
+        self.workers = workers
+        self.options = options
+        self._lock   = threading.Lock()
+        self._pool   = self._start()
+
+    def _start(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.options,))
+
+    def _restart(self, broken):
+        with self._lock:
+            if self._pool is broken:
+                self._pool = self._start()
+                broken.shutdown(wait=False)
+
+    def _submit(self, path):
+        """Return (pool, future) of the check of *path*."""
+        with self._lock:
+            pool = self._pool
+        try:
+            return pool, pool.submit(_check_file, path)
+        except BrokenProcessPool:
+            self._restart(pool)
+            return self._submit(path)
+
+    def map(self, files):
+        """
+        Yield Result.to_dict() of *files* in order. Files whose check was
+        lost with a dying worker are checked once more; a file the worker
+        dies on again gives a failed result.
+        """
+        pending = [(path, *self._submit(path)) for path in files]
+        for path, pool, future in pending:
+            for retry in (True, False):
+                try:
+                    data = future.result()
+                    break
+                except BrokenProcessPool:
+                    self._restart(pool)
+                    if retry:
+                        pool, future = self._submit(path)
+                    else:
+                        data = Result(path, 1, stages={"check": 1}, findings=[
+                            Finding("check", "error", "worker process died checking the file")]).to_dict()
+            yield data
+
+    def shutdown(self):
+        with self._lock:
+            self._pool.shutdown()
+
+
+# ---------------------------------------------------------------------------
+# Transport
+# ---------------------------------------------------------------------------
+
+def parse_address(address):
+    """
+    Decode a daemon address.
+
+    '[host:]port' selects TCP (host defaults to 127.0.0.1, only loopback
+    hosts are accepted), anything else is the path of a Unix domain socket.
+    Returns (family, address); raises CheckerError for other hosts.
+    """
+    host, _, port = address.rpartition(":")
+    if port.isdigit() and "/" not in address:
+        host = host or "127.0.0.1"
+        try:
+            loopback = host == "localhost" or ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            raise CheckerError(f"Checker daemon address '{address}' is not a loopback address")
+        return socket.AF_INET, (host, int(port))
+    return socket.AF_UNIX, address
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Handle newline delimited JSON check requests."""
+
+    def _send(self, data):
+        self.wfile.write((json.dumps(data) + "\n").encode())
+        self.wfile.flush()
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                files = request["files"]
+            except (ValueError, KeyError, TypeError) as detail:
+                self._send({"error": f"invalid request: {detail}", "done": True})
+                continue
+            for data in self.server.pool.map(files):
+                self._send(data)
+            self._send({"done": True})
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(address, workers=None, **options):
+    """
+    Run the checker daemon on *address* until interrupted.
+
+    Keyword arguments configure the CMSAFChecker of every worker.
+    """
+    family, addr = parse_address(address)
+    if family == socket.AF_UNIX:
+        try:
+            mode = os.lstat(addr).st_mode
+        except FileNotFoundError:
+            pass
+        else:
+            # a socket left over by an earlier daemon, never any other file
+            if not stat.S_ISSOCK(mode):
+                raise CheckerError(f"'{addr}' exists and is not a socket")
+            os.unlink(addr)
+        server = _UnixServer(addr, _Handler)
+    else:
+        server = _TCPServer(addr, _Handler)
+
+    def _stop(signum, frame):
+        threading.Thread(target=server.shutdown).start()
+    signal.signal(signal.SIGTERM, _stop)
+
+    workers = workers or os.cpu_count()
+    server.pool = _WorkerPool(workers, options)
+    print(f"Listening on '{address}' with {workers} workers")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.pool.shutdown()
+        if family == socket.AF_UNIX and os.path.exists(addr):
+            os.unlink(addr)
+
+
+# ---------------------------------------------------------------------------
+# Client
+# ---------------------------------------------------------------------------
+
+def check_remote(address, files):
+    """
+    Send *files* to the daemon at *address* and yield a Result per file.
+
+    Results arrive in the order of *files*.
+    """
+    family, addr = parse_address(address)
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(addr)
+        except OSError as detail:
+            raise CheckerError(f"Could not connect to checker daemon at '{address}': {detail}")
+        request = {"files": [os.path.abspath(f) for f in files]}
+        sock.sendall((json.dumps(request) + "\n").encode())
+        received = 0
+        with sock.makefile("r") as fh:
+            for line in fh:
+                data = json.loads(line)
+                if data.get("error"):
+                    raise CheckerError(data["error"])
+                if data.get("done"):
+                    break
+                received += 1
+                yield Result.from_dict(data)
+        if received != len(request["files"]):
+            raise CheckerError(f"Checker daemon at '{address}' returned {received} of {len(request['files'])} results")
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def main(argv=None):
+    import argparse
+
+    print(f"CMSAF Checker Version {__version__}")
+
+    parser = argparse.ArgumentParser(prog='cmsaf-checker serve',
+        description='Keep checkers warm and check files sent by cmsaf-checker --client.')
+    add_checker_arguments(parser)
+    parser.add_argument('-w', '--workers', type=int, default=None,
+        help='Number of worker processes (default: number of CPUs)')
+    parser.add_argument('address',
+        help='Unix domain socket path or [host:]port, the host defaults to 127.0.0.1 and must be a loopback address')
+
+    args = parser.parse_args(argv)
+
+    search_paths = default_search_paths(args.cmsaf_metadata_standard)
+    for i, p in enumerate(search_paths, start=ord('a')):
+        print(f"CMSAF Standards path ({chr(i)}) '{p}'")
+
+    try:
+        serve(args.address, workers=args.workers, **checker_options(args, search_paths))
+    except CheckerError as detail:
+        print(f"{RC_ERR} {detail}")
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
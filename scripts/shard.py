@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+shard.py
+
+Split a checker run over several processes or nodes and merge the results.
+
+Every shard enumerates the same files, sorts them by file name and checks one
+contiguous block, so consecutive time steps of a product stay together.
+Missing and duplicate files are computed from the complete list and reported
+by the shard owning the file that follows the gap. Each shard writes a partial
+result file; 'cmsaf-checker merge' combines them into one overall summary and
+recomputes missing and duplicate files from the union of all file names.
+"""
+
+import json
+import os
+
+from .cli import RC_ERR, RC_FAIL, __version__
+
+PARTIAL_FORMAT = "cmsaf-checker-partial"
+
+
+def parse_shard(text):
+    """Decode 'I/N' into (I, N), shards are numbered from 0 to N-1."""
+    import argparse
+    try:
+        index, shards = (int(x) for x in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expecting I/N, got '{text}'")
+    if shards < 1 or not 0 <= index < shards:
+        raise argparse.ArgumentTypeError(f"expecting 0 <= I < N, got '{text}'")
+    return index, shards
+
+
+def shard_range(count, index, shards):
+    """Return (start, stop) of block *index* when *count* sorted files are split into *shards* blocks."""
+    return count * index // shards, count * (index + 1) // shards
+
+
+def write_partial(path, shard, shards, missing, total, counts, files):
+    """
+    Write the partial result of a shard to *path*.
+
+    *files* is a list of (path, rc) of the checked files, *counts* the result
+    dict of the shard. The file is replaced atomically.
+    """
+    data = {
+        "format":  PARTIAL_FORMAT,
+        "version": __version__,
+        "shard":   shard,
+        "shards":  shards,
+        "missing": missing,
+        "total":   total,
+        "counts":  counts,
+        "files":   files,
+    }
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)
+
+
+def read_partial(path):
+    """
+    Read a partial result file or the summary of a work queue.
+
+    Raises ValueError if *path* is neither.
+    """
+    from .workqueue import WorkQueue, is_queue
+    if is_queue(path):
+        queue = WorkQueue(path)
+        try:
+            return queue.summary()
+        finally:
+            queue.close()
+    with open(path) as fh:
+        data = json.load(fh)
+    if not isinstance(data, dict) or data.get("format") != PARTIAL_FORMAT:
+        raise ValueError(f"'{path}' is not a partial result file")
+    return data
+
+
+def merge(partials):
+    """
+    Combine partial results into an overall summary dict.
+
+    Missing and duplicate files are recomputed from the union of the file
+    names of all shards. Inconsistent or incomplete shard sets are listed
+    in 'errors'.
+    """
+    from .missing import find_missing, gap_messages, parse_step
+
+    errors = []
+    shards = {p["shards"] for p in partials}
+    if len(shards) != 1:
+        errors.append(f"partial results of different shard counts {sorted(shards)}")
+    seen = sorted(p["shard"] for p in partials)
+    if len(shards) == 1:
+        expected = list(range(shards.pop()))
+        if seen != expected:
+            absent = sorted(set(expected) - set(seen))
+            double = sorted({i for i in seen if seen.count(i) > 1})
+            if absent:
+                errors.append(f"missing shards {absent}")
+            if double:
+                errors.append(f"duplicate shards {double}")
+    totals = {p["total"] for p in partials}
+    if len(totals) != 1:
+        errors.append(f"shards enumerated different numbers of files {sorted(totals)}")
+    pending = sum(p.get("pending", 0) for p in partials)
+    if pending > 0:
+        errors.append(f"{pending} queued files not checked yet")
+    missing = {p["missing"] for p in partials}
+    if len(missing) != 1:
+        errors.append("partial results with different missing file options")
+
+    files  = [tuple(f) for p in partials for f in p["files"]]
+    failed = [path for path, rc in files if rc != 0]
+    summary = {
+        "OK":        len(files) - len(failed),
+        "FAILED":    len(failed),
+        "MISSING":   None,
+        "DUPLICATE": 0,
+        "failed":    failed,
+        "errors":    errors,
+    }
+
+    option = missing.pop() if len(missing) == 1 else None
+    step = None if option in (None, "filename") else parse_step(option)
+    series, invalid = find_missing(sorted((path for path, rc in files), key=lambda s: os.path.basename(s)), step)
+    kinds = [kind for msgs in gap_messages(series, missing=option is not None).values() for kind, msg in msgs]
+    summary["DUPLICATE"] = kinds.count("DUPLICATE")
+    if option is not None:
+        summary["MISSING"] = kinds.count("MISSING")
+    return summary
+
+
+def main(argv=None):
+    import argparse
+    from sys import exit
+
+    print(f"CMSAF Checker Version {__version__}")
+
+    parser = argparse.ArgumentParser(prog='cmsaf-checker merge',
+        description='Combine the partial results of cmsaf-checker --shard runs, or summarize a work queue.')
+    parser.add_argument('-o', '--output', metavar='FILE',
+        help='Write the merged summary as JSON to this file.')
+    parser.add_argument('partials', nargs='+',
+        help='Partial result files written with --partial, or a work queue')
+
+    args = parser.parse_args(argv)
+
+    partials = []
+    for path in args.partials:
+        try:
+            partials.append(read_partial(path))
+        except (OSError, ValueError) as detail:
+            print(f"{RC_ERR} {detail}")
+            exit(1)
+
+    summary = merge(partials)
+
+    for path in summary["failed"]:
+        print(f"{RC_FAIL} {path}")
+    for msg in summary["errors"]:
+        print(f"{RC_ERR} {msg}")
+
+    print(f"\n{'':=^80}\nOverall Summary\n{'':=^80}")
+    print(f"Out of {summary['OK'] + summary['FAILED']}, {summary['FAILED']} FAILED")
+    if summary["MISSING"] is not None:
+        print(f"{summary['MISSING']} files MISSING")
+    if summary["DUPLICATE"] > 0:
+        print(f"{summary['DUPLICATE']} files DUPLICATE")
+
+    if args.output is not None:
+        with open(args.output, "w") as fh:
+            json.dump(summary, fh, indent=2)
+
+    if summary["FAILED"] == 0 and not summary["errors"]:
+        exit(0)
+    else:
+        exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+synthetic.py
+
+Synthetic CM SAF files for benchmarks of the checker.
+
+generate() writes files named after the CM SAF naming convention with the
+global attributes, coordinates, bounds and record_status the checker expects.
+Product kinds (daily, monthly, diurnal cycle, instantaneous, swath), the
+number of records, the grid resolution, the nesting of the data variables in
+groups, the number of data variables and the compression are configurable.
+"""
+
+import datetime
+import os
+
+from .cli import _GRID_RESOLUTION, _lazy_import
+
+np      = _lazy_import("numpy")
+netCDF4 = _lazy_import("netCDF4")
+
+EPOCH = datetime.datetime(1970, 1, 1)
+
+# timeCode, statistic, time_coverage_duration, time_coverage_resolution
+KINDS = {
+    "daily":         ("d", "m", "P1D",  "P1D"),
+    "monthly":       ("m", "m", "P1M",  "P1M"),
+    "diurnal":       ("m", "d", "P1M",  "PT1H"),
+    "instantaneous": ("i", "n", None,   "PT15M"),
+    "swath":         ("i", "n", None,   None),
+}
+
+# grid code of swath files, a satellite projection without scalar resolution
+SWATH_GRID = "05"
+
+GLOBAL_ATTRIBUTES = {
+    "title":                    "Synthetic CM SAF test data",
+    "summary":                  "Synthetic data written by cmsaf-checker-bench",
+    "id":                       "DOI:10.5676/EUM_SAF_CM/TEST/V001",
+    "product_version":          "1.0",
+    "creator_name":             "DE/DWD",
+    "creator_email":            "contact.cmsaf@dwd.de",
+    "creator_url":              "https://cm-saf.eumetsat.int/",
+    "institution":              "EUMETSAT/CMSAF",
+    "project":                  "Satellite Application Facility on Climate Monitoring (CM SAF)",
+    "references":               "https://doi.org/10.5676/EUM_SAF_CM/TEST/V001",
+    "Conventions":              "CF-1.12,ACDD-1.3",
+    "license":                  "https://creativecommons.org/licenses/by/4.0/",
+    "standard_name_vocabulary": "Standard Name Table (v90, 01 January 2025)",
+    "date_created":             "2024-01-01T00:00:00Z",
+    "keywords_vocabulary":      "GCMD Science Keywords, Version 21.0",
+    "keywords":                 "EARTH SCIENCE > ATMOSPHERE > ATMOSPHERIC TEMPERATURE > SURFACE TEMPERATURE > AIR TEMPERATURE",
+    "platform":                 "METEOSAT-8",
+    "platform_vocabulary":      "GCMD Platforms, Version 21.0",
+    "instrument":               "SEVIRI",
+    "instrument_vocabulary":    "GCMD Instruments, Version 21.0",
+    "provider_vocabulary":      "GCMD Providers, Version 21.0",
+    "source":                   "satellite observation",
+    "lineage":                  "prov:wasDerivedFrom synthetic;",
+}
+
+
+def _months(time, n):
+    """Return *time* shifted by *n* months."""
+    month = time.month - 1 + n
+    return time.replace(year=time.year + month // 12, month=month % 12 + 1)
+
+
+def _isoformat(time):
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def file_name(kind, time, grid="20", product="TST"):
+    """Return the CM SAF file name of a *kind* file for time slot *time*."""
+    timeCode, statistic = KINDS[kind][:2]
+    if kind == "swath":
+        grid = SWATH_GRID
+    return f"{product}{timeCode}{statistic}{time:%Y%m%d%H%M}001{grid}IMPGS01GL.nc"
+
+
+def time_slots(kind, start, files, records=None):
+    """Return the time slots of *files* consecutive *kind* files starting at *start*."""
+    if kind == "monthly" or kind == "diurnal":
+        return [_months(start, i) for i in range(files)]
+    if kind == "daily":
+        return [start + datetime.timedelta(days=i) for i in range(files)]
+    step = datetime.timedelta(minutes=15 * (records or 96))
+    return [start + i * step for i in range(files)]
+
+
+def _time_axis(kind, slot, records):
+    """Return (records, bounds or None, climatology, time_coverage_end) of a *kind* file in days since EPOCH."""
+    def days(t):
+        return (t - EPOCH) / datetime.timedelta(days=1)
+
+    if kind == "daily":
+        end = slot + datetime.timedelta(days=1)
+        return [days(slot)], [[days(slot), days(end)]], False, end
+    if kind == "monthly":
+        end = _months(slot, 1)
+        return [days(slot)], [[days(slot), days(end)]], False, end
+    if kind == "diurnal":
+        end = _months(slot, 1)
+        hours = [slot + datetime.timedelta(hours=h) for h in range(24)]
+        bounds = [[days(h), days(_months(h, 1) - datetime.timedelta(days=1) + datetime.timedelta(hours=1))] for h in hours]
+        return [days(h) for h in hours], bounds, True, end
+    step = datetime.timedelta(minutes=15)
+    times = [slot + i * step for i in range(records)]
+    return [days(t) for t in times], None, False, slot + (records - 1) * step
+
+
+def write_file(path, kind="daily", time=None, records=None, grid="20", groups=0, variables=1, complevel=4,
+        swath_shape=(400, 300), swath_bounds=False):
+    """
+    Write one synthetic *kind* file to *path*.
+
+    *records* is the number of time steps of instantaneous and swath files,
+    *groups* the nesting depth of the group holding the data variables,
+    *variables* their number and *complevel* the zlib level (0: uncompressed).
+    Swath files get 4-vertex cell bounds of lat and lon with *swath_bounds*.
+    """
+    timeCode, statistic, duration, resolution = KINDS[kind]
+    time = time or datetime.datetime(2020, 1, 1)
+    if records is None:
+        records = 96 if kind == "instantaneous" else 2
+    swath = kind == "swath"
+
+    ds = netCDF4.Dataset(path, "w", format="NETCDF4")
+    try:
+        times, bounds, climatology, end = _time_axis(kind, time, records)
+
+        ds.createDimension("time", None)
+        ds.createDimension("bnds", 2)
+        compression = dict(zlib=complevel > 0, complevel=max(complevel, 1))
+        t = ds.createVariable("time", "f8", ("time",), **compression)
+        t.standard_name = "time"
+        t.long_name     = "time"
+        t.units         = "days since 1970-01-01 00:00:00"
+        t.calendar      = "standard"
+        t.axis          = "T"
+        if bounds is not None:
+            name = "climatology_bnds" if climatology else "time_bnds"
+            setattr(t, "climatology" if climatology else "bounds", name)
+            tb = ds.createVariable(name, "f8", ("time", "bnds"))
+            tb.units = t.units
+        t[:] = times
+        if bounds is not None:
+            tb[:] = bounds
+
+        rs = ds.createVariable("record_status", "i1", ("time",), **compression)
+        rs.long_name     = "record status"
+        rs.flag_values   = np.array([0, 1], "i1")
+        rs.flag_meanings = "valid invalid"
+        rs[:] = np.zeros(len(times), "i1")
+
+        if swath:
+            ny, nx = swath_shape
+            ds.createDimension("y", ny)
+            ds.createDimension("x", nx)
+            dims = ("y", "x")
+            y, x = np.meshgrid(np.linspace(30, 60, ny), np.linspace(-20, 20, nx), indexing="ij")
+            if swath_bounds:
+                ds.createDimension("nv", 4)
+            for name, values, stdName, units in (("lat", y, "latitude", "degrees_north"),
+                                                 ("lon", x, "longitude", "degrees_east")):
+                v = ds.createVariable(name, "f4", dims, **compression)
+                v.standard_name = stdName
+                v.long_name     = stdName
+                v.units         = units
+                v[:] = values
+                if swath_bounds:
+                    # cell corners halfway between the centers, counterclockwise
+                    corners = np.pad(values, 1, mode="reflect", reflect_type="odd")
+                    corners = (corners[1:, 1:] + corners[:-1, :-1] + corners[1:, :-1] + corners[:-1, 1:]) / 4
+                    v.bounds = f"{name}_bnds"
+                    b = ds.createVariable(f"{name}_bnds", "f4", dims + ("nv",), **compression)
+                    b[:] = np.stack([corners[:-1, :-1], corners[:-1, 1:], corners[1:, 1:], corners[1:, :-1]], -1)
+            field = 280 + 10 * np.cos(np.deg2rad(y)).astype("f4")
+            ds.cdm_data_type = "swath"
+            for key, values in (("lat", y), ("lon", x)):
+                setattr(ds, f"geospatial_{key}_min", float(values.min()))
+                setattr(ds, f"geospatial_{key}_max", float(values.max()))
+        else:
+            res  = float(_GRID_RESOLUTION[grid])
+            nlat = int(round(180 / res))
+            nlon = int(round(360 / res))
+            ds.createDimension("lat", nlat)
+            ds.createDimension("lon", nlon)
+            dims = ("lat", "lon")
+            centers = {}
+            for name, n, start, stdName, units, axis in (("lat", nlat, -90., "latitude", "degrees_north", "Y"),
+                                                         ("lon", nlon, -180., "longitude", "degrees_east", "X")):
+                values = np.round(start + res / 2 + res * np.arange(n), 6)
+                v = ds.createVariable(name, "f8", (name,))
+                v.standard_name = stdName
+                v.long_name     = stdName
+                v.units         = units
+                v.axis          = axis
+                v.bounds        = f"{name}_bnds"
+                v[:] = values
+                b = ds.createVariable(f"{name}_bnds", "f8", (name, "bnds"))
+                b[:] = np.round(np.stack([values - res / 2, values + res / 2], 1), 6)
+                centers[name] = values
+            field = (280 + 10 * np.cos(np.deg2rad(centers["lat"]))[:, None] + np.zeros(nlon)).astype("f4")
+            ds.cdm_data_type = "grid"
+            for key, value in (("lat_min", -90.), ("lat_max", 90.), ("lon_min", -180.), ("lon_max", 180.)):
+                setattr(ds, f"geospatial_{key}", value)
+            ds.geospatial_lat_resolution = f"{_GRID_RESOLUTION[grid]} degree"
+            ds.geospatial_lon_resolution = f"{_GRID_RESOLUTION[grid]} degree"
+            crs = ds.createVariable("crs", "i4")
+            crs.grid_mapping_name = "latitude_longitude"
+            crs.long_name         = "coordinate reference system"
+        ds.geospatial_lat_units = "degrees_north"
+        ds.geospatial_lon_units = "degrees_east"
+
+        # data variables, optionally nested in groups
+        parent = ds
+        for level in range(groups):
+            parent = parent.createGroup(f"group{level + 1}")
+        names = [f"tas{i}" if variables > 1 else "tas" for i in range(variables)]
+        for name in names:
+            v = parent.createVariable(name, "f4", ("time",) + dims, fill_value=np.float32(-999), **compression)
+            v.standard_name = "air_temperature"
+            v.long_name     = "near surface air temperature"
+            v.units         = "K"
+            v.valid_min     = np.float32(150)
+            v.valid_max     = np.float32(350)
+            if kind in ("instantaneous", "swath"):
+                v.cell_methods = "time: point"
+            if swath:
+                v.coordinates = "lat lon"
+            else:
+                v.grid_mapping = "crs"
+            for i in range(len(times)):
+                v[i] = field + 0.1 * i
+
+        for key, value in GLOBAL_ATTRIBUTES.items():
+            setattr(ds, key, value)
+        ds.variable_id          = ",".join(os.path.join(parent.path, name).lstrip("/") for name in names)
+        ds.filename             = os.path.basename(path)
+        ds.time_coverage_start  = _isoformat(time)
+        ds.time_coverage_end    = _isoformat(end)
+        if duration is not None:
+            ds.time_coverage_duration = duration
+        elif kind == "instantaneous":
+            ds.time_coverage_duration = f"PT{15 * len(times)}M"
+        if resolution is not None:
+            ds.time_coverage_resolution = resolution
+    finally:
+        ds.close()
+
+
+def generate(directory, kind="daily", files=1, start=None, product="TST", **options):
+    """
+    Write *files* consecutive synthetic *kind* files to *directory* and return their paths.
+
+    Further keyword arguments are passed to write_file().
+    """
+    start = start or datetime.datetime(2020, 1, 1)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for slot in time_slots(kind, start, files, options.get("records")):
+        path = os.path.join(directory, file_name(kind, slot, options.get("grid", "20"), product))
+        write_file(path, kind, slot, **options)
+        paths.append(path)
+    return paths
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+tracing.py
+
+Chrome trace-event export of check execution (cmsaf-checker --trace FILE).
+
+Spans are appended to FILE in the JSON array format of the trace-event
+specification, which does not require the closing bracket, so several
+processes (e.g. the workers of the checker daemon) can write into the same
+file. Every process and thread gets its own track. The file can be opened
+in Perfetto (ui.perfetto.dev) or chrome://tracing.
+"""
+
+import contextlib
+import json
+import os
+import socket
+import threading
+import time
+
+
+class Tracer:
+    """
+    Record spans and append them to the trace file *path*.
+
+    Events are buffered and written with one append per flush() so that
+    lines of concurrent writers do not interleave.
+    """
+
+    def __init__(self, path):
+        self.path   = path
+        self.pid    = os.getpid()
+        self.events = []
+        self.tids   = set()
+        self._lock  = threading.Lock()
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, "w") as fh:
+                fh.write("[\n")
+        self._event({"name": "process_name", "ph": "M", "tid": 0,
+            "args": {"name": f"{socket.gethostname()}:{self.pid}"}})
+
+    def _event(self, event):
+        event["pid"] = self.pid
+        with self._lock:
+            self.events.append(event)
+
+    def _thread(self):
+        tid = threading.get_native_id()
+        if tid not in self.tids:
+            self.tids.add(tid)
+            self._event({"name": "thread_name", "ph": "M", "tid": tid,
+                "args": {"name": threading.current_thread().name}})
+        return tid
+
+    @contextlib.contextmanager
+    def span(self, name, cat="check", **args):
+        """Record the execution of the block as complete event *name*."""
+        tid = self._thread()
+        start = time.time_ns()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": cat, "ph": "X", "tid": tid,
+                "ts": start / 1e3, "dur": (time.time_ns() - start) / 1e3}
+            if args:
+                event["args"] = {k: str(v) for k, v in args.items()}
+            self._event(event)
+
+    def flush(self):
+        """Append the buffered events to the trace file."""
+        with self._lock:
+            events, self.events = self.events, []
+        if not events:
+            return
+        data = "".join(json.dumps(e) + ",\n" for e in events).encode()
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
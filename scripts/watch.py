@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+watch.py
+
+Watch a directory for incoming files.
+
+New or modified files matching a pattern are reported once their size and
+modification time did not change for a settle period. Linux inotify is used
+where available, otherwise the directory is polled with os.scandir.
+"""
+
+import bisect
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from .cli import decode_filename, np, pattern_matcher
+from .missing import TIME_STEPS, expected_slots, to_datetime
+
+# inotify event masks, see <sys/inotify.h>
+IN_MODIFY      = 0x00000002
+IN_ATTRIB      = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO    = 0x00000080
+IN_CREATE      = 0x00000100
+IN_Q_OVERFLOW  = 0x00004000
+
+_EVENT = struct.Struct("iIII")
+
+
+class _Inotify:
+    """
+    Minimal ctypes binding to Linux inotify for a single directory.
+
+    Raises OSError if inotify is not available.
+    """
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("inotify not available")
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            err = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(err, f"inotify_add_watch failed for '{directory}'")
+
+    def close(self):
+        os.close(self.fd)
+
+    def read(self, timeout):
+        """
+        Wait up to *timeout* seconds and return the set of changed names,
+        or None if the event queue overflowed and a full rescan is needed.
+        """
+        names = set()
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return names
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return names
+            offset = 0
+            while offset < len(data):
+                wd, mask, cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if name:
+                    names.add(os.fsdecode(name))
+
+
+class Watcher:
+    """
+    Iterate over batches of new or modified files in *directory*.
+
+    A file matching one of *patterns* is reported once (size, mtime) did not change
+    for *settle* seconds; files last modified more than *settle* seconds ago
+    are reported immediately, so the existing content of the directory forms
+    the first batch. A file is reported again after it was modified.
+    """
+
+    def __init__(self, directory, patterns, settle=5.0, poll=False):
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        self.directory = directory
+        self.match     = pattern_matcher(patterns)
+        self.settle    = settle
+        self.checked   = {}    # name -> (size, mtime_ns) when reported
+        self.pending   = {}    # name -> (size, mtime_ns, first seen with this state)
+        self.inotify   = None
+        if not poll:
+            try:
+                self.inotify = _Inotify(directory)
+            except OSError:
+                self.inotify = None
+
+    def close(self):
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+    def _stat(self, name):
+        try:
+            st = os.stat(os.path.join(self.directory, name))
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def _scan(self):
+        """Return the names of all matching regular files in the directory."""
+        names = set()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if self.match(os.path.normcase(entry.name)) and entry.is_file():
+                    names.add(entry.name)
+        return names
+
+    def _observe(self, names, now):
+        for name in names:
+            state = self._stat(name)
+            if state is None or self.checked.get(name) == state:
+                continue
+            item = self.pending.get(name)
+            if item is None or item[:2] != state:
+                self.pending[name] = (*state, now)
+
+    def _ready(self, now):
+        ready = []
+        for name, (size, mtime, since) in list(self.pending.items()):
+            state = self._stat(name)
+            if state is None:
+                del self.pending[name]
+            elif state != (size, mtime):
+                self.pending[name] = (*state, now)
+            elif now - since >= self.settle or now - mtime * 1e-9 >= self.settle:
+                del self.pending[name]
+                self.checked[name] = state
+                path = os.path.join(self.directory, name)
+                if os.access(path, os.R_OK):
+                    ready.append(path)
+                else:
+                    print(f"Skipping file '{path}'")
+        return ready
+
+    def __iter__(self):
+        names = self._scan()
+        interval = min(1.0, self.settle) if self.settle > 0 else 1.0
+        try:
+            while True:
+                now = time.time()
+                self._observe(names, now)
+                ready = self._ready(now)
+                if ready:
+                    yield ready
+                if self.inotify is not None:
+                    names = self.inotify.read(interval)
+                    if names is None:
+                        names = self._scan()
+                    else:
+                        names = {n for n in names if self.match(os.path.normcase(n))}
+                else:
+                    time.sleep(interval)
+                    names = self._scan()
+        finally:
+            self.close()
+
+
+class Timeline:
+    """
+    Missing file slots between the first and the last file seen so far.
+
+    The slots are updated incrementally from the neighbours of every newly
+    seen file time, without sorting all seen files again. *fileStep* is a
+    missing.Step, or None to disable the test.
+    """
+
+    def __init__(self, fileStep):
+        self.fileStep  = fileStep
+        self.times     = []
+        self.missing   = set()
+
+    def _slots(self, start, end):
+        """Return the expected file times after *start* and before *end*."""
+        slots = expected_slots(start, end, self.fileStep)
+        return [to_datetime(slot) for slot in slots[(slots > start) & (slots < end)]]
+
+    def add(self, fileTime):
+        """Add a file time and return the list of newly missing slots."""
+        if self.fileStep is None or fileTime is None:
+            return []
+        fileTime = np.datetime64(fileTime.replace(tzinfo=None), 'm')
+        index = bisect.bisect_left(self.times, fileTime)
+        if index < len(self.times) and self.times[index] == fileTime:
+            return []
+        self.times.insert(index, fileTime)
+        if to_datetime(fileTime) in self.missing:
+            self.missing.discard(to_datetime(fileTime))
+            return []
+        slots = []
+        if index == len(self.times) - 1 and index > 0:
+            slots = self._slots(self.times[index - 1], fileTime)
+        elif index == 0 and len(self.times) > 1:
+            slots = self._slots(fileTime, self.times[1])
+        self.missing.update(slots)
+        return slots
+
+
+class Timelines:
+    """
+    Timeline of every product series seen so far.
+
+    Files are grouped by CMSAFFilename.key like in missing.find_missing().
+    *step* is a missing.Step applied to all series; by default it follows
+    the time code of each series, instantaneous series are not tested then.
+    """
+
+    def __init__(self, step=None):
+        self.step   = step
+        self.series = {}    # product key -> Timeline
+
+    @property
+    def missing(self):
+        """Set of (product key, slot) of all missing files."""
+        return {(key, slot) for key, timeline in self.series.items() for slot in timeline.missing}
+
+    def add(self, file):
+        """
+        Add *file* and return the list of newly missing slots of its series.
+
+        Names not following the naming convention or with an invalid date
+        are skipped.
+        """
+        decode = decode_filename(os.path.basename(os.path.realpath(file)))
+        if decode is None or decode.time is None:
+            return []
+        timeline = self.series.get(decode.key)
+        if timeline is None:
+            step = self.step if self.step is not None else TIME_STEPS.get(decode.timeCode)
+            timeline = self.series[decode.key] = Timeline(step)
+        return timeline.add(decode.time)
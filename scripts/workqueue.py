@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+workqueue.py
+
+Work queue for elastic multi-node checking, kept in an SQLite file on shared
+storage.
+
+'cmsaf-checker --enqueue QUEUE' adds the discovered files to the queue and any
+number of 'cmsaf-checker --worker QUEUE' processes, on any node, claim files
+one at a time with a lease and store the results. The lease is renewed while
+a worker is alive; the file of a lost worker is claimed again once its lease
+expired. A file whose check was started MAX_ATTEMPTS times without result is
+given up and recorded as failed. 'cmsaf-checker merge QUEUE' prints the
+overall summary.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+from .cli import CheckerError, Finding, Result
+
+MAX_ATTEMPTS = 3
+
+SQLITE_HEADER = b"SQLite format 3\0"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id       INTEGER PRIMARY KEY,
+    path     TEXT UNIQUE NOT NULL,
+    state    TEXT NOT NULL DEFAULT 'pending',    -- pending, leased, done
+    worker   TEXT,
+    lease    REAL,                               -- lease expiry, unix time
+    attempts INTEGER NOT NULL DEFAULT 0,
+    rc       INTEGER,
+    result   TEXT                                -- Result.to_dict() as JSON
+);
+CREATE INDEX IF NOT EXISTS files_state ON files (state, lease);
+"""
+
+
+def is_queue(path):
+    """Return True if *path* is an SQLite file."""
+    try:
+        with open(path, "rb") as fh:
+            return fh.read(len(SQLITE_HEADER)) == SQLITE_HEADER
+    except OSError:
+        return False
+
+
+class WorkQueue:
+    """
+    Files to check and their results in the SQLite file *path*.
+
+    With *create* the queue is created if it does not exist, otherwise
+    CheckerError is raised. *lease* is the time in seconds a claimed file
+    stays reserved for its worker without renewal.
+    """
+
+    def __init__(self, path, create=False, lease=600.0, poll=5.0):
+        if not create and not is_queue(path):
+            raise CheckerError(f"Work queue '{path}' not found")
+        self.path   = path
+        self.lease  = lease
+        self.poll   = poll
+        self.worker = f"{socket.gethostname()}:{os.getpid()}"
+        self.leased = {}    # path -> id of the files claimed by this worker
+        self.db     = sqlite3.connect(path, timeout=120.0, isolation_level=None)
+        if create:
+            self.db.executescript(_SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def _transaction(self):
+        """Start a write transaction, other writers wait for it."""
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def meta(self, key, default=None):
+        row = self.db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else json.loads(row[0])
+
+    def enqueue(self, files, **meta):
+        """Add *files* in the given order, already queued files are kept. Returns the number of new files."""
+        self._transaction()
+        try:
+            before = self.db.total_changes
+            self.db.executemany("INSERT OR IGNORE INTO files (path) VALUES (?)", ((f,) for f in files))
+            added = self.db.total_changes - before
+            self.db.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                ((k, json.dumps(v)) for k, v in meta.items()))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return added
+
+    def claim(self):
+        """Lease the next pending or expired file and return its path, or None."""
+        now = time.time()
+        self._transaction()
+        try:
+            while True:
+                row = self.db.execute("SELECT id, path, attempts FROM files"
+                    " WHERE state = 'pending' OR (state = 'leased' AND lease < ?)"
+                    " ORDER BY id LIMIT 1", (now,)).fetchone()
+                if row is None:
+                    break
+                id, path, attempts = row
+                if attempts < MAX_ATTEMPTS:
+                    self.db.execute("UPDATE files SET state = 'leased', worker = ?, lease = ?,"
+                        " attempts = attempts + 1 WHERE id = ?", (self.worker, now + self.lease, id))
+                    break
+                # the check of this file was started too often without result
+                result = Result(path, 1, stages={"open": 1}, findings=[Finding("open", "error",
+                    f"Check of '{path}' did not finish in {attempts} attempts")])
+                self.db.execute("UPDATE files SET state = 'done', rc = 1, result = ? WHERE id = ?",
+                    (json.dumps(result.to_dict()), id))
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        if row is None:
+            return None
+        self.leased[path] = id
+        return path
+
+    def complete(self, path, result):
+        """Store the Result of a claimed file, unless the lease was lost in between."""
+        id = self.leased.pop(path)
+        self.db.execute("UPDATE files SET state = 'done', rc = ?, result = ?"
+            " WHERE id = ? AND state = 'leased' AND worker = ?",
+            (result.rc, json.dumps(result.to_dict()), id, self.worker))
+
+    def release(self):
+        """Return the files claimed by this worker to the queue."""
+        self.db.execute("UPDATE files SET state = 'pending', worker = NULL, lease = NULL,"
+            " attempts = attempts - 1 WHERE state = 'leased' AND worker = ?", (self.worker,))
+        self.leased.clear()
+
+    def _heartbeat(self, stop):
+        """Renew the leases of this worker until *stop* is set, using an own connection."""
+        db = sqlite3.connect(self.path, timeout=120.0, isolation_level=None)
+        try:
+            while not stop.wait(self.lease / 3):
+                db.execute("UPDATE files SET lease = ? WHERE state = 'leased' AND worker = ?",
+                    (time.time() + self.lease, self.worker))
+        finally:
+            db.close()
+
+    def active(self):
+        """Return the number of files leased by live workers."""
+        return self.db.execute("SELECT count(*) FROM files WHERE state = 'leased' AND lease >= ?",
+            (time.time(),)).fetchone()[0]
+
+    def __iter__(self):
+        """
+        Claim and yield files until the queue is drained.
+
+        While other workers still hold leases, wait for them: their files are
+        claimed again if the leases expire. The leases of this worker are
+        renewed in the background while it is busy.
+        """
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(stop,), daemon=True)
+        heartbeat.start()
+        try:
+            while True:
+                path = self.claim()
+                if path is not None:
+                    yield path
+                elif self.active() == 0:
+                    return
+                else:
+                    time.sleep(self.poll)
+        finally:
+            stop.set()
+
+    def summary(self):
+        """
+        Return the queue content as partial result (see shard.write_partial),
+        with the number of files not checked yet as 'pending'.
+        """
+        files = self.db.execute("SELECT path, rc FROM files WHERE state = 'done' ORDER BY id").fetchall()
+        total = self.db.execute("SELECT count(*) FROM files").fetchone()[0]
+        return {
+            "shard":   0,
+            "shards":  1,
+            "missing": self.meta("missing"),
+            "total":   total,
+            "pending": total - len(files),
+            "files":   [list(f) for f in files],
+        }